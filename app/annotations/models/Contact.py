@@ -1,13 +1,17 @@
 from typing import List, Annotated
 from pydantic import AfterValidator
 from uuid import UUID
-from sqlmodel import Field, Relationship
+from sqlmodel import Field, Index, Relationship
 from app.core.schemas.BaseEntity import BaseEntity
 from app.user_management.user.models.Client import Client
 from app.utils.validators.validate_phone_number import validate_phone_number
 
 class Contact(BaseEntity, table=True):
     __tablename__ = "contacts"
+    __table_args__ = (
+        # one contact per number per client; arbiter for broadcast_messaging_batch
+        Index("ux_contacts_client_phone", "client_id", "phone_number", unique=True),
+    )
     
     name: str = Field(nullable=True)
     country_code: str = Field(nullable=False)
@@ -20,12 +24,13 @@ class Contact(BaseEntity, table=True):
     client_id: UUID = Field(default=None, foreign_key="clients.id", index=True, nullable=True, ondelete="CASCADE")
     client: "Client" = Relationship(back_populates="contacts")
 
-    tag_links: List["ContactTagLink"] = Relationship(back_populates="contact", sa_relationship_kwargs={"lazy": "joined", "cascade": "all, delete-orphan"})
+    # not loaded unless a query asks for them, see the option sets in ContactRepository
+    tag_links: List["ContactTagLink"] = Relationship(back_populates="contact", sa_relationship_kwargs={"lazy": "select", "cascade": "all, delete-orphan"})
     attribute_links: List["ContactAttributeLink"] = Relationship(
         back_populates="contact",
-        sa_relationship_kwargs={"lazy": "joined", "cascade": "all, delete-orphan"}
+        sa_relationship_kwargs={"lazy": "select", "cascade": "all, delete-orphan"}
     )
-    note_links: List["ContactNoteLink"] = Relationship(back_populates="contact", sa_relationship_kwargs={"lazy": "joined", "cascade": "all, delete-orphan"})
+    note_links: List["ContactNoteLink"] = Relationship(back_populates="contact", sa_relationship_kwargs={"lazy": "select", "cascade": "all, delete-orphan"})
     conversations: List["Conversation"] = Relationship(back_populates="contact")
     
     
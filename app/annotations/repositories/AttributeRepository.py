@@ -3,7 +3,9 @@ from sqlmodel import Session, func, select
 from app.annotations.models.ContactAttributeLink import ContactAttributeLink
 from app.core.exceptions.custom_exceptions.DataBaseException import DataBaseException
 from app.core.exceptions.custom_exceptions.EntityNotFoundException import EntityNotFoundException
+from app.core.decorators.read_only_decorator import read_only
 from app.core.repository.BaseRepository import BaseRepository
+from app.core.repository.TrigramSearch import similarity_rank, text_match
 from app.annotations.models.Attribute import Attribute
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import selectinload
@@ -57,17 +59,21 @@ class AttributeRepository(BaseRepository[Attribute]):
             await self.session.rollback()
             raise DataBaseException(str(e))
     
+    @read_only
     async def get_by_client_id_and_search(self, client_id: str, page: int, limit: int, search: Optional[str] = None):
         try:
             base_query = select(Attribute).where(Attribute.client_id == client_id)
 
-            if search:
-                base_query = base_query.where(Attribute.name.ilike(f"%{search}%"))
+            if search and search.strip():
+                base_query = base_query.where(text_match([Attribute.name], search))
 
             count_query = select(func.count()).select_from(base_query.subquery())
             total_result = await self.session.exec(count_query)
             total_count = total_result.first()
 
+            if search and search.strip():
+                base_query = base_query.order_by(similarity_rank([Attribute.name], search), Attribute.name)
+
             attributes_result = await self.session.exec(
                 base_query.offset((page - 1) * limit).limit(limit)
             )
@@ -1,20 +1,56 @@
-from typing import Optional
+from typing import Any, Dict, List, Optional
+from uuid import UUID
 from fastapi import logger
 from sqlmodel import Session, delete, func, select
+from app.annotations.models.Attribute import Attribute
 from app.annotations.models.Contact import Contact
 from app.annotations.models.ContactAttributeLink import ContactAttributeLink
 from app.annotations.models.ContactTagLink import ContactTagLink
 from app.core.exceptions.custom_exceptions.DataBaseException import DataBaseException
+from app.core.decorators.read_only_decorator import read_only
 from app.core.repository.BaseRepository import BaseRepository
+from app.core.repository.TrigramSearch import digits_prefix, phone_digits, similarity_rank, text_match
 from app.utils.enums.SortBy import SortBy
 from app.whatsapp.business_profile.v1.models.BusinessProfile import BusinessProfile
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import noload, raiseload, selectinload
+
+
+# Loader option sets, built on call so importing this module doesn't force
+# mapper configuration before every model is imported.
+
+def contact_with_labels():
+    """Contact list/detail views: tags and attributes in one SELECT ... IN each."""
+    return (
+        selectinload(Contact.tag_links).selectinload(ContactTagLink.tag),
+        # the link and attribute sides default to selectin back towards every
+        # contact holding the attribute, cut that off here
+        selectinload(Contact.attribute_links).options(
+            noload(ContactAttributeLink.contact),
+            selectinload(ContactAttributeLink.attribute).noload(Attribute.contact_links),
+        ),
+    )
+
+
+def contact_row_only():
+    """Messaging/webhook lookups need only the row; a relationship access there should fail loudly."""
+    return (raiseload("*"),)
+
+
+def contact_phone_expressions():
+    """
+    Stored numbers are either national (with country_code alongside) or
+    already E.164, so a digits prefix is tried against both forms. These
+    mirror the ix_contacts_*_digits expression indexes.
+    """
+    return (Contact.phone_number, Contact.country_code + Contact.phone_number)
 
 
 class ContactRepository(BaseRepository[Contact]):
     def __init__(self, session: Session):
         super().__init__(Contact, session)
 
+    @read_only
     async def get_by_client_id(
         self,
         client_id: str,
@@ -24,23 +60,31 @@ class ContactRepository(BaseRepository[Contact]):
         sort_by: Optional[SortBy] = None,
         sort_value: Optional[str] = None
     ):
-        query = select(Contact).where(Contact.client_id == client_id)
+        query = select(Contact).where(Contact.client_id == client_id).options(*contact_with_labels())
         count_query = select(func.count(Contact.id)).where(Contact.client_id == client_id)
     
-        if search:
-            name_filter = Contact.name.ilike(f"%{search}%")
-            query = query.where(name_filter)
-            count_query = count_query.where(name_filter)
+        ranking = None
+        if search and search.strip():
+            digits = phone_digits(search)
+            if digits:
+                search_filter = digits_prefix(contact_phone_expressions(), digits)
+            else:
+                search_filter = text_match([Contact.name], search)
+                ranking = similarity_rank([Contact.name], search)
+            query = query.where(search_filter)
+            count_query = count_query.where(search_filter)
     
         if sort_by and sort_value:
             query = query.order_by(getattr(getattr(Contact, sort_by), sort_value)())
+        elif ranking is not None:
+            query = query.order_by(ranking, Contact.created_at.desc(), Contact.id)
         else:
             query = query.order_by(Contact.created_at.desc())
     
         total_count = await self.session.exec(count_query)
         contacts = await self.session.exec(query.offset((page - 1) * limit).limit(limit))
     
-        return {"contacts": contacts.unique().all(), "total_count": total_count.first()}
+        return {"contacts": contacts.all(), "total_count": total_count.first()}
 
     async def updateContractAttributes(self, contact_id: str, attribute: ContactAttributeLink):
         try:
@@ -65,12 +109,31 @@ class ContactRepository(BaseRepository[Contact]):
         except SQLAlchemyError as e:
             await self.session.rollback()
             raise DataBaseException(message=str(e))
+    @read_only
+    async def get_summaries_by_ids(self, ids: List[UUID]) -> Dict[UUID, Any]:
+        """
+        id -> (id, name, phone_number, country_code) rows for list views, in
+        one query and without the eager tag/attribute/note joins.
+        """
+        if not ids:
+            return {}
+        try:
+            query = (
+                select(Contact.id, Contact.name, Contact.phone_number, Contact.country_code)
+                .where(Contact.id.in_(set(ids)))
+            )
+            result = await self.session.exec(query)
+            return {row.id: row for row in result.all()}
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DataBaseException(message=str(e))
+
     async def get_by_client_id_phone_number(self, client_id: str, phone_number: str) -> Contact:
         try:
             query = select(Contact).where(
                 Contact.client_id == client_id,
                 Contact.phone_number == phone_number
-            )
+            ).options(*contact_row_only())
             result = await self.session.exec(query)
             return result.first()
         except SQLAlchemyError as e:
@@ -83,6 +146,7 @@ class ContactRepository(BaseRepository[Contact]):
                     .join(BusinessProfile, Contact.client_id == BusinessProfile.client_id)
                     .where(BusinessProfile.phone_number == business_profile_number)
                     .where(Contact.phone_number == contact_number)
+                    .options(*contact_row_only())
                     )
             result = await self.session.exec(query)
             return result.first()
@@ -2,7 +2,9 @@ from typing import Dict, Any
 from sqlmodel import Session, func, select
 from app.annotations.models.ContactTagLink import ContactTagLink
 from app.core.exceptions.custom_exceptions.DataBaseException import DataBaseException
+from app.core.decorators.read_only_decorator import read_only
 from app.core.repository.BaseRepository import BaseRepository
+from app.core.repository.TrigramSearch import similarity_rank, text_match
 from app.annotations.models.Tag import Tag
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -21,6 +23,7 @@ class TagRepository(BaseRepository[Tag]):
             await self.session.rollback()
             raise DataBaseException(str(e))
 
+    @read_only
     async def get_by_client_id(self, client_id: str, page: int, limit: int) -> Dict[str, Any]:
         try:
             total_count = await self.session.exec(
@@ -54,17 +57,20 @@ class TagRepository(BaseRepository[Tag]):
             await self.session.rollback()
             raise DataBaseException(str(e))
         
+    @read_only
     async def search_tag(self, query_str: str, client_id: str, page: int, limit: int) -> Dict[str, Any]:
         try:
             base_query = select(Tag).where(Tag.client_id == client_id)
             
-            if query_str:
-                base_query = base_query.where(Tag.name.ilike(f"%{query_str}%"))
+            if query_str and query_str.strip():
+                base_query = base_query.where(text_match([Tag.name], query_str))
             
             total_count = (await self.session.execute(
-                select(func.count()).select_from(base_query)
+                select(func.count()).select_from(base_query.subquery())
             )).scalar()
             
+            if query_str and query_str.strip():
+                base_query = base_query.order_by(similarity_rank([Tag.name], query_str), Tag.name)
             tags = (await self.session.execute(
                 base_query.offset((page - 1) * limit).limit(limit)
             )).scalars().all()
@@ -1,4 +1,5 @@
-from typing import Optional
+from typing import Any, Dict, List, Optional
+from uuid import UUID
 
 from fastapi import logger
 from app.annotations.models.Contact import Contact
@@ -22,6 +23,9 @@ class ContactService(BaseService[Contact]):
             page = 1
         return await self.repository.get_by_client_id(client_id, page, limit, search)
     
+    async def get_summaries_by_ids(self, ids: List[UUID]) -> Dict[UUID, Any]:
+        return await self.repository.get_summaries_by_ids(ids)
+
     async def get_by_client_and_contact_number(self, business_profile_number: str, contact_number: str) -> Contact:
         
         return await self.repository.get_by_client_and_contact_number(business_profile_number, contact_number)
@@ -3,7 +3,9 @@ import os
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 import structlog
+from app.core.config.LoaderScopeMiddleWare import LoaderScopeMiddleware
 from app.core.config.LoggingBaseMiddleWare import StructlogRequestMiddleware
+from app.core.config.RateLimitMiddleWare import RedisRateLimitMiddleware
 from app.core.config.logger_config import configure_structlog
 from socketio import ASGIApp
 from starlette.middleware.sessions import SessionMiddleware
@@ -52,6 +54,14 @@ sio_server = container.sio()
 container.wire(modules=[__name__])
 fastapi.container = container
 
+fastapi.add_middleware(
+    RedisRateLimitMiddleware,
+    redis_service=container.async_redis_service(),
+    limit=settings.RATE_LIMIT,
+    window_size=settings.WINDOW_SIZE,
+    client_multiplier=settings.RATE_LIMIT_CLIENT_MULTIPLIER,
+)
+
 fastapi.add_middleware(
     SessionMiddleware,
     secret_key=settings.SESSION_SECRET_KEY,
@@ -73,6 +83,7 @@ fastapi.add_middleware(
     allow_headers=["*"],
 )
 
+fastapi.add_middleware(LoaderScopeMiddleware)
 fastapi.add_middleware(StructlogRequestMiddleware)
 fastapi.add_exception_handler(HTTPException, http_exception_handler)
 fastapi.add_exception_handler(GlobalException, global_exception_handler)
@@ -0,0 +1,120 @@
+import asyncio
+import itertools
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import msgspec
+from aio_pika import ExchangeType, Message, RobustConnection
+from aio_pika.abc import AbstractChannel, AbstractExchange
+
+from app.core.broker.RabbitMQBroker import RabbitMQBroker
+
+# x-max-priority of the priority queues, keep in sync with my_celery/config/celery_config.py
+MAX_PRIORITY = 10
+PRIORITY_QUEUE_ARGUMENTS = {"x-max-priority": MAX_PRIORITY}
+
+
+class BasePublisher:
+    """
+    Publishes Celery task messages to one exchange.
+
+    Channels are opened once and the exchange (plus the consumer queue, when
+    ``queue_name`` is set) is declared once per channel, not per message.
+    Publishes are pipelined: a channel is never held while waiting for the
+    broker's confirm, so concurrent publishes share channels and their
+    confirms are awaited together.
+    """
+
+    exchange_name: str
+    exchange_type: ExchangeType = ExchangeType.DIRECT
+    routing_key: str
+    # declared durable and bound to routing_key, like the Celery side does
+    queue_name: Optional[str] = None
+    # must match the Celery declaration, RabbitMQ refuses a redeclare with other arguments
+    queue_arguments: Optional[Dict[str, Any]] = None
+    # used when publish() is not given one; None leaves the message at 0
+    priority: Optional[int] = None
+    channel_count: int = 4
+
+    def __init__(self, connection: RabbitMQBroker):
+        self._broker = connection
+        self._connection: RobustConnection | None = None
+        self._channels: List[AbstractChannel] = []
+        self._exchanges: Dict[int, AbstractExchange] = {}
+        self._cursor = itertools.count()
+        self._lock = asyncio.Lock()
+
+    async def setup(self):
+        if self._connection and not self._connection.is_closed and self._channels:
+            return
+        async with self._lock:
+            if not self._connection or self._connection.is_closed:
+                self._connection = await self._broker.connect()
+                self._channels, self._exchanges = [], {}
+            while len(self._channels) < self.channel_count:
+                self._channels.append(await self._open_channel())
+
+    async def _open_channel(self) -> AbstractChannel:
+        channel = await self._connection.channel(publisher_confirms=True)
+        exchange = await channel.declare_exchange(self.exchange_name, self.exchange_type, durable=True)
+        if self.queue_name:
+            queue = await channel.declare_queue(self.queue_name, durable=True, arguments=self.queue_arguments)
+            await queue.bind(exchange, routing_key=self.routing_key)
+        self._exchanges[id(channel)] = exchange
+        return channel
+
+    async def _exchange(self) -> AbstractExchange:
+        await self.setup()
+        index = next(self._cursor) % len(self._channels)
+        channel = self._channels[index]
+        if channel.is_closed:
+            async with self._lock:
+                if self._channels[index] is channel:
+                    self._exchanges.pop(id(channel), None)
+                    self._channels[index] = await self._open_channel()
+                channel = self._channels[index]
+        return self._exchanges[id(channel)]
+
+    def build_message(self, payload: Dict[str, Any], priority: Optional[int] = None) -> Message:
+        return Message(
+            body=msgspec.msgpack.encode(payload),
+            content_type='application/msgpack',
+            delivery_mode=2,
+            priority=self.priority if priority is None else priority,
+            headers={"task": payload["task"]},
+        )
+
+    async def publish(self, payload: Dict[str, Any], routing_key: Optional[str] = None,
+                      priority: Optional[int] = None) -> None:
+        """Publish one message and wait for the broker to confirm it."""
+        exchange = await self._exchange()
+        await exchange.publish(self.build_message(payload, priority), routing_key=routing_key or self.routing_key)
+
+    async def publish_batch(self, payloads: Iterable[Dict[str, Any]], routing_key: Optional[str] = None,
+                            priorities: Optional[Sequence[int]] = None) -> int:
+        """
+        Publish every payload back to back on one channel, then wait for all
+        confirms at once. Raises if any message is nacked or returned.
+        ``priorities``, when given, holds one priority per payload.
+        """
+        payloads = list(payloads)
+        priorities = priorities if priorities is not None else [None] * len(payloads)
+        messages = [self.build_message(payload, priority) for payload, priority in zip(payloads, priorities)]
+        if not messages:
+            return 0
+        exchange = await self._exchange()
+        routing_key = routing_key or self.routing_key
+        await asyncio.gather(*(exchange.publish(message, routing_key=routing_key) for message in messages))
+        return len(messages)
+
+    async def publish_window(self, payloads: List[Dict[str, Any]], tenant: Optional[str] = None) -> int:
+        """
+        Publish messages that were queued together (one outbox batch).
+        Publishers that schedule per tenant override this.
+        """
+        return await self.publish_batch(payloads)
+
+    async def close(self) -> None:
+        for channel in self._channels:
+            if not channel.is_closed:
+                await channel.close()
+        self._channels, self._exchanges = [], {}
@@ -1,44 +1,12 @@
 import uuid6
-from aio_pika import ExchangeType, Message, RobustConnection
-from aio_pika.pool import Pool
-import msgspec
-from app.core.broker.RabbitMQBroker import RabbitMQBroker
-from app.whatsapp.broadcast.models.schema.BroadCastTemplate import TemplateObject
-from app.whatsapp.template.models.schema.SendTemplateRequest import SendTemplateRequest
+from app.core.broker.BasePublisher import BasePublisher
 
-class MediaUploadPublisher:
-    def __init__(self, connection: RabbitMQBroker):
-        self._broker = connection
-        self._connection: RobustConnection | None = None
-        self._channel_pool: Pool | None = None
-        self._exchange_name = "upload_media_exchange"
-        self._exchange_type = ExchangeType.DIRECT
-
-    async def setup(self):
-        if not self._connection or self._connection.is_closed:
-            self._connection = await self._broker.connect()
-
-        if self._channel_pool is None:
-            self._channel_pool = Pool(
-                lambda: self._connection.channel(publisher_confirms=True),
-                max_size=8
-            )
+class MediaUploadPublisher(BasePublisher):
+    exchange_name = "upload_media_exchange"
+    routing_key = "upload_media_event"
 
     async def publish_message(self, payload: dict, routing_key: str = "upload_media_event"):
-        await self.setup()
-        msg = Message(
-            body=msgspec.msgpack.encode(payload),
-            content_type='application/msgpack',
-            delivery_mode=2,
-            headers={"task": payload["task"]},
-        )
-        async with self._channel_pool.acquire() as channel:
-            exchange = await channel.declare_exchange(
-                self._exchange_name,
-                self._exchange_type,
-                durable=True
-            )
-            await exchange.publish(msg, routing_key=routing_key)
+        await self.publish(payload, routing_key)
 
     async def upload_media(self, file_path: str,file_id: str):
         payload = {
@@ -51,4 +19,4 @@ class MediaUploadPublisher:
             "retries": 5,
             "eta": None
         }
-        await self.publish_message(payload)
\ No newline at end of file
+        await self.publish_message(payload)
@@ -1,46 +1,32 @@
-import asyncio
-from typing import Any
+from typing import AsyncIterable, AsyncIterator, List, Optional, Sequence
 import uuid6
-from aio_pika import ExchangeType, Message, RobustConnection
-from aio_pika.pool import Pool
-import msgspec
+from app.core.broker.BasePublisher import PRIORITY_QUEUE_ARGUMENTS, BasePublisher
 from app.core.broker.RabbitMQBroker import RabbitMQBroker
+from app.core.services.BroadcastFairScheduler import BroadcastFairScheduler
 from app.whatsapp.broadcast.models.schema.BroadCastTemplate import BroadCastTemplate, TemplateObject
 from app.whatsapp.template.models.schema.SendTemplateRequest import SendTemplateRequest
 
-class MessageBroadcastPublisher:
-    def __init__(self, connection: RabbitMQBroker):
-        self._broker = connection
-        self._connection: RobustConnection | None = None
-        self._channel_pool: Pool | None = None
-        self._exchange_name = "message_broadcast_exchange"
-        self._exchange_type = ExchangeType.DIRECT
+# recipients per template_broadcast_batch task
+DEFAULT_CHUNK_SIZE = 100
+# chunk messages published before waiting for their confirms
+DEFAULT_MAX_IN_FLIGHT = 20
 
-    async def setup(self):
-        if not self._connection or self._connection.is_closed:
-            self._connection = await self._broker.connect()
+async def iter_chunks(numbers: Sequence[str], size: int) -> AsyncIterator[List[str]]:
+    for start in range(0, len(numbers), size):
+        yield list(numbers[start:start + size])
 
-        if self._channel_pool is None:
-            self._channel_pool = Pool(
-                lambda: self._connection.channel(publisher_confirms=True),
-                max_size=8
-            )
+class MessageBroadcastPublisher(BasePublisher):
+    exchange_name = "message_broadcast_exchange"
+    routing_key = "broadcast_messages"
+    queue_name = "message_broadcast_queue"
+    queue_arguments = PRIORITY_QUEUE_ARGUMENTS
+
+    def __init__(self, connection: RabbitMQBroker, fair_scheduler: Optional[BroadcastFairScheduler] = None):
+        super().__init__(connection)
+        self.fair_scheduler = fair_scheduler
 
     async def publish_message(self, payload: dict, routing_key: str = "broadcast_messages"):
-        await self.setup()
-        msg = Message(
-            body=msgspec.msgpack.encode(payload),
-            content_type='application/msgpack',
-            delivery_mode=2,
-            headers={"task": payload["task"]},
-        )
-        async with self._channel_pool.acquire() as channel:
-            exchange = await channel.declare_exchange(
-                self._exchange_name,
-                self._exchange_type,
-                durable=True
-            )
-            await exchange.publish(msg, routing_key=routing_key)
+        await self.publish(payload, routing_key)
 
     async def broadcast_message(self, message_body: TemplateObject, contact_number: str, user_id: str,
                                 business_number: str, bussiness_token: str, business_number_id: str):
@@ -65,18 +51,84 @@ class MessageBroadcastPublisher:
         }
         await self.publish_message(payload)
 
-    async def publish_many( self, *, payloads: BroadCastTemplate, user_id: str, business_number: str,
-                            bussiness_token: str, business_number_id: str):
-        tasks = [
-            self.broadcast_message(
-                message_body=payloads.template_body,
-                contact_number=number,
+    @staticmethod
+    def template_content(template_body: TemplateObject) -> dict:
+        """The template request shared by every chunk of a broadcast, ``to`` is filled in per recipient."""
+        return {
+            "messaging_product": "whatsapp",
+            "type": "template",
+            "template": template_body.model_dump(),
+        }
+
+    @staticmethod
+    def chunk_payload(*, content: dict, recipients: List[str], user_id: str, business_number: str,
+                      bussiness_token: str, business_number_id: str) -> dict:
+        return {
+            "id": str(uuid6.uuid7()),
+            "task": "my_celery.tasks.template_broadcast_batch",
+            "args": [{
+                "user_id": user_id,
+                "business_number": business_number,
+                "content": content,
+                "recipients": recipients,
+                "business_token": bussiness_token,
+                "business_number_id": business_number_id
+            }],
+            "kwargs": {},
+            "retries": 5,
+            "eta": None
+        }
+
+    async def publish_chunks(self, *, recipients: AsyncIterable[List[str]], template_body: TemplateObject,
+                             user_id: str, business_number: str, bussiness_token: str, business_number_id: str,
+                             max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> int:
+        """
+        One template_broadcast_batch message per chunk of ``recipients``, all
+        sharing one template body. Chunks are consumed as they arrive and
+        published ``max_in_flight`` at a time, so memory stays bounded by
+        the window rather than the audience. Returns the number of chunks.
+
+        With a fair scheduler every chunk is counted against
+        ``business_number_id`` and gets a priority that falls as that
+        tenant's backlog grows.
+        """
+        content = self.template_content(template_body)
+        pending, published = [], 0
+        async for chunk in recipients:
+            if not chunk:
+                continue
+            pending.append(self.chunk_payload(
+                content=content,
+                recipients=chunk,
                 user_id=user_id,
                 business_number=business_number,
                 bussiness_token=bussiness_token,
-                business_number_id=business_number_id
-            )
-            for number in payloads.list_of_numbers
-        ]
-        await asyncio.gather(*tasks, return_exceptions=False)
+                business_number_id=business_number_id,
+            ))
+            if len(pending) >= max_in_flight:
+                published += await self.publish_window(pending, business_number_id)
+                pending = []
+        published += await self.publish_window(pending, business_number_id)
+        return published
+
+    async def publish_window(self, payloads: List[dict], tenant: Optional[str] = None) -> int:
+        if not payloads or self.fair_scheduler is None or tenant is None:
+            return await self.publish_batch(payloads)
+        priorities = await self.fair_scheduler.reserve(tenant, len(payloads))
+        try:
+            return await self.publish_batch(payloads, priorities=priorities)
+        except Exception:
+            await self.fair_scheduler.release(tenant, len(payloads))
+            raise
+
+    async def publish_many( self, *, payloads: BroadCastTemplate, user_id: str, business_number: str,
+                            bussiness_token: str, business_number_id: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        await self.publish_chunks(
+            recipients=iter_chunks(payloads.list_of_numbers, chunk_size),
+            template_body=payloads.template_body,
+            user_id=user_id,
+            business_number=business_number,
+            bussiness_token=bussiness_token,
+            business_number_id=business_number_id,
+        )
         return {"status": "success"}
@@ -0,0 +1,148 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, or_, update
+from sqlmodel import select
+
+from app.core.broker.BasePublisher import BasePublisher
+from app.core.broker.models.OutboxEvent import OutboxEvent
+from app.core.config.logger import get_logger
+from app.core.storage.postgres import PostgresDatabase
+from app.utils.DateTimeHelper import DateTimeHelper
+
+logger = get_logger(__name__)
+
+# a failed row waits 1s, 2s, 4s, ... up to 5 minutes before its next attempt
+RETRY_DELAY_SECONDS = 1
+MAX_RETRY_DELAY_SECONDS = 300
+MAX_ERROR_LENGTH = 1000
+
+
+class OutboxRelay:
+    """
+    Publishes outbox_events rows to RabbitMQ.
+
+    Each batch is claimed with ``FOR UPDATE SKIP LOCKED``, published through
+    the publisher that owns its topic (pipelined, confirms awaited together)
+    and deleted in the same transaction. A crash before the commit leaves
+    the rows in place to be published again, so delivery is at least once
+    and consumers must tolerate duplicates.
+
+    Rows are published per (topic, tenant) group and a failing group does
+    not hold back the others: its rows stay, with ``attempts`` counted and
+    ``retry_at`` backed off, and are parked after ``max_attempts`` failures.
+
+    The relay polls every ``poll_interval`` seconds; ``notify()`` after a
+    commit wakes it immediately.
+    """
+
+    def __init__(
+        self,
+        db: PostgresDatabase,
+        publishers: Sequence[BasePublisher],
+        batch_size: int = 500,
+        poll_interval: float = 0.5,
+        max_attempts: int = 10,
+        enabled: bool = True,
+    ):
+        self.db = db
+        self.publishers: Dict[str, BasePublisher] = {p.exchange_name: p for p in publishers}
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.enabled = enabled
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def notify(self) -> None:
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        if not self.enabled or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run(), name="outbox-relay")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                # a full batch means there is probably more waiting
+                while await self.relay_batch() == self.batch_size:
+                    pass
+            except Exception as e:
+                await logger.aerror("outbox_relay_failed", {"error": str(e)})
+
+    async def relay_batch(self) -> int:
+        """Claim and publish up to batch_size rows; returns how many were published and deleted."""
+        async with self.db.session() as session:
+            async with session.begin():
+                now = DateTimeHelper.now_utc()
+                # rows another relay holds are skipped rather than waited for,
+                # so every API process can run a relay and each row goes out once per claim
+                rows = (await session.exec(
+                    select(OutboxEvent.id, OutboxEvent.topic, OutboxEvent.tenant, OutboxEvent.payload,
+                           OutboxEvent.attempts)
+                    .where(
+                        OutboxEvent.topic.in_(list(self.publishers)),
+                        OutboxEvent.attempts < self.max_attempts,
+                        or_(OutboxEvent.retry_at.is_(None), OutboxEvent.retry_at <= now),
+                    )
+                    .order_by(OutboxEvent.id)
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked=True)
+                )).all()
+                if not rows:
+                    return 0
+                groups: Dict[Tuple[str, Optional[str]], List[Any]] = {}
+                for row in rows:
+                    groups.setdefault((row.topic, row.tenant), []).append(row)
+                results = await asyncio.gather(*(
+                    self.publishers[topic].publish_window([row.payload for row in group], tenant)
+                    for (topic, tenant), group in groups.items()
+                ), return_exceptions=True)
+
+                published = []
+                for ((topic, tenant), group), result in zip(groups.items(), results):
+                    if isinstance(result, BaseException):
+                        await self._record_failure(session, topic, tenant, group, result, now)
+                    else:
+                        published.extend(row.id for row in group)
+                if published:
+                    await session.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(published)))
+        return len(published)
+
+    async def _record_failure(self, session, topic: str, tenant: Optional[str], group: List[Any],
+                              error: BaseException, now: datetime) -> None:
+        message = f"{type(error).__name__}: {error}"[:MAX_ERROR_LENGTH]
+        await session.execute(update(OutboxEvent), [
+            {
+                "id": row.id,
+                "attempts": row.attempts + 1,
+                "last_error": message,
+                "retry_at": now + timedelta(seconds=min(RETRY_DELAY_SECONDS * 2 ** row.attempts,
+                                                        MAX_RETRY_DELAY_SECONDS)),
+            }
+            for row in group
+        ])
+        parked = sum(1 for row in group if row.attempts + 1 >= self.max_attempts)
+        await logger.aerror("outbox_publish_failed", {
+            "topic": topic,
+            "tenant": tenant,
+            "rows": len(group),
+            "parked": parked,
+            "error": message,
+        })
@@ -8,6 +8,8 @@ class RabbitMQSettings:
     username: str = "guest"
     password: str = "guest"
     vhost: str = "/"
+    # seconds before a connection attempt gives up instead of blocking its caller
+    connect_timeout: float = 5
 
 class RabbitMQBroker:
     def __init__(self, settings: RabbitMQSettings):
@@ -22,6 +24,7 @@ class RabbitMQBroker:
                 login=self._settings.username,
                 password=self._settings.password,
                 virtualhost=self._settings.vhost,
+                timeout=self._settings.connect_timeout,
             )
         return self._connection
 
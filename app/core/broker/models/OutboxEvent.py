@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import DateTime
+from sqlmodel import JSON, Field
+
+from app.core.schemas.BaseEntity import BaseEntity
+
+
+class OutboxEvent(BaseEntity, table=True):
+    """
+    A broker message written in the same transaction as the change it
+    announces; OutboxRelay publishes it and deletes the row. ``topic`` is
+    the exchange of the publisher that sends it, ``tenant`` groups rows the
+    publisher may schedule together (the business_number_id of a broadcast).
+    Rows are relayed in id (uuid7, so creation) order.
+
+    A row whose publish failed waits until ``retry_at``; after the relay's
+    ``max_attempts`` failures it is parked and left for an operator, with
+    the last error in ``last_error``. Setting ``attempts`` back to 0
+    requeues it.
+    """
+    __tablename__ = "outbox_events"
+
+    topic: str = Field(nullable=False)
+    tenant: Optional[str] = Field(default=None, nullable=True)
+    payload: Dict[str, Any] = Field(sa_type=JSON, nullable=False)
+    attempts: int = Field(default=0, nullable=False, sa_column_kwargs={"server_default": "0"})
+    last_error: Optional[str] = Field(default=None, nullable=True)
+    retry_at: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True), nullable=True)
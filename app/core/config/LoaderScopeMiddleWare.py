@@ -0,0 +1,12 @@
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.repository.DataLoader import loader_scope
+
+
+class LoaderScopeMiddleware(BaseHTTPMiddleware):
+    """Give every request its own repository loaders, see BaseRepository.get."""
+
+    async def dispatch(self, request: Request, call_next):
+        with loader_scope():
+            return await call_next(request)
@@ -7,6 +7,8 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 
 from app.core.config.logger import get_logger
+from app.core.config.settings import settings
+from app.core.storage.query_stats import query_scope
 
 request_id_ctx: ContextVar[str] = ContextVar('request_id', default='SYSTEM')
 correlation_id_ctx: ContextVar[str] = ContextVar('correlation_id', default='GLOBAL')
@@ -72,8 +74,10 @@ class StructlogRequestMiddleware(BaseHTTPMiddleware):
 
         await self._log.ainfo("request_start")
 
-        response = await call_next(request)
+        with query_scope(settings.SQL_N_PLUS_ONE_MAX_REPEATS) as queries:
+            response = await call_next(request)
 
+        bind_contextvars(**queries.summary())
         await self._log.ainfo("request_end", {
             "status_code": response.status_code
         })
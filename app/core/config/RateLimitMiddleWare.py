@@ -0,0 +1,160 @@
+from typing import Optional, Tuple
+import uuid6
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp
+from redis.exceptions import RedisError
+
+from app.core.config.logger import get_logger
+from app.core.exceptions.ErrorHandler import global_exception_handler
+from app.core.exceptions.GlobalException import GlobalException
+from app.core.exceptions.custom_exceptions.TooManyRequestsException import TooManyRequestsException
+from app.core.security.JwtUtility import JwtTokenUtils
+from app.core.storage.redis import AsyncRedisService
+from app.utils.RedisHelper import RedisHelper
+
+# Sliding-window log over one sorted set per scope. Every scope is checked
+# before any of them is charged, so a rejected request never consumes quota.
+# KEYS    : one sorted set per scope (user, client)
+# ARGV[1] : window size in ms
+# ARGV[2] : unique member for this request
+# ARGV[3..]: limit for each key, in KEYS order
+# returns : {allowed, remaining, retry_after_ms}
+SLIDING_WINDOW_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local window = tonumber(ARGV[1])
+local retry_after = 0
+local remaining = -1
+
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[2 + i])
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    local count = redis.call('ZCARD', key)
+    if count >= limit then
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        local wait = tonumber(oldest[2]) + window - now
+        if wait > retry_after then
+            retry_after = wait
+        end
+    end
+    local left = limit - count - 1
+    if remaining < 0 or left < remaining then
+        remaining = left
+    end
+end
+
+if retry_after > 0 then
+    return {0, 0, retry_after}
+end
+
+for _, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now, ARGV[2])
+    redis.call('PEXPIRE', key, window)
+end
+return {1, remaining, 0}
+"""
+
+EXEMPT_PATH_PREFIXES = (
+    "/v1/webhook",
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+    "/socket.io",
+)
+
+
+class RedisRateLimitMiddleware(BaseHTTPMiddleware):
+    def __init__(
+        self,
+        app: ASGIApp,
+        redis_service: AsyncRedisService,
+        limit: int,
+        window_size: int,
+        client_multiplier: int = 10,
+        exempt_prefixes: Tuple[str, ...] = EXEMPT_PATH_PREFIXES,
+    ):
+        super().__init__(app)
+        self._redis_service = redis_service
+        self._limit = limit
+        self._client_limit = limit * client_multiplier
+        self._window_ms = window_size * 1000
+        self._exempt_prefixes = exempt_prefixes
+        self._script = None
+        self._log = get_logger("RateLimit")
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        path = request.url.path
+        if request.method == "OPTIONS" or path.startswith(self._exempt_prefixes):
+            return await call_next(request)
+
+        user_identity, client_identity = self._resolve_identities(request)
+        route_group = self.route_group(path)
+
+        try:
+            allowed, remaining, retry_after_ms = await self._hit(
+                user_identity, client_identity, route_group
+            )
+        except RedisError as e:
+            # fail open: a Redis outage must not take the API down with it
+            await self._log.awarning("rate_limit_unavailable", {"error": str(e)})
+            return await call_next(request)
+
+        if not allowed:
+            retry_after = max(1, -(-retry_after_ms // 1000))
+            response = await global_exception_handler(
+                request,
+                TooManyRequestsException(
+                    details={"route_group": route_group, "retry_after": retry_after}
+                ),
+            )
+            response.headers["Retry-After"] = str(retry_after)
+            response.headers["X-RateLimit-Limit"] = str(self._limit)
+            response.headers["X-RateLimit-Remaining"] = "0"
+            return response
+
+        response = await call_next(request)
+        response.headers["X-RateLimit-Limit"] = str(self._limit)
+        response.headers["X-RateLimit-Remaining"] = str(max(0, remaining))
+        return response
+
+    async def _hit(self, user_identity: str, client_identity: Optional[str], route_group: str):
+        if self._script is None:
+            redis = await self._redis_service.get_redis()
+            self._script = redis.register_script(SLIDING_WINDOW_LUA)
+
+        keys = [RedisHelper.redis_rate_limit_key("user", user_identity, route_group)]
+        limits = [self._limit]
+        if client_identity:
+            keys.append(RedisHelper.redis_rate_limit_key("client", client_identity, route_group))
+            limits.append(self._client_limit)
+
+        allowed, remaining, retry_after_ms = await self._script(
+            keys=keys, args=[self._window_ms, uuid6.uuid7().hex, *limits]
+        )
+        return bool(allowed), int(remaining), int(retry_after_ms)
+
+    def _resolve_identities(self, request: Request) -> Tuple[str, Optional[str]]:
+        ip = request.client.host if request.client else "unknown"
+        authorization = request.headers.get("Authorization", "")
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return f"ip:{ip}", None
+
+        try:
+            claims = JwtTokenUtils.verify_token(token)
+        except GlobalException:
+            return f"ip:{ip}", None
+
+        user_id = claims.get("userId")
+        business_profile_id = claims.get("business_profile_id")
+        user_identity = f"user:{user_id}" if user_id else f"ip:{ip}"
+        client_identity = f"business:{business_profile_id}" if business_profile_id else None
+        return user_identity, client_identity
+
+    @staticmethod
+    def route_group(path: str) -> str:
+        parts = [p for p in path.split("/") if p]
+        if parts and parts[0].startswith("v") and parts[0][1:].isdigit():
+            parts = parts[1:]
+        return parts[0] if parts else "root"
@@ -1,135 +1,75 @@
+import time
 from app.whatsapp.broadcast.use_case.BroadcastConfig import BroadcastConfig
 from app.whatsapp.template.models.Template import Template
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
-from sqlalchemy.future import select
-from app.core.config import settings
+from typing import Dict
+from app.core.config.logger import get_logger
+from app.core.config.seed import seed_demo_data, seed_roles
 from app.core.storage.MongoDB import MongoDB
-from app.whatsapp.business_profile.v1.models.BusinessProfile import BusinessProfile
 from app.core.config.container import Container
-from app.user_management.user.models.Client import Client
-from app.user_management.auth.models.Role import Role
-from app.user_management.user.models.User import User
-from app.user_management.user.models.Team import Team
-from app.utils.enums.RoleEnum import RoleEnum
-from app.utils.encryption import get_hash
 from app.whatsapp.team_inbox.models.Message import Message
 from app.core.config.settings import settings
-ROLES = [
-    "ADMINISTRATOR",
-    "AUTOMATION_MANAGER",
-    "BROADCAST_MANAGER",
-    "DEVELOPER",
-    "DASHBOARD_VIEWER",
-    "TEMPLATE_MANAGER",
-    "BILLING_MANAGER",
-    "OPERATOR",
-    "Contact_MANAGER"
-]
+
+logger = get_logger(__name__)
 
 
 @asynccontextmanager
-async def lifespan(app: FastAPI):
-    mongo = MongoDB(settings.MONGO_URI, settings.MONGO_DB)
-    await mongo.init_db([Message, Template])     
-    broadcast_config : BroadcastConfig = await Container.broadcast_broadcast_config()
+async def startup_phase(name: str, timings: Dict[str, float]):
+    """Record how long one startup phase took, in milliseconds."""
+    started = time.perf_counter()
     try:
-        db_instance = Container.psql()
-        await db_instance.init_db()                  
-        async with db_instance._session_factory() as db:
-            # Create roles
-            async def get_or_create_role(role_name: str) -> Role:
-                result = await db.execute(
-                    select(Role).filter_by(role_name=RoleEnum(role_name))
-                )
-                role = result.scalar_one_or_none()
-                if not role:
-                    role = Role(
-                        role_name=RoleEnum(role_name),
-                        description=f"{role_name} role",
-                    )
-                    db.add(role)
-                    await db.flush()
-                return role
-
-            # Initialize roles
-            for role_name in ROLES:
-                await get_or_create_role(role_name)
-
-            # Create or get client
-            result = await db.execute(select(Client))
-            client = result.scalar_one_or_none()
-            if not client:
-                client = Client(client_id=100)
-                db.add(client)
-                await db.flush()
-
-            # Create or get team
-            result = await db.execute(select(Team).filter_by(name="Example Team"))
-            team = result.scalar_one_or_none()
-            if not team:
-                team = Team(
-                    name="Example Team",
-                    description="A demo team for all 7 users",
-                    client_id=client.id,
-                    is_default=True,
-                )
-                db.add(team)
-                await db.flush()
-
-            # Create or get business profile
-            result = await db.execute(
-                select(BusinessProfile).filter_by(business_id="904055570973681")
-            )
-            business_profile = result.scalar_one_or_none()
-            if not business_profile:
-                business_profile = BusinessProfile(
-                    business_id="904055570973681",
-                    app_id="670614906139142",
-                    phone_number="+15551546858",
-                    phone_number_id="558569350676631",
-                    whatsapp_business_account_id="1691192741820643",
-                    access_token="EAAJh67NC8gYBO237KkRZCbYanv1YAIYLxJOX8h8jufguMqY1JgVpa9ZAJE9eoFHLtZBLduFZCpv9SQWym5Va4ZBzebFAbXHjVyuYNjFM1cdekWZAsnj4cN9Sk8hZB1KzmaGjZCMOiTtyQs9G571p0ZC1PBmAQH6TAq4PiEhQgzLk8jWoHndqMhqqZBcAjZCLZAekE1OSZCEXXZAnLHD5KgGltwek4XSz3SU4SiAWntTRWGHBT5r37IInoZD",
-                    client_id=client.id,
-                )
-                db.add(business_profile)
-                await db.flush()
+        yield
+    finally:
+        timings[name] = round((time.perf_counter() - started) * 1000, 1)
+        logger.info("startup_phase", {"phase": name, "duration_ms": timings[name]})
 
-            # Create users
-            result = await db.execute(select(User))
-            users = result.scalars().all()
-            emails_in_use = {u.email for u in users}
 
-            for i, role_name in enumerate(ROLES, start=1):
-                user_email = f"user{i}@example.com"
-                if user_email in emails_in_use:
-                    continue
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    timings: Dict[str, float] = {}
+    development = settings.APP_ENV == "development"
 
-                result = await db.execute(
-                    select(Role).filter_by(role_name=RoleEnum(role_name))
-                )
-                user_role = result.scalar_one()
-                new_user = User(
-                    first_name=f"First{i}",
-                    last_name=f"Last{i}",
-                    email=user_email,
-                    phone_number=f"+962791122048{i}",
-                    password=get_hash(f"Password{i}"),
-                    is_base_admin=(role_name == "ADMINISTRATOR"),
-                    online_status=True,
-                    client_id=client.id,
-                )
-                new_user.roles.append(user_role)
-                new_user.teams.append(team)
-                db.add(new_user)
+    async with startup_phase("mongo", timings):
+        mongo = MongoDB(settings.MONGO_URI, settings.MONGO_DB)
+        await mongo.init_db([Message, Template])
+        message_write_behind = Container.mongo_message_write_behind()
+        await message_write_behind.start()
+    broadcast_config : BroadcastConfig = await Container.broadcast_broadcast_config()
+    db_instance = Container.psql()
+    outbox_relay = Container.outbox_relay()
+    try:
+        # create_all takes locks on every table and races between workers;
+        # outside development the schema is owned by Alembic
+        if development:
+            async with startup_phase("postgres_create_all", timings):
+                await db_instance.init_db()
+        else:
+            async with startup_phase("postgres_migration_check", timings):
+                await db_instance.check_migrations(settings.ALEMBIC_CONFIG)
 
-            # Commit all changes
+        async with db_instance._session_factory() as db:
+            async with startup_phase("seed_roles", timings):
+                roles = await seed_roles(db)
+            if development:
+                async with startup_phase("seed_demo_data", timings):
+                    await seed_demo_data(db, roles)
             await db.commit()
+
+        async with startup_phase("outbox_relay", timings):
+            await outbox_relay.start()
+        async with startup_phase("broadcast_listener", timings):
             await broadcast_config.start_listener()
+        logger.info("startup_complete", {
+            "app_env": settings.APP_ENV,
+            "total_ms": round(sum(timings.values()), 1),
+            "phases_ms": timings,
+        })
         yield
     finally:
         # Cleanup
-        await db_instance._engine.dispose()
-        mongo.client.close()   
+        await outbox_relay.close()
+        await db_instance.dispose()
+        await message_write_behind.close()
+        mongo.client.close()
         await broadcast_config.stop_listener()
-
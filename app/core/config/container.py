@@ -31,12 +31,20 @@ from app.chat_bot.repositories.ChatBotRepositories import ChatBotRepository
 from app.chat_bot.services.ChatBotService import ChatBotService
 from app.chat_bot.v1.use_case.CreateChatBot import CreateChatBot
 from app.core.broker.MessageBroadcastPublisher import MessageBroadcastPublisher
+from app.core.broker.OutboxRelay import OutboxRelay
 from app.core.broker.RabbitMQBroker import RabbitMQBroker,RabbitMQSettings
 from app.core.broker.WhatsappMessagePublisher import  WhatsappMessagePublisher
 from app.core.exceptions.ErrorHandler import raise_for_status
 
 from app.core.repository.MongoRepository import MongoCRUD
+from app.core.repository.MongoWriteBehind import MongoWriteBehind
+from app.core.repository.OutboxRepository import OutboxRepository
+from app.whatsapp.team_inbox.repositories.MessageArchiveRepository import MessageArchiveRepository
+from app.whatsapp.team_inbox.repositories.MessageBucketRepository import MessageBucketRepository
+from app.core.services.BroadcastFairScheduler import BroadcastFairScheduler
+from app.core.services.OutboxService import OutboxService
 from app.core.services.S3Service import S3Service
+from app.core.services.WhatsAppThroughputGovernor import WhatsAppThroughputGovernor
 from app.core.storage.redis import AsyncRedisService
 from app.real_time.socketio.socket_gateway import SocketMessageGateway
 from app.real_time.webhook.services.MessageHook import MessageHook
@@ -76,6 +84,7 @@ from app.whatsapp.team_inbox.services.ConversationService import ConversationSer
 from app.whatsapp.team_inbox.services.MessageService import MessageService
 from app.whatsapp.team_inbox.v1.use_case.AssignedUserToConversation import AssignedUserToConversation
 from app.whatsapp.team_inbox.v1.use_case.GetConversationMessages import GetConversationMessages
+from app.whatsapp.team_inbox.v1.use_case.SearchConversationMessages import SearchConversationMessages
 from app.whatsapp.team_inbox.v1.use_case.GetUserConversations import GetUserConversations
 from app.whatsapp.team_inbox.v1.use_case.CreateNewConversation import CreateNewConversation
 from app.whatsapp.team_inbox.v1.use_case.LocationMessage import LocationMessage
@@ -209,12 +218,40 @@ class Container(containers.DeclarativeContainer):
     )
     
     #----- STORAGE Config -----
-    psql = providers.Singleton(PostgresDatabase, db_url = config.POSTGRES_DATABASE_URL)
+    psql = providers.Singleton(
+        PostgresDatabase,
+        db_url = config.POSTGRES_DATABASE_URL,
+        replica_urls = config.POSTGRES_REPLICA_URLS,
+        pool_size = config.POSTGRES_POOL_SIZE,
+        max_overflow = config.POSTGRES_MAX_OVERFLOW,
+        replica_pool_size = config.POSTGRES_REPLICA_POOL_SIZE,
+        replica_max_overflow = config.POSTGRES_REPLICA_MAX_OVERFLOW,
+        max_replica_lag = config.POSTGRES_REPLICA_MAX_LAG,
+        slow_query_ms = config.SQL_SLOW_QUERY_MS,
+        connection_budget = config.POSTGRES_API_CONNECTION_BUDGET,
+        workers = config.API_WORKERS,
+        pool_timeout = config.POSTGRES_POOL_TIMEOUT,
+        pgbouncer = config.POSTGRES_PGBOUNCER,
+        statement_cache_size = config.POSTGRES_STATEMENT_CACHE_SIZE,
+    )
     session = providers.Resource(get_session, db_instance=psql)
 
     http_client = providers.Singleton(httpx.AsyncClient, event_hooks={'response': [raise_for_status]}, timeout=120)
     
-    mongo_crud_message = providers.Singleton(MongoCRUD, model = Message) 
+    mongo_message_write_behind = providers.Singleton(
+        MongoWriteBehind,
+        model=Message,
+        enabled=config.MONGO_WRITE_BEHIND_ENABLED,
+        max_batch_size=config.MONGO_WRITE_BEHIND_BATCH_SIZE,
+        flush_interval=config.MONGO_WRITE_BEHIND_FLUSH_INTERVAL,
+        spill_dir=config.MONGO_WRITE_BEHIND_SPILL_DIR,
+    )
+    mongo_crud_message = providers.Selector(
+        config.MESSAGE_STORAGE_MODE,
+        document=providers.Singleton(MongoCRUD, model = Message, write_behind = mongo_message_write_behind),
+        bucket=providers.Singleton(MessageBucketRepository, bucket_size = config.MESSAGE_BUCKET_SIZE),
+    ) 
+    message_archive_repository = providers.Singleton(MessageArchiveRepository)
     mongo_crud_template = providers.Singleton(MongoCRUD, model = Template) 
     mongo_crud_chat_bot = providers.Singleton(MongoCRUD, model=ChatBot)
     
@@ -225,6 +262,7 @@ class Container(containers.DeclarativeContainer):
         username=config.RABBITMQ_DEFAULT_USER,
         password=config.RABBITMQ_DEFAULT_PASS,
         vhost=config.RABBITMQ_VHOST,
+        connect_timeout=config.RABBITMQ_CONNECT_TIMEOUT,
     )
     
     rabbitmq_connection = providers.Singleton(
@@ -245,10 +283,20 @@ class Container(containers.DeclarativeContainer):
     
     #----- pub/sub -----
     message_publisher = providers.Singleton(WhatsappMessagePublisher, connection=rabbitmq_connection)
-    message_broadcast_publisher = providers.Singleton(MessageBroadcastPublisher, connection=rabbitmq_connection)
+    broadcast_fair_scheduler = providers.Singleton(BroadcastFairScheduler, redis_service=async_redis_service)
+    message_broadcast_publisher = providers.Singleton(MessageBroadcastPublisher, connection=rabbitmq_connection, fair_scheduler=broadcast_fair_scheduler)
+    outbox_relay = providers.Singleton(
+        OutboxRelay,
+        db=psql,
+        publishers=providers.List(message_publisher, message_broadcast_publisher),
+        batch_size=config.OUTBOX_BATCH_SIZE,
+        poll_interval=config.OUTBOX_POLL_INTERVAL,
+        max_attempts=config.OUTBOX_MAX_ATTEMPTS,
+    )
     
     #----- REPOSITORIES -----
     user_repository = providers.Factory(UserRepository, session = session)
+    outbox_repository = providers.Factory(OutboxRepository, session = session)
     team_repository = providers.Factory(TeamRepository, session = session)
     client_repository = providers.Factory(ClientRepository, session = session)
     refresh_token_repository = providers.Factory(RefreshTokenRepository, session = session)
@@ -267,6 +315,7 @@ class Container(containers.DeclarativeContainer):
     
     #----- SERVICES -----
     user_service = providers.Factory(UserService, repository = user_repository)
+    outbox_service = providers.Factory(OutboxService, repository = outbox_repository, relay = outbox_relay)
     client_service = providers.Factory(ClientService, repository = client_repository)
     team_service = providers.Factory(TeamService, repository = team_repository)
     role_service = providers.Factory(RoleService, repository = role_repository)
@@ -284,10 +333,18 @@ class Container(containers.DeclarativeContainer):
     chat_bot_service = providers.Factory(ChatBotService, repository = chat_bot_repository)
     
     #----- API -----
+    whatsapp_throughput_governor = providers.Singleton(
+        WhatsAppThroughputGovernor,
+        redis_service=async_redis_service,
+        tier=config.WHATSAPP_THROUGHPUT_TIER,
+        headroom=config.WHATSAPP_THROUGHPUT_HEADROOM,
+        pair_rate_seconds=config.WHATSAPP_PAIR_RATE_SECONDS,
+        max_wait_seconds=config.WHATSAPP_THROUGHPUT_MAX_WAIT,
+    )
     business_profile_api = providers.Singleton(BusinessProfileApi, client = http_client)
-    whatsapp_template_api = providers.Singleton(WhatsAppTemplateApi, client = http_client)
+    whatsapp_template_api = providers.Singleton(WhatsAppTemplateApi, client = http_client, throughput_governor = whatsapp_throughput_governor)
     whatsapp_media_api = providers.Singleton(WhatsAppMediaApi, client = http_client)
-    whatsapp_message_api = providers.Singleton(WhatsAppMessageApi, client = http_client)
+    whatsapp_message_api = providers.Singleton(WhatsAppMessageApi, client = http_client, throughput_governor = whatsapp_throughput_governor)
     
     #-------------- USE CASES --------------
     
@@ -347,7 +404,8 @@ class Container(containers.DeclarativeContainer):
     
     
     #----- MESSAGE USE CASES -----
-    get_conversation_messages = providers.Factory(GetConversationMessages, conversation_service = conversation_service,user_service = user_service, mongo_crud = mongo_crud_message)
+    get_conversation_messages = providers.Factory(GetConversationMessages, conversation_service = conversation_service,user_service = user_service, mongo_crud = mongo_crud_message, message_archive = message_archive_repository)
+    search_conversation_messages = providers.Factory(SearchConversationMessages, conversation_service = conversation_service, user_service = user_service, mongo_crud = mongo_crud_message)
     whatsapp_message_text_message = providers.Factory(TextMessage, whatsapp_message_api=whatsapp_message_api, user_service=user_service, business_profile_service=business_profile_service, message_service=message_service, conversation_service=conversation_service,contact_service=contact_service,redis_service=async_redis_service,mongo_crud=mongo_crud_message)  
     whatsapp_message_template_message = providers.Factory(TemplateMessage, whatsapp_message_api=whatsapp_message_api, user_service=user_service, business_profile_service=business_profile_service, template_service=template_service, conversation_service=conversation_service,contact_service=contact_service,assignment_service=assignment_service,redis_service=async_redis_service,mongo_crud_message=mongo_crud_message, mongo_crud_template=mongo_crud_template, message_service=message_service)
     whatsapp_message_media_message = providers.Factory(MediaMessage, whatsapp_message_api = whatsapp_message_api, whatsapp_media_api = whatsapp_media_api, user_service = user_service, business_profile_service = business_profile_service, message_service = message_service, conversation_service = conversation_service, contact_service = contact_service, assignment_service = assignment_service, s3_bucket_service = s3_bucket_service, aws_region = config.AWS_REGION, aws_s3_bucket_name = config.S3_BUCKET_NAME, redis_service = async_redis_service ,mongo_crud = mongo_crud_message)
@@ -382,7 +440,7 @@ class Container(containers.DeclarativeContainer):
     
     #----- BroadCast -----
     broadcast_get_broadcasts = providers.Factory(GetBroadcasts, broadcast_service = broadcast_service, business_profile_service = business_profile_service)
-    broadcast_schedule_broadcast = providers.Factory(BroadcastScheduler, broadcast_service = broadcast_service, user_service = user_service,contact_service = contact_service,bussiness_service = business_profile_service, redis = async_redis_service, message_publisher = message_broadcast_publisher, mongo_crud_template = mongo_crud_template) 
+    broadcast_schedule_broadcast = providers.Factory(BroadcastScheduler, broadcast_service = broadcast_service, user_service = user_service,contact_service = contact_service,bussiness_service = business_profile_service, redis = async_redis_service, mongo_crud_template = mongo_crud_template, outbox_service = outbox_service, db = psql) 
     broadcast_cancel_broadcast = providers.Factory(CancelBroadcast, broadcast_service = broadcast_service, redis_service = async_redis_service)
     broadcast_broadcast_config = providers.Singleton(BroadcastConfig,redis_service = async_redis_service, broadcast_scheduler = broadcast_schedule_broadcast)
     
@@ -392,7 +450,7 @@ class Container(containers.DeclarativeContainer):
 
     #----- RealTime -----
     template_hook = providers.Singleton(TemplateHook, template_service = template_service, client_service = client_service, business_profile_service = business_profile_service, mongo_crud = mongo_crud_template, wa_template_api = whatsapp_template_api)
-    message_hook = providers.Singleton(MessageHook, message_service = message_service,conversation_service = conversation_service, save_message = save_message_document, contact_service = contact_service, client_service = client_service, assignment_service = assignment_service,team_service = team_service, business_profile_service = business_profile_service ,message_publisher = message_publisher, media_api = whatsapp_media_api,redis_service = async_redis_service,mongo_message = mongo_crud_message,socket_message = socket_message_gateway, s3_service = s3_bucket_service, aws_s3_bucket = config.S3_BUCKET_NAME, aws_region = config.AWS_REGION)
+    message_hook = providers.Singleton(MessageHook, message_service = message_service,conversation_service = conversation_service, save_message = save_message_document, contact_service = contact_service, client_service = client_service, assignment_service = assignment_service,team_service = team_service, business_profile_service = business_profile_service ,outbox_service = outbox_service, media_api = whatsapp_media_api,redis_service = async_redis_service,mongo_message = mongo_crud_message,socket_message = socket_message_gateway, s3_service = s3_bucket_service, aws_s3_bucket = config.S3_BUCKET_NAME, aws_region = config.AWS_REGION)
     webhook_dispatcher = providers.Factory(WebhookDispatcher, message_hook = message_hook, template_hook = template_hook)
     
     #----- ChatBot -----
@@ -0,0 +1,112 @@
+from typing import Dict
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.repository.BaseRepository import BaseRepository
+from app.user_management.auth.models.Role import Role
+from app.user_management.auth.models.UserRole import UserRole
+from app.user_management.auth.repositories.RoleRepository import RoleRepository
+from app.user_management.user.models.Client import Client
+from app.user_management.user.models.Team import Team
+from app.user_management.user.models.User import User
+from app.user_management.user.models.UserTeam import UserTeam
+from app.utils.encryption import get_hash
+from app.utils.enums.RoleEnum import RoleEnum
+from app.whatsapp.business_profile.v1.models.BusinessProfile import BusinessProfile
+
+ROLES = [
+    "ADMINISTRATOR",
+    "AUTOMATION_MANAGER",
+    "BROADCAST_MANAGER",
+    "DEVELOPER",
+    "DASHBOARD_VIEWER",
+    "TEMPLATE_MANAGER",
+    "BILLING_MANAGER",
+    "OPERATOR",
+    "Contact_MANAGER"
+]
+
+DEMO_CLIENT_ID = 100
+DEMO_TEAM = "Example Team"
+DEMO_BUSINESS_ID = "904055570973681"
+
+
+async def seed_roles(db: AsyncSession) -> Dict[RoleEnum, Role]:
+    """Every role in ROLES, inserted with one ``INSERT ... ON CONFLICT DO NOTHING``."""
+    await RoleRepository(session=db).bulk_upsert(
+        [{"role_name": RoleEnum(name), "description": f"{name} role"} for name in ROLES],
+        conflict_cols=["role_name"],
+        commit=False,
+    )
+    result = await db.exec(select(Role))
+    return {role.role_name: role for role in result.all()}
+
+
+async def seed_demo_data(db: AsyncSession, roles: Dict[RoleEnum, Role]) -> None:
+    """
+    Demo client, team, business profile and one user per role, for local
+    development only. Each table gets a single idempotent bulk insert, and
+    passwords are hashed only for users that don't exist yet.
+    """
+    await BaseRepository(Client, db).bulk_upsert(
+        [{"client_id": DEMO_CLIENT_ID}], conflict_cols=["client_id"], commit=False
+    )
+    client = (await db.exec(select(Client).where(Client.client_id == DEMO_CLIENT_ID))).one()
+
+    await BaseRepository(Team, db).bulk_upsert(
+        [{
+            "name": DEMO_TEAM,
+            "client_id": client.id,
+            "is_default": True,
+        }],
+        conflict_cols=["name"],
+        commit=False,
+    )
+    team = (await db.exec(select(Team).where(Team.name == DEMO_TEAM))).one()
+
+    await BaseRepository(BusinessProfile, db).bulk_upsert(
+        [{
+            "business_id": DEMO_BUSINESS_ID,
+            "app_id": "670614906139142",
+            "phone_number": "+15551546858",
+            "phone_number_id": "558569350676631",
+            "whatsapp_business_account_id": "1691192741820643",
+            "access_token": "EAAJh67NC8gYBO237KkRZCbYanv1YAIYLxJOX8h8jufguMqY1JgVpa9ZAJE9eoFHLtZBLduFZCpv9SQWym5Va4ZBzebFAbXHjVyuYNjFM1cdekWZAsnj4cN9Sk8hZB1KzmaGjZCMOiTtyQs9G571p0ZC1PBmAQH6TAq4PiEhQgzLk8jWoHndqMhqqZBcAjZCLZAekE1OSZCEXXZAnLHD5KgGltwek4XSz3SU4SiAWntTRWGHBT5r37IInoZD",
+            "client_id": client.id,
+        }],
+        conflict_cols=["business_id"],
+        commit=False,
+    )
+
+    role_by_email = {f"user{i}@example.com": RoleEnum(name) for i, name in enumerate(ROLES, start=1)}
+    existing = set((await db.exec(select(User.email).where(User.email.in_(role_by_email)))).all())
+    await BaseRepository(User, db).bulk_upsert(
+        [
+            {
+                "first_name": f"First{i}",
+                "last_name": f"Last{i}",
+                "email": email,
+                "phone_number": f"+962791122048{i}",
+                "password": get_hash(f"Password{i}"),
+                "is_base_admin": role == RoleEnum.ADMINISTRATOR,
+                "online_status": True,
+                "client_id": client.id,
+            }
+            for i, (email, role) in enumerate(role_by_email.items(), start=1)
+            if email not in existing
+        ],
+        conflict_cols=["email"],
+        commit=False,
+    )
+
+    user_ids = dict((await db.exec(select(User.email, User.id).where(User.email.in_(role_by_email)))).all())
+    await BaseRepository(UserRole, db).bulk_upsert(
+        [{"user_id": user_ids[email], "role_id": roles[role].id} for email, role in role_by_email.items()],
+        conflict_cols=["user_id", "role_id"],
+        commit=False,
+    )
+    await BaseRepository(UserTeam, db).bulk_upsert(
+        [{"user_id": user_id, "team_id": team.id} for user_id in user_ids.values()],
+        conflict_cols=["user_id", "team_id"],
+        commit=False,
+    )
@@ -1,8 +1,14 @@
+from typing import Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
-    
+
+    # "development" creates tables and seeds demo data on startup; anything
+    # else only checks that Alembic migrations are at head
+    APP_ENV: str = "development"
+    ALEMBIC_CONFIG: str = "alembic.ini"
+
     # AWS
     AWS_ACCESS_KEY_ID: str
     AWS_SECRET_ACCESS_KEY: str
@@ -28,10 +34,23 @@ class Settings(BaseSettings):
     # Rate Limit
     RATE_LIMIT: int
     WINDOW_SIZE: int
+    RATE_LIMIT_CLIENT_MULTIPLIER: int = 10
 
     # WhatsApp API
     WHATSAPP_API_VERSION: str
     WHATSAPP_WEBHOOK_VERIFY_TOKEN: str
+    WHATSAPP_THROUGHPUT_TIER: str = "standard"
+    WHATSAPP_THROUGHPUT_HEADROOM: float = 0.9
+    WHATSAPP_PAIR_RATE_SECONDS: float = 6
+    WHATSAPP_THROUGHPUT_MAX_WAIT: float = 6
+    # recipients per broadcast task, and chunk messages awaiting confirms at once
+    BROADCAST_CHUNK_SIZE: int = 100
+    BROADCAST_MAX_IN_FLIGHT: int = 20
+    # outbox rows per relay transaction, and how often the relay polls when nobody wakes it
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_POLL_INTERVAL: float = 0.5
+    # failed publishes of one row before the relay parks it
+    OUTBOX_MAX_ATTEMPTS: int = 10
     
     SESSION_SECRET_KEY: str
 
@@ -42,12 +61,42 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
     POSTGRES_DATABASE_URL_CELERY: str
+    POSTGRES_POOL_SIZE: int = 20
+    POSTGRES_MAX_OVERFLOW: int = 10
+    # connections all API workers together may hold on the primary; when set
+    # it replaces POSTGRES_POOL_SIZE/POSTGRES_MAX_OVERFLOW. The Celery worker
+    # containers have budgets of their own (docker-compose.yml), the sum of
+    # all of them has to stay below the server's max_connections
+    POSTGRES_API_CONNECTION_BUDGET: int = 0
+    API_WORKERS: int = 1
+    POSTGRES_POOL_TIMEOUT: float = 30
+    # transaction-mode PgBouncer in front of Postgres
+    POSTGRES_PGBOUNCER: bool = False
+    # asyncpg prepared statement cache; unset means 100 direct, 0 behind PgBouncer
+    POSTGRES_STATEMENT_CACHE_SIZE: Optional[int] = None
+    # comma separated; empty keeps every query on the primary
+    POSTGRES_REPLICA_URLS: str = ""
+    POSTGRES_REPLICA_POOL_SIZE: int = 10
+    POSTGRES_REPLICA_MAX_OVERFLOW: int = 5
+    POSTGRES_REPLICA_MAX_LAG: float = 2.0
+    SQL_SLOW_QUERY_MS: float = 200
+    # fail a request that runs one statement more often than this; 0 disables
+    SQL_N_PLUS_ONE_MAX_REPEATS: int = 0
 
     # Mongo DB
     MONGO_USER: str
     MONGO_PASSWORD: str
     MONGO_DB: str
     MONGO_URI: str
+    # opt-in; when enabled, MONGO_WRITE_BEHIND_SPILL_DIR must be on a durable
+    # volume, every process spills to its own file there
+    MONGO_WRITE_BEHIND_ENABLED: bool = False
+    MONGO_WRITE_BEHIND_BATCH_SIZE: int = 500
+    MONGO_WRITE_BEHIND_FLUSH_INTERVAL: float = 0.05
+    MONGO_WRITE_BEHIND_SPILL_DIR: str = ""
+    # "document" (one document per message) or "bucket" (per-conversation buckets)
+    MESSAGE_STORAGE_MODE: str = "document"
+    MESSAGE_BUCKET_SIZE: int = 100
     
     # RabbitMQ
     RABBITMQ_HOST: str
@@ -56,6 +105,7 @@ class Settings(BaseSettings):
     RABBITMQ_DEFAULT_USER: str
     RABBITMQ_DEFAULT_PASS: str
     RABBITMQ_URI: str
+    RABBITMQ_CONNECT_TIMEOUT: float = 5
 
     class Config:
         env_file = ".env"
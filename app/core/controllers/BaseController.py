@@ -1,13 +1,17 @@
 from fastapi import APIRouter, Depends, File, UploadFile 
 import fastapi
+from app.core.broker.OutboxRelay import OutboxRelay
 from app.core.broker.WhatsappMessagePublisher import WhatsappMessagePublisher
 from app.core.config.container import Container
+from app.core.repository.OutboxRepository import OutboxRepository
 from app.core.schemas.BaseResponse import ApiResponse
 import sys
 
 from dependency_injector.wiring import Provide, inject
 
+from app.core.services.BroadcastFairScheduler import BroadcastFairScheduler
 from app.core.services.S3Service import S3Service
+from app.core.storage.postgres import PostgresDatabase
 
 router = APIRouter()
 
@@ -18,6 +22,33 @@ async def getInfo():
     return ApiResponse.success_response(message="Server is up and running", status_code=200,data= data)
 
 
+@router.get("/db-pool", response_model=ApiResponse)
+@inject
+async def get_db_pool(db: PostgresDatabase = Depends(Provide[Container.psql])):
+    return ApiResponse.success_response(message="Database pool status", status_code=200, data=db.pool_status())
+
+
+@router.get("/broadcast-queues", response_model=ApiResponse)
+@inject
+async def get_broadcast_queues(
+    scheduler: BroadcastFairScheduler = Depends(Provide[Container.broadcast_fair_scheduler]),
+):
+    return ApiResponse.success_response(
+        message="Broadcast queue depth per tenant", status_code=200, data=await scheduler.queue_depths()
+    )
+
+
+@router.get("/outbox", response_model=ApiResponse)
+@inject
+async def get_outbox(
+    outbox: OutboxRepository = Depends(Provide[Container.outbox_repository]),
+    relay: OutboxRelay = Depends(Provide[Container.outbox_relay]),
+):
+    return ApiResponse.success_response(
+        message="Outbox rows waiting per topic", status_code=200, data=await outbox.backlog(relay.max_attempts)
+    )
+
+
 @router.post("/test-create-message")
 @inject
 async def test_create_message(test_message:WhatsappMessagePublisher = Depends(Provide[Container.message_publisher])):
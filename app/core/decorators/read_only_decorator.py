@@ -0,0 +1,19 @@
+import functools
+from typing import Any, Callable
+
+from app.core.storage.postgres import replica_reads
+
+
+def read_only(func: Callable):
+    """
+    Repository methods whose SELECTs may be served by a read replica. Only
+    for list/report reads that tolerate POSTGRES_REPLICA_MAX_LAG of staleness;
+    reads that follow a write in the same request go to the primary anyway.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs) -> Any:
+        async with replica_reads(self.session):
+            return await func(self, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,23 @@
+from typing import Any, Dict, Optional
+from fastapi import status
+from app.utils.enums.ErrorCode import ErrorCode
+from app.core.exceptions.GlobalException import GlobalException
+from app.core.schemas.ExceptionResponse import ExceptionResponse
+
+
+class TooManyRequestsException(GlobalException):
+    def __init__(
+        self,
+        message: str = "Too many requests",
+        details: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            error_code=ErrorCode.TOO_MANY_REQUESTS,
+            details=details,
+        )
+
+    @classmethod
+    def exception_response(cls):
+        return ExceptionResponse.generate(cls)
@@ -1,25 +1,70 @@
 from sqlmodel import SQLModel, Session, select
-from typing import Dict, Generic, TypeVar, Type, List, Any
+from typing import Dict, Generic, Iterable, Optional, Sequence, TypeVar, Type, List, Any, Union
 from uuid import UUID
 
+from sqlalchemy import inspect, update as sa_update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
 from app.core.exceptions.custom_exceptions.DataBaseException import DataBaseException
 from app.core.exceptions.custom_exceptions.EntityNotFoundException import EntityNotFoundException
 from sqlalchemy.exc import SQLAlchemyError
+from app.core.repository.DataLoader import DataLoader, get_loader
+from app.utils.DateTimeHelper import DateTimeHelper
 
 T = TypeVar("T", bound=SQLModel)
 
+DEFAULT_BULK_CHUNK_SIZE = 1000
+# asyncpg refuses statements with more than 32767 bind parameters
+MAX_BIND_PARAMS = 32767
+
 
 class BaseRepository(Generic[T]):
     def __init__(self, model: Type[T], session: Session):
         self.model = model
         self.session = session
 
+    @property
+    def _pk(self):
+        return inspect(self.model).primary_key[0]
+
+    def _loader(self) -> Optional[DataLoader]:
+        return get_loader((self.model, id(self.session)), lambda: DataLoader(self._load_by_ids))
+
+    async def _load_by_ids(self, ids: List[Any]) -> Dict[Any, T]:
+        result = await self.session.exec(select(self.model).where(self._pk.in_(ids)))
+        return {getattr(obj, self._pk.key): obj for obj in result.unique().all()}
+
     async def get(self, id: UUID) -> T:
+        """
+        Inside a request scope the lookup goes through the request's loader,
+        so concurrent gets are batched into one query and repeats are served
+        from memory.
+        """
         try:
+            loader = self._loader()
+            if loader is not None:
+                return await loader.load(id)
             return await self.session.get(self.model, id)
         except SQLAlchemyError as e:
             raise e
 
+    async def get_many(self, ids: Iterable[UUID]) -> List[T]:
+        """Rows for ``ids`` in one ``WHERE id IN (...)`` query, in input order, missing ids skipped."""
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return []
+        try:
+            loader = self._loader()
+            if loader is not None:
+                found = await loader.load_many(ids)
+            else:
+                by_id = {DataLoader.cache_key(k): v for k, v in (await self._load_by_ids(ids)).items()}
+                found = [by_id.get(DataLoader.cache_key(i)) for i in ids]
+            return [obj for obj in found if obj is not None]
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DataBaseException(str(e))
+
     async def get_all(self) -> List[T]:
         try:
             statement = select(self.model)
@@ -35,6 +80,9 @@ class BaseRepository(Generic[T]):
             if commit:
                 await self.session.commit()
                 await self.session.refresh(obj)
+            loader = self._loader()
+            if loader is not None:
+                loader.clear(getattr(obj, self._pk.key))
             return obj
         except SQLAlchemyError as e:
             await self.session.rollback()
@@ -68,8 +116,125 @@ class BaseRepository(Generic[T]):
                 raise EntityNotFoundException()
             
             await self.session.delete(obj)
+            loader = self._loader()
+            if loader is not None:
+                loader.clear(id)
             if commit:
                 await self.session.commit()
         except SQLAlchemyError as e:
             await self.session.rollback()
-            raise DataBaseException(str(e))
\ No newline at end of file
+            raise DataBaseException(str(e))
+
+    def _bulk_rows(self, objs: Iterable[Union[T, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Column dicts for Core statements, with the model's default factories applied."""
+        columns = self.model.__table__.columns.keys()
+        rows = []
+        for obj in objs:
+            instance = obj if isinstance(obj, self.model) else self.model(**obj)
+            rows.append({name: getattr(instance, name) for name in columns if hasattr(instance, name)})
+        return rows
+
+    @staticmethod
+    def _chunks(rows: List[Dict[str, Any]], chunk_size: Optional[int]) -> Iterable[List[Dict[str, Any]]]:
+        width = max(len(rows[0]), 1)
+        size = min(chunk_size or DEFAULT_BULK_CHUNK_SIZE, MAX_BIND_PARAMS // width)
+        for start in range(0, len(rows), size):
+            yield rows[start:start + size]
+
+    async def _bulk_insert(self,
+                           objs: Sequence[Union[T, Dict[str, Any]]],
+                           conflict_cols: Optional[Sequence[str]],
+                           update_cols: Optional[Sequence[str]],
+                           chunk_size: Optional[int],
+                           returning: bool,
+                           commit: bool) -> Union[List[T], int]:
+        rows = self._bulk_rows(objs)
+        if not rows:
+            return [] if returning else 0
+
+        if conflict_cols:
+            # a single statement can't touch the same conflict target twice
+            rows = list({tuple(row[c] for c in conflict_cols): row for row in rows}.values())
+
+        table = self.model.__table__
+        returned: List[T] = []
+        affected = 0
+        try:
+            for chunk in self._chunks(rows, chunk_size):
+                statement = pg_insert(self.model).values(chunk)
+                if conflict_cols and update_cols:
+                    set_ = {col: statement.excluded[col] for col in update_cols}
+                    if "updated_at" in table.c and "updated_at" not in set_:
+                        set_["updated_at"] = DateTimeHelper.now_utc()
+                    statement = statement.on_conflict_do_update(index_elements=list(conflict_cols), set_=set_)
+                elif conflict_cols:
+                    statement = statement.on_conflict_do_nothing(index_elements=list(conflict_cols))
+
+                if returning:
+                    statement = statement.returning(self.model).execution_options(populate_existing=True)
+                    result = await self.session.execute(statement)
+                    returned.extend(result.scalars().all())
+                else:
+                    result = await self.session.execute(statement)
+                    affected += result.rowcount
+            if commit:
+                await self.session.commit()
+            return returned if returning else affected
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DataBaseException(str(e))
+
+    async def bulk_create(self,
+                          objs: Sequence[Union[T, Dict[str, Any]]],
+                          chunk_size: Optional[int] = None,
+                          returning: bool = False,
+                          commit: bool = True) -> Union[List[T], int]:
+        """
+        Insert many rows with one multi-row ``INSERT ... VALUES`` per chunk.
+
+        Returns the inserted rows as model instances when ``returning`` is set,
+        otherwise the number of rows written.
+        """
+        return await self._bulk_insert(objs, None, None, chunk_size, returning, commit)
+
+    async def bulk_upsert(self,
+                          objs: Sequence[Union[T, Dict[str, Any]]],
+                          conflict_cols: Sequence[str],
+                          update_cols: Optional[Sequence[str]] = None,
+                          chunk_size: Optional[int] = None,
+                          returning: bool = False,
+                          commit: bool = True) -> Union[List[T], int]:
+        """
+        ``INSERT ... ON CONFLICT (conflict_cols)`` in chunks. Conflicting rows
+        get ``update_cols`` overwritten from the new values, or are left alone
+        when ``update_cols`` is empty. With ``returning`` only inserted and
+        updated rows come back, skipped ones do not.
+        """
+        if not conflict_cols:
+            raise ValueError("bulk_upsert needs at least one conflict column")
+        return await self._bulk_insert(objs, conflict_cols, update_cols or None, chunk_size, returning, commit)
+
+    async def bulk_update(self,
+                          rows: Sequence[Dict[str, Any]],
+                          chunk_size: Optional[int] = None,
+                          commit: bool = True) -> int:
+        """
+        Update many rows by primary key. Every dict carries ``id`` plus the
+        columns to change; each chunk goes out as one executemany.
+        """
+        if not rows:
+            return 0
+        rows = [dict(row) for row in rows]
+        if "updated_at" in self.model.__table__.c:
+            now = DateTimeHelper.now_utc()
+            for row in rows:
+                row.setdefault("updated_at", now)
+        try:
+            for chunk in self._chunks(rows, chunk_size):
+                await self.session.execute(sa_update(self.model), chunk)
+            if commit:
+                await self.session.commit()
+            return len(rows)
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DataBaseException(str(e))
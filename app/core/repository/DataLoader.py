@@ -0,0 +1,99 @@
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# loaders of the current request, keyed by whatever the caller chooses
+# (BaseRepository uses model + session); None outside a request scope
+loader_scope_ctx: ContextVar[Optional[Dict[Hashable, "DataLoader"]]] = ContextVar("loader_scope", default=None)
+
+
+class DataLoader(Generic[T]):
+    """
+    Batches ``load`` calls made in the same event-loop tick into one call of
+    ``batch_fn`` and memoizes the results for the loader's lifetime.
+
+    ``batch_fn`` gets the distinct keys and returns a mapping of key to value;
+    keys missing from the mapping resolve to None.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], Awaitable[Dict[Any, T]]]):
+        self.batch_fn = batch_fn
+        self._cache: Dict[Any, asyncio.Future] = {}
+        self._pending: Dict[Any, asyncio.Future] = {}
+        self._scheduled = False
+
+    @staticmethod
+    def cache_key(key: Any) -> Any:
+        # UUIDs arrive both as UUID and as str depending on the caller
+        return str(key)
+
+    def load(self, key: Any) -> "asyncio.Future[Optional[T]]":
+        cache_key = self.cache_key(key)
+        future = self._cache.get(cache_key)
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._cache[cache_key] = future
+        self._pending[key] = future
+        if not self._scheduled:
+            self._scheduled = True
+            loop.call_soon(self._dispatch)
+        return future
+
+    async def load_many(self, keys: Iterable[Any]) -> List[Optional[T]]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: Any, value: T) -> None:
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        self._cache[self.cache_key(key)] = future
+
+    def clear(self, key: Any) -> None:
+        self._cache.pop(self.cache_key(key), None)
+
+    def _dispatch(self) -> None:
+        self._scheduled = False
+        pending, self._pending = self._pending, {}
+        if pending:
+            asyncio.ensure_future(self._run(pending))
+
+    async def _run(self, pending: Dict[Any, asyncio.Future]) -> None:
+        try:
+            found = await self.batch_fn(list(pending))
+        except Exception as e:
+            for key, future in pending.items():
+                # a failed batch must not stay memoized
+                self._cache.pop(self.cache_key(key), None)
+                if not future.done():
+                    future.set_exception(e)
+            return
+        found = {self.cache_key(key): value for key, value in found.items()}
+        for key, future in pending.items():
+            if not future.done():
+                future.set_result(found.get(self.cache_key(key)))
+
+
+def get_loader(key: Hashable, factory: Callable[[], DataLoader]) -> Optional[DataLoader]:
+    """The loader for ``key`` in the current scope, or None outside any scope."""
+    scope = loader_scope_ctx.get()
+    if scope is None:
+        return None
+    loader = scope.get(key)
+    if loader is None:
+        loader = scope[key] = factory()
+    return loader
+
+
+@contextmanager
+def loader_scope():
+    """Open a fresh set of loaders, e.g. for one HTTP request."""
+    token = loader_scope_ctx.set({})
+    try:
+        yield
+    finally:
+        loader_scope_ctx.reset(token)
@@ -1,16 +1,76 @@
+import asyncio
+from dataclasses import dataclass
+from functools import partial
 from typing import TypeVar, Generic, Type, List, Optional, Dict, Any, Union
 from datetime import datetime, timezone
-from pydantic import BaseModel
+import msgspec
+from pydantic import BaseModel, TypeAdapter
 from beanie import Document
+from beanie.odm.utils.dump import get_dict
+from beanie.odm.utils.encoder import Encoder
+from beanie.odm.utils.parsing import parse_obj
 from beanie.operators import In, And, Or, RegEx
 from fastapi import HTTPException, status
 from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReturnDocument, UpdateMany, UpdateOne
+from pymongo.results import BulkWriteResult
+
+from app.core.config.logger import get_logger
+from app.core.repository.MongoWriteBehind import MongoWriteBehind
+
+logger = get_logger(__name__)
 
 T = TypeVar('T', bound=Document)
+S = TypeVar('S', bound=msgspec.Struct)
+
+
+@dataclass
+class InsertOperation:
+    document: Union[Document, Dict[str, Any]]
+
+
+@dataclass
+class UpdateOperation:
+    filter: Dict[str, Any]
+    update: Dict[str, Any]
+    upsert: bool = False
+    many: bool = False
+
+
+@dataclass
+class DeleteOperation:
+    filter: Dict[str, Any]
+    many: bool = False
+
+
+BulkOperation = Union[InsertOperation, UpdateOperation, DeleteOperation]
+
 
 class MongoCRUD(Generic[T]):
-    def __init__(self, model: Type[T]):
+    def __init__(self, model: Type[T], write_behind: Optional[MongoWriteBehind] = None):
         self.model = model
+        self.write_behind = write_behind
+        self._encoder = Encoder(to_db=True)
+        self._id_adapter: Optional[TypeAdapter] = None
+
+    @property
+    def collection(self) -> AsyncIOMotorCollection:
+        return self.model.get_motor_collection()
+
+    def _id(self, id: Any) -> Any:
+        if self._id_adapter is None:
+            self._id_adapter = TypeAdapter(self.model.model_fields["id"].annotation)
+        return self._encoder.encode(self._id_adapter.validate_python(id))
+
+    def _update_document(self, data: Union[Dict[str, Any], BaseModel], partial: bool) -> Dict[str, Any]:
+        if isinstance(data, BaseModel):
+            data_dict = data.model_dump(exclude_unset=partial)
+        else:
+            data_dict = dict(data)
+        data_dict.pop("id", None)
+        data_dict.pop("_id", None)
+        data_dict["updated_at"] = datetime.now(tz=timezone.utc)
+        return self._encoder.encode(data_dict)
             
     async def create(self, data: T) -> T:
         try:    
@@ -22,17 +82,60 @@ class MongoCRUD(Generic[T]):
                 detail=f"Failed to create document: {str(e)}"
             )
     
+    async def create_deferred(self, data: T) -> asyncio.Future:
+        """
+        Queue ``data`` on the write-behind buffer and return without waiting
+        for Mongo. Await the returned future when the caller has to read the
+        document back; otherwise a failed write is logged with the document
+        id. Without a buffer this is a plain insert.
+        """
+        if self.write_behind is None:
+            await self.create(data)
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(data.id)
+            return future
+        future = await self.write_behind.submit(
+            get_dict(data, to_db=True, keep_nulls=data.get_settings().keep_nulls)
+        )
+        future.add_done_callback(partial(self._report_deferred, data.id))
+        return future
+
+    def _report_deferred(self, id: Any, future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("write_behind_document_failed", {
+                "collection": self.model.get_collection_name(),
+                "id": str(id),
+                "error": str(future.exception()),
+            })
+
     async def get_by_id(self, id: Any) -> Optional[T]:
         return await self.model.get(id)
     
-    async def find_one(self, query: Dict[str, Any]) -> Optional[T]:
-        return await self.model.find_one(query)
+    async def find_one(self,
+                    query: Dict[str, Any],
+                    projection: Optional[Dict[str, Any]] = None,
+                    raw: bool = False,
+                    as_type: Optional[Type[S]] = None) -> Optional[Union[T, Dict[str, Any], S]]:
+        """
+        ``projection``, ``raw`` or ``as_type`` skip model validation and read
+        straight from the collection: a plain dict, or an ``as_type`` struct.
+        """
+        if projection is None and not raw and as_type is None:
+            return await self.model.find_one(query)
+        doc = await self.collection.find_one(self._encoder.encode(query), projection)
+        return self._convert_raw(doc, as_type) if doc is not None else None
     
     async def find_many(self, 
                     query: Dict[str, Any] = None, 
                     skip: int = 0, 
                     limit: int = 100,
-                    sort: List[tuple] = None) -> List[T]:
+                    sort: List[tuple] = None,
+                    projection: Optional[Dict[str, Any]] = None,
+                    raw: bool = False,
+                    as_type: Optional[Type[S]] = None) -> List[Union[T, Dict[str, Any], S]]:
+        if projection is not None or raw or as_type is not None:
+            return await self._find_many_raw(query, skip, limit, sort, projection, as_type)
+
         find_query = self.model.find(query or {})
         
         if skip:
@@ -45,51 +148,86 @@ class MongoCRUD(Generic[T]):
                 find_query = find_query.sort((field, direction))
                 
         return await find_query.to_list()
+
+    async def _find_many_raw(self,
+                    query: Optional[Dict[str, Any]],
+                    skip: int,
+                    limit: int,
+                    sort: Optional[List[tuple]],
+                    projection: Optional[Dict[str, Any]],
+                    as_type: Optional[Type[S]]) -> List[Union[Dict[str, Any], S]]:
+        cursor = self.collection.find(self._encoder.encode(query or {}), projection)
+        if sort:
+            cursor = cursor.sort(list(sort))
+        if skip:
+            cursor = cursor.skip(skip)
+        if limit:
+            cursor = cursor.limit(limit)
+        docs = await cursor.to_list(length=limit or None)
+        if as_type is None:
+            return docs
+        return msgspec.convert(docs, List[as_type], strict=False)
+
+    @staticmethod
+    def _convert_raw(doc: Dict[str, Any], as_type: Optional[Type[S]]) -> Union[Dict[str, Any], S]:
+        if as_type is None:
+            return doc
+        return msgspec.convert(doc, as_type, strict=False)
     
     async def update(self, 
                 id: Any, 
                 data: Union[Dict[str, Any], BaseModel],
-                partial: bool = True) -> Optional[T]:
-        document = await self.get_by_id(id)
-        if not document:
-            return None
-            
-        if isinstance(data, BaseModel):
-            data_dict = data.dict(exclude_unset=True) if partial else data.dict()
-        else:
-            data_dict = data
-            
-        data_dict["updated_at"] = datetime.now(tz=timezone.utc)
-        
-        if partial:
-            await document.update({"$set": data_dict})
-        else:
-            for key, value in data_dict.items():
-                setattr(document, key, value)
-            await document.save()
-            
-        return await self.get_by_id(id)
+                partial: bool = True,
+                projection: Optional[Dict[str, Any]] = None,
+                upsert: bool = False) -> Optional[Union[T, Dict[str, Any]]]:
+        """
+        Apply ``$set`` and return the document as it is after the write, in one round trip.
+
+        With a projection the raw (partial) document is returned instead of a model.
+        ``partial=False`` sets every field of ``data``, including unset defaults.
+        """
+        raw = await self.collection.find_one_and_update(
+            {"_id": self._id(id)},
+            {"$set": self._update_document(data, partial)},
+            projection=projection,
+            upsert=upsert,
+            return_document=ReturnDocument.AFTER,
+        )
+        if raw is None or projection is not None:
+            return raw
+        return parse_obj(self.model, raw)
     
     async def delete(self, id: Any) -> bool:
-        document = await self.get_by_id(id)
-        if not document:
-            return False
-            
-        await document.delete()
-        return True
+        result = await self.collection.delete_one({"_id": self._id(id)})
+        return result.deleted_count > 0
     
     async def soft_delete(self, id: Any, field_name: str = "is_active") -> bool:
-        document = await self.get_by_id(id)
-        if not document:
-            return False
-            
-        await document.update({
-            "$set": {
-                field_name: False,
-                "updated_at": datetime.now(tz=timezone.utc)
-            }
-        })
-        return True
+        result = await self.collection.update_one(
+            {"_id": self._id(id)},
+            {"$set": {field_name: False, "updated_at": datetime.now(tz=timezone.utc)}},
+        )
+        return result.matched_count > 0
+    
+    async def bulk_write(self, operations: List[BulkOperation], ordered: bool = False) -> Optional[BulkWriteResult]:
+        """Send a mixed batch of inserts, updates and deletes in a single round trip."""
+        if not operations:
+            return None
+
+        requests = []
+        for op in operations:
+            if isinstance(op, InsertOperation):
+                document = op.document if isinstance(op.document, Document) else self.model(**op.document)
+                requests.append(InsertOne(get_dict(document, to_db=True, keep_nulls=document.get_settings().keep_nulls)))
+            elif isinstance(op, UpdateOperation):
+                update_cls = UpdateMany if op.many else UpdateOne
+                requests.append(update_cls(self._encoder.encode(op.filter), self._encoder.encode(op.update), upsert=op.upsert))
+            elif isinstance(op, DeleteOperation):
+                delete_cls = DeleteMany if op.many else DeleteOne
+                requests.append(delete_cls(self._encoder.encode(op.filter)))
+            else:
+                raise TypeError(f"Unsupported bulk operation: {type(op).__name__}")
+
+        return await self.collection.bulk_write(requests, ordered=ordered)
     
     async def bulk_create(self, items: List[Dict[str, Any]]) -> List[T]:
 
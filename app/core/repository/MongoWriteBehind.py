@@ -0,0 +1,235 @@
+import asyncio
+import fcntl
+import glob
+import os
+from typing import Any, Dict, List, Optional, Set, Tuple, Type
+
+import bson
+from beanie import Document
+from bson.binary import UuidRepresentation
+from bson.codec_options import CodecOptions
+from pymongo.errors import BulkWriteError, ConnectionFailure, OperationFailure, WriteConcernError
+
+from app.core.config.logger import get_logger
+
+logger = get_logger(__name__)
+
+DUPLICATE_KEY = 11000
+SPILL_CODEC_OPTIONS = CodecOptions(uuid_representation=UuidRepresentation.STANDARD)
+
+Pending = Tuple[Dict[str, Any], asyncio.Future]
+
+
+class MongoWriteBehind:
+    """
+    Write-behind buffer for single-document inserts on one collection.
+
+    Documents are queued and written with unordered ``insert_many`` once
+    ``max_batch_size`` are waiting or ``flush_interval`` seconds have passed.
+    Every submitted document gets a future that resolves once it is durable
+    in Mongo, so callers that need read-your-writes can await it. While Mongo
+    is unreachable batches stay queued; a future fails for an error on its own
+    document, a write concern error, or an error that rejects its whole batch.
+
+    Whatever cannot be written on shutdown is appended to a file of this
+    process in ``spill_dir``, which has to be on a durable volume. ``start()``
+    re-inserts every spill file of the collection that no live process is
+    writing, including those left by workers that are gone.
+    """
+
+    def __init__(
+        self,
+        model: Type[Document],
+        enabled: bool = True,
+        max_batch_size: int = 500,
+        flush_interval: float = 0.05,
+        max_retries: int = 3,
+        spill_dir: Optional[str] = None,
+    ):
+        if enabled and not spill_dir:
+            raise ValueError("write-behind needs a spill directory on a durable volume")
+        self.model = model
+        self.enabled = enabled
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.spill_dir = spill_dir
+        self._pending: List[Pending] = []
+        # _ids of queued documents an earlier insert_many may already have written
+        self._requeued: Set[Any] = set()
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def start(self) -> None:
+        if not self.enabled or self._task is not None:
+            return
+        self._closing = False
+        await self._replay_spill()
+        self._task = asyncio.create_task(self._run(), name=f"write-behind:{self.model.__name__}")
+
+    async def submit(self, document: Dict[str, Any]) -> asyncio.Future:
+        """Queue an already encoded document; the returned future resolves to its ``_id``."""
+        future = asyncio.get_running_loop().create_future()
+        if not self.enabled or self._task is None or self._closing:
+            # write-through: fail the caller like a plain insert would
+            await self._write([(document, future)])
+            future.result()
+            return future
+
+        self._pending.append((document, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._wakeup.set()
+        return future
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            while self._pending:
+                batch = self._pending[:self.max_batch_size]
+                del self._pending[:self.max_batch_size]
+                try:
+                    await self._write(batch)
+                except ConnectionFailure:
+                    # Mongo is unreachable: keep the batch for the next flush, close() spills it
+                    self._pending[:0] = batch
+                    self._requeued.update(doc.get("_id") for doc, _ in batch)
+                    raise
+                except Exception as e:
+                    # rejected as a whole (OperationFailure, an unencodable document, ...):
+                    # writing it again would fail the same way
+                    self._requeued.difference_update(doc.get("_id") for doc, _ in batch)
+                    await logger.aerror("write_behind_batch_failed", {
+                        "collection": self.model.get_collection_name(),
+                        "batch": len(batch),
+                        "error": str(e),
+                    })
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+
+    async def close(self) -> None:
+        self._closing = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except ConnectionFailure:
+            pass
+        finally:
+            if self._pending:
+                self._spill([doc for doc, _ in self._pending])
+                for _, future in self._pending:
+                    if not future.done():
+                        future.set_exception(ConnectionFailure("write-behind closed before flush, document spilled"))
+                self._pending.clear()
+                self._requeued.clear()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                await logger.aerror("write_behind_flush_failed", {
+                    "collection": self.model.get_collection_name(),
+                    "error": str(e),
+                })
+
+    async def _write(self, batch: List[Pending]) -> None:
+        documents = [doc for doc, _ in batch]
+        failed: Dict[int, Exception] = {}
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.model.get_motor_collection().insert_many(documents, ordered=False)
+                break
+            except BulkWriteError as e:
+                for error in e.details.get("writeErrors", []):
+                    # on a retry, a duplicate is the part of the batch that made it last time
+                    retried = attempt or documents[error["index"]].get("_id") in self._requeued
+                    if retried and error.get("code") == DUPLICATE_KEY:
+                        continue
+                    failed[error["index"]] = OperationFailure(error.get("errmsg"), error.get("code"))
+                concern_errors = e.details.get("writeConcernErrors")
+                if concern_errors:
+                    # written on the primary but not acknowledged as durable
+                    concern = WriteConcernError(concern_errors[0].get("errmsg"), concern_errors[0].get("code"))
+                    for index in range(len(documents)):
+                        failed.setdefault(index, concern)
+                break
+            except ConnectionFailure:
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(min(2 ** attempt * 0.1, 2))
+
+        self._requeued.difference_update(doc.get("_id") for doc in documents)
+        if failed:
+            await logger.aerror("write_behind_insert_failed", {
+                "collection": self.model.get_collection_name(),
+                "failed": len(failed),
+                "batch": len(batch),
+            })
+        for index, (doc, future) in enumerate(batch):
+            if future.done():
+                continue
+            if index in failed:
+                future.set_exception(failed[index])
+            else:
+                future.set_result(doc.get("_id"))
+
+    def _spill_file(self) -> str:
+        return os.path.join(self.spill_dir, f"{self.model.get_collection_name()}-{os.getpid()}.bson")
+
+    def _spill(self, documents: List[Dict[str, Any]]) -> None:
+        if not self.spill_dir:
+            logger.error("write_behind_documents_dropped", {"documents": len(documents)})
+            return
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = self._spill_file()
+        with open(path, "ab") as spill:
+            # held while writing, so a starting process never replays a half written file
+            fcntl.flock(spill, fcntl.LOCK_EX)
+            for doc in documents:
+                spill.write(bson.encode(doc, codec_options=SPILL_CODEC_OPTIONS))
+            spill.flush()
+            os.fsync(spill.fileno())
+        logger.warning("write_behind_spilled", {"documents": len(documents), "path": path})
+
+    async def _replay_spill(self) -> None:
+        if not self.spill_dir:
+            return
+        for path in sorted(glob.glob(os.path.join(self.spill_dir, f"{self.model.get_collection_name()}-*.bson"))):
+            with open(path, "rb") as spill:
+                try:
+                    fcntl.flock(spill, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    # another process is writing or replaying it
+                    continue
+                # UUIDs come back as Binary subtype 4, exactly as they were encoded
+                documents = bson.decode_all(spill.read())
+                if documents:
+                    try:
+                        await self.model.get_motor_collection().insert_many(documents, ordered=False)
+                    except BulkWriteError as e:
+                        # already written before the previous shutdown
+                        if any(err.get("code") != DUPLICATE_KEY for err in e.details.get("writeErrors", [])):
+                            raise
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    # replayed by another process just before us
+                    pass
+            await logger.ainfo("write_behind_spill_replayed", {"documents": len(documents), "path": path})
@@ -0,0 +1,52 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlmodel import Session, func, select
+
+from app.core.broker.models.OutboxEvent import OutboxEvent
+from app.core.repository.BaseRepository import BaseRepository
+from app.utils.DateTimeHelper import DateTimeHelper
+
+
+class OutboxRepository(BaseRepository[OutboxEvent]):
+
+    def __init__(self, session: Session):
+        super().__init__(model=OutboxEvent, session=session)
+
+    async def add_events(self, topic: str, payloads: Sequence[Dict[str, Any]], tenant: Optional[str] = None,
+                         commit: bool = False) -> int:
+        """
+        One row per payload. Not committed by default: the caller commits
+        them together with the change they describe.
+        """
+        return await self.bulk_create(
+            [{"topic": topic, "tenant": tenant, "payload": payload} for payload in payloads],
+            commit=commit,
+        )
+
+    async def backlog(self, max_attempts: int) -> List[Dict[str, Any]]:
+        """
+        Rows waiting per topic and the age in seconds of the oldest one; of
+        those, how many failed at least once and how many are parked.
+        """
+        result = await self.session.exec(
+            select(
+                OutboxEvent.topic,
+                func.count(),
+                func.min(OutboxEvent.created_at),
+                func.count().filter(OutboxEvent.attempts > 0),
+                func.count().filter(OutboxEvent.attempts >= max_attempts),
+            )
+            .group_by(OutboxEvent.topic)
+            .order_by(OutboxEvent.topic)
+        )
+        now = DateTimeHelper.now_utc()
+        return [
+            {
+                "topic": topic,
+                "rows": rows,
+                "oldest_age_seconds": round((now - DateTimeHelper.ensure_utc(oldest)).total_seconds(), 3),
+                "retrying": retrying,
+                "parked": parked,
+            }
+            for topic, rows, oldest, retrying, parked in result.all()
+        ]
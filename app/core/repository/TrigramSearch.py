@@ -0,0 +1,66 @@
+"""
+Search predicates backed by the pg_trgm GIN indexes (see the
+``trigram_search_indexes`` migration).
+
+``ILIKE '%term%'`` is served by a ``gin_trgm_ops`` index once the term has a
+full trigram; shorter terms are anchored to the start of the value, which
+still yields padded trigrams the index can use instead of scanning the table.
+Results are ranked with ``similarity()`` so the closest names come first.
+"""
+import re
+from typing import Optional, Sequence
+
+from sqlalchemy import ColumnElement, func, literal_column, or_
+
+MIN_TRIGRAM_LENGTH = 3
+MIN_PHONE_DIGITS = 3
+
+_LIKE_ESCAPE = "\\"
+_PHONE_QUERY = re.compile(r"^\+?[\d\s().-]+$")
+
+
+def escape_like(term: str) -> str:
+    """Make ``%``/``_`` in user input match literally."""
+    return (
+        term.replace(_LIKE_ESCAPE, _LIKE_ESCAPE * 2)
+        .replace("%", _LIKE_ESCAPE + "%")
+        .replace("_", _LIKE_ESCAPE + "_")
+    )
+
+
+def text_match(columns: Sequence[ColumnElement], term: str) -> ColumnElement:
+    term = term.strip()
+    escaped = escape_like(term)
+    pattern = f"%{escaped}%" if len(term) >= MIN_TRIGRAM_LENGTH else f"{escaped}%"
+    return or_(*(column.ilike(pattern, escape=_LIKE_ESCAPE) for column in columns))
+
+
+def similarity_rank(columns: Sequence[ColumnElement], term: str):
+    """ORDER BY clause: best similarity over ``columns`` first (greatest() skips NULL columns)."""
+    scores = [func.similarity(column, term.strip()) for column in columns]
+    score = scores[0] if len(scores) == 1 else func.greatest(*scores)
+    return score.desc().nulls_last()
+
+
+def phone_digits(term: str) -> Optional[str]:
+    """The digits of ``term`` when it reads as a phone number, else None."""
+    if not _PHONE_QUERY.match(term.strip()):
+        return None
+    digits = re.sub(r"\D", "", term)
+    return digits if len(digits) >= MIN_PHONE_DIGITS else None
+
+
+def digits_of(expression: ColumnElement) -> ColumnElement:
+    """
+    ``regexp_replace(expr, '\\D', '', 'g')`` with the pattern inlined: the
+    expression indexes only match when the constants are part of the SQL text,
+    not bound parameters.
+    """
+    return func.regexp_replace(
+        expression, literal_column(r"'\D'"), literal_column("''"), literal_column("'g'")
+    )
+
+
+def digits_prefix(expressions: Sequence[ColumnElement], digits: str) -> ColumnElement:
+    """Prefix match on normalized digits, served by ``text_pattern_ops`` expression indexes."""
+    return or_(*(digits_of(expression).like(f"{digits}%") for expression in expressions))
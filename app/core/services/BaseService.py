@@ -22,6 +22,9 @@ class BaseService(Generic[T]):
             raise ConflictException()
         return obj
 
+    async def get_many(self, ids: List[UUID]) -> List[T]:
+        return await self.repository.get_many(ids)
+
     async def get_all(self, should_exist: bool = True) -> List[T]:
         objs = await self.repository.get_all()
         if should_exist:
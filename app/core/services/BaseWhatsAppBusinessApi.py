@@ -1,12 +1,20 @@
+from typing import Any, Dict, Optional
+import httpx
 from app.core.config.settings import settings
+from app.core.exceptions.custom_exceptions.ClientExceptionHandler import ClientException
+from app.core.services.WhatsAppThroughputGovernor import WhatsAppThroughputGovernor
 
 
 API_VERSION = settings.WHATSAPP_API_VERSION
 
 
 class BaseWhatsAppBusinessApi:
-    def __init__(self):
+    # sends made by an agent in the inbox skip the recipient pair cooldown
+    interactive = False
+
+    def __init__(self, throughput_governor: Optional[WhatsAppThroughputGovernor] = None):
         self.base_url = f"https://graph.facebook.com/{API_VERSION}"
+        self.throughput_governor = throughput_governor
 
     def _get_headers(self, access_token, content_type=None):
         if content_type:
@@ -16,3 +24,23 @@ class BaseWhatsAppBusinessApi:
             }
 
         return {"Authorization": f"Bearer {access_token}"}
+
+    async def _post_message(
+        self,
+        phone_number_id: str,
+        recipient_number: Optional[str],
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+    ) -> httpx.Response:
+        url = f"{self.base_url}/{phone_number_id}/messages"
+        if self.throughput_governor is None:
+            return await self.client.post(url, headers=headers, json=payload)
+
+        await self.throughput_governor.acquire(phone_number_id, recipient_number, interactive=self.interactive)
+        try:
+            return await self.client.post(url, headers=headers, json=payload)
+        except ClientException as e:
+            await self.throughput_governor.report_error(
+                phone_number_id, recipient_number, e.status_code, e.details
+            )
+            raise
@@ -0,0 +1,99 @@
+import math
+from typing import Any, Dict, List
+
+from app.core.broker.BasePublisher import MAX_PRIORITY
+from app.core.storage.redis import AsyncRedisService
+from app.utils.RedisHelper import RedisHelper
+
+# Register `chunks` new chunks as pending for a tenant.
+# KEYS    : pending hash, weight hash
+# ARGV    : tenant, chunks
+# returns : {chunks pending before these, tenant weight}
+RESERVE_LUA = """
+local before = redis.call('HINCRBY', KEYS[1], ARGV[1], ARGV[2]) - tonumber(ARGV[2])
+return {before, redis.call('HGET', KEYS[2], ARGV[1]) or '1'}
+"""
+
+# Forget chunks that were reserved but never reached the broker, never below 0.
+# KEYS : pending hash
+# ARGV : tenant, chunks
+RELEASE_LUA = """
+if redis.call('HINCRBY', KEYS[1], ARGV[1], -tonumber(ARGV[2])) < 0 then
+    redis.call('HSET', KEYS[1], ARGV[1], 0)
+end
+"""
+
+
+def chunk_priorities(pending_before: int, chunks: int, weight: float = 1.0) -> List[int]:
+    """
+    Priority of each of ``chunks`` new chunks of a tenant that already has
+    ``pending_before`` chunks queued. Priority drops by one every time the
+    tenant's (weighted) backlog doubles, so the first chunks of a small
+    broadcast overtake the tail of a large one instead of queueing behind it.
+    """
+    weight = weight if weight > 0 else 1.0
+    start = max(pending_before, 0)
+    return [
+        max(0, MAX_PRIORITY - int(math.log2(1 + (start + index) / weight)))
+        for index in range(chunks)
+    ]
+
+
+class BroadcastFairScheduler:
+    """
+    Publisher half of the per-tenant broadcast scheduler: tracks how many
+    chunks each tenant (business_number_id) has queued and prioritises new
+    chunks accordingly. Workers admit chunks against the same counters, see
+    my_celery/api/tenant_scheduler.py.
+
+    A tenant's weight (default 1) is read from the weight hash, set it with
+    ``set_weight`` to give a tenant a proportionally larger share.
+    """
+
+    def __init__(self, redis_service: AsyncRedisService):
+        self.redis_service = redis_service
+        self._scripts: Dict[str, Any] = {}
+
+    async def _script(self, name: str, lua: str):
+        if name not in self._scripts:
+            redis = await self.redis_service.get_redis()
+            self._scripts[name] = redis.register_script(lua)
+        return self._scripts[name]
+
+    async def reserve(self, tenant: str, chunks: int) -> List[int]:
+        """Count ``chunks`` as pending for ``tenant`` and return their priorities."""
+        reserve = await self._script("reserve", RESERVE_LUA)
+        before, weight = await reserve(
+            keys=[RedisHelper.redis_broadcast_tenant_pending_key(), RedisHelper.redis_broadcast_tenant_weight_key()],
+            args=[tenant, chunks],
+        )
+        return chunk_priorities(int(before), chunks, float(weight))
+
+    async def release(self, tenant: str, chunks: int) -> None:
+        release = await self._script("release", RELEASE_LUA)
+        await release(keys=[RedisHelper.redis_broadcast_tenant_pending_key()], args=[tenant, chunks])
+
+    async def set_weight(self, tenant: str, weight: float) -> None:
+        redis = await self.redis_service.get_redis()
+        await redis.hset(RedisHelper.redis_broadcast_tenant_weight_key(), tenant, weight)
+
+    async def queue_depths(self) -> Dict[str, Dict[str, float]]:
+        """Queued and running chunks, and the weight, of every tenant with broadcast work."""
+        redis = await self.redis_service.get_redis()
+        pending = await redis.hgetall(RedisHelper.redis_broadcast_tenant_pending_key())
+        weights = await redis.hgetall(RedisHelper.redis_broadcast_tenant_weight_key())
+        pending = {self._decode(tenant): int(count) for tenant, count in pending.items()}
+        weights = {self._decode(tenant): float(weight) for tenant, weight in weights.items()}
+        async with redis.pipeline(transaction=False) as pipe:
+            for tenant in pending:
+                pipe.zcard(RedisHelper.redis_broadcast_tenant_running_key(tenant))
+            running = await pipe.execute()
+        return {
+            tenant: {"pending": max(count, 0), "running": running_count, "weight": weights.get(tenant, 1.0)}
+            for (tenant, count), running_count in zip(pending.items(), running)
+            if count > 0 or running_count
+        }
+
+    @staticmethod
+    def _decode(value: Any) -> str:
+        return value.decode() if isinstance(value, bytes) else str(value)
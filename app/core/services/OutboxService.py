@@ -0,0 +1,31 @@
+from typing import Any, Dict, Optional, Sequence
+
+from app.core.broker.OutboxRelay import OutboxRelay
+from app.core.repository.OutboxRepository import OutboxRepository
+
+
+class OutboxService:
+    """
+    Queues broker messages in the outbox instead of publishing them inline.
+    Rows become visible to the relay only when the surrounding transaction
+    commits, so a message goes out if and only if its change was saved.
+    """
+
+    def __init__(self, repository: OutboxRepository, relay: OutboxRelay):
+        self.repository = repository
+        self.relay = relay
+
+    async def enqueue(self, topic: str, payloads: Sequence[Dict[str, Any]], tenant: Optional[str] = None,
+                      commit: bool = False) -> int:
+        """
+        Add ``payloads`` for the publisher of ``topic``. With ``commit`` the
+        session is committed and the relay woken; otherwise call
+        ``notify()`` once the caller's transaction has committed.
+        """
+        count = await self.repository.add_events(topic, payloads, tenant=tenant, commit=commit)
+        if commit:
+            self.notify()
+        return count
+
+    def notify(self) -> None:
+        self.relay.notify()
@@ -0,0 +1,165 @@
+import asyncio
+from typing import Any, Dict, Optional
+
+from app.core.config.logger import get_logger
+from app.core.exceptions.custom_exceptions.TooManyRequestsException import TooManyRequestsException
+from app.core.storage.redis import AsyncRedisService
+from app.utils.RedisHelper import RedisHelper
+
+logger = get_logger(__name__)
+
+# messages per second Meta allows a single business phone number per tier
+THROUGHPUT_TIERS: Dict[str, int] = {
+    "standard": 80,
+    "high": 1000,
+}
+
+# Graph error codes that mean "slow down" rather than "this message is bad"
+THROUGHPUT_ERROR_CODES = {4, 80007, 130429}
+PAIR_RATE_ERROR_CODE = 131056
+
+# GCRA reservation on the number bucket. Meta lets a (number, recipient) pair
+# burst, so the pair key only holds a cooldown deadline set after a 131056
+# error; when ARGV[3] is 1 the caller also waits for that deadline. A slot is
+# only reserved when the caller would not have to wait longer than max_wait,
+# so a rejected caller leaves the bucket untouched.
+# KEYS    : number tat, pair cooldown, penalty factor
+# ARGV    : number interval ms, max wait ms, check pair (1/0)
+# returns : {reserved, delay_ms}
+RESERVE_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local factor = tonumber(redis.call('GET', KEYS[3]) or '1')
+local number_interval = tonumber(ARGV[1]) / factor
+local max_wait = tonumber(ARGV[2])
+
+local number_tat = math.max(tonumber(redis.call('GET', KEYS[1]) or '0'), now)
+local ready = number_tat
+if ARGV[3] == '1' then
+    ready = math.max(ready, tonumber(redis.call('GET', KEYS[2]) or '0'))
+end
+local delay = ready - now
+
+if delay > max_wait then
+    return {0, math.floor(delay)}
+end
+
+local next_number = number_tat + number_interval
+redis.call('SET', KEYS[1], tostring(next_number), 'PX', math.ceil(next_number - now) + 1000)
+return {1, math.floor(delay)}
+"""
+
+# Multiplicative decrease of the number rate, restored when the key expires.
+# KEYS : penalty factor
+# ARGV : min factor, cooldown ms
+PENALIZE_LUA = """
+local factor = tonumber(redis.call('GET', KEYS[1]) or '1') * 0.5
+factor = math.max(factor, tonumber(ARGV[1]))
+redis.call('SET', KEYS[1], tostring(factor), 'PX', ARGV[2])
+return tostring(factor)
+"""
+
+# Set the pair cooldown so the next paced message to this recipient waits it out.
+# KEYS : pair cooldown
+# ARGV : cooldown ms
+PAIR_COOLDOWN_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local until_ms = now + tonumber(ARGV[1])
+redis.call('SET', KEYS[1], tostring(until_ms), 'PX', ARGV[1])
+return until_ms
+"""
+
+
+class WhatsAppThroughputGovernor:
+    """
+    Paces Graph sends per business number (GCRA at the tier rate times
+    headroom). Messages to one recipient are not spaced out up front, Meta
+    allows a pair to burst; only after a 131056 does that pair wait
+    ``pair_rate_seconds``, and interactive sends (agents replying in the
+    inbox) skip even that wait.
+    """
+
+    def __init__(
+        self,
+        redis_service: AsyncRedisService,
+        tier: str = "standard",
+        headroom: float = 0.9,
+        pair_rate_seconds: float = 6,
+        max_wait_seconds: float = 6,
+        penalty_seconds: int = 60,
+        min_penalty_factor: float = 0.125,
+    ):
+        mps = THROUGHPUT_TIERS.get(tier, THROUGHPUT_TIERS["standard"]) * headroom
+        self.redis_service = redis_service
+        self.number_interval_ms = 1000 / mps
+        self.pair_interval_ms = pair_rate_seconds * 1000
+        # a pair cooldown is waited out, not turned into a 429
+        self.max_wait_ms = max(max_wait_seconds, pair_rate_seconds) * 1000
+        self.penalty_ms = penalty_seconds * 1000
+        self.min_penalty_factor = min_penalty_factor
+        self._scripts: Dict[str, Any] = {}
+
+    async def _script(self, name: str, lua: str):
+        if name not in self._scripts:
+            redis = await self.redis_service.get_redis()
+            self._scripts[name] = redis.register_script(lua)
+        return self._scripts[name]
+
+    async def acquire(self, phone_number_id: str, recipient: Optional[str], interactive: bool = False) -> None:
+        """
+        Wait for a send slot on this business number, and for the recipient's
+        pair cooldown unless ``interactive``.
+
+        :raises TooManyRequestsException: when the wait would exceed max_wait_seconds.
+        """
+        reserve = await self._script("reserve", RESERVE_LUA)
+        reserved, delay_ms = await reserve(
+            keys=[
+                RedisHelper.redis_whatsapp_throughput_key(phone_number_id),
+                RedisHelper.redis_whatsapp_pair_key(phone_number_id, recipient or "*"),
+                RedisHelper.redis_whatsapp_penalty_key(phone_number_id),
+            ],
+            args=[self.number_interval_ms, self.max_wait_ms, 0 if interactive or not recipient else 1],
+        )
+        if not reserved:
+            retry_after = max(1, -(-int(delay_ms) // 1000))
+            raise TooManyRequestsException(
+                message="WhatsApp sending rate exceeded for this number",
+                details={"phone_number_id": phone_number_id, "retry_after": retry_after},
+            )
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+    async def report_error(self, phone_number_id: str, recipient: Optional[str],
+                           status_code: Optional[int], error_body: Any) -> None:
+        error_code = self.extract_error_code(error_body)
+        if error_code == PAIR_RATE_ERROR_CODE and recipient:
+            cooldown = await self._script("pair_cooldown", PAIR_COOLDOWN_LUA)
+            await cooldown(
+                keys=[RedisHelper.redis_whatsapp_pair_key(phone_number_id, recipient)],
+                args=[int(self.pair_interval_ms)],
+            )
+            await logger.awarning("whatsapp_pair_rate_hit", {"phone_number_id": phone_number_id})
+        elif status_code == 429 or error_code in THROUGHPUT_ERROR_CODES:
+            penalize = await self._script("penalize", PENALIZE_LUA)
+            factor = await penalize(
+                keys=[RedisHelper.redis_whatsapp_penalty_key(phone_number_id)],
+                args=[self.min_penalty_factor, self.penalty_ms],
+            )
+            await logger.awarning("whatsapp_throughput_backoff", {
+                "phone_number_id": phone_number_id,
+                "factor": factor,
+                "error_code": error_code,
+            })
+
+    @staticmethod
+    def extract_error_code(error_body: Any) -> Optional[int]:
+        if not isinstance(error_body, dict):
+            return None
+        error = error_body.get("error", error_body)
+        code = error.get("code") if isinstance(error, dict) else None
+        try:
+            return int(code) if code is not None else None
+        except (TypeError, ValueError):
+            return None
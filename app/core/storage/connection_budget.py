@@ -0,0 +1,108 @@
+import time
+from typing import Any, Dict, Optional, Tuple
+from uuid import uuid4
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.core.storage.query_stats import query_stats_ctx
+
+
+def pool_budget(max_connections: int, processes: int, reserved: int = 0) -> Tuple[int, int]:
+    """
+    ``(pool_size, max_overflow)`` for one of ``processes`` identical pools so
+    that all of them together never open more than ``max_connections -
+    reserved`` connections. A third of each share is overflow.
+    """
+    per_process = max((max_connections - reserved) // max(processes, 1), 1)
+    max_overflow = per_process // 3
+    return per_process - max_overflow, max_overflow
+
+
+def asyncpg_connect_args(pgbouncer: bool = False, statement_cache_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    connect_args for the asyncpg dialect. Behind PgBouncer in transaction
+    mode consecutive transactions can land on different server connections,
+    so prepared statements get unique names and the cache is off unless
+    ``statement_cache_size`` is set (PgBouncer >= 1.21 with
+    max_prepared_statements tracks named statements itself).
+    """
+    if not pgbouncer:
+        return {} if statement_cache_size is None else {"prepared_statement_cache_size": statement_cache_size}
+    return {
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        "prepared_statement_cache_size": statement_cache_size or 0,
+        # asyncpg's own cache, used outside SQLAlchemy's prepare path
+        "statement_cache_size": 0,
+    }
+
+
+class PoolMetrics:
+    """Checkout counters of one pool, kept across pool recreation."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+
+    def record(self, wait_ms: float) -> None:
+        self.checkouts += 1
+        self.wait_ms_total += wait_ms
+        self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+
+    def status(self, pool: Pool) -> Dict[str, Any]:
+        status = {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_ms_avg": round(self.wait_ms_total / self.checkouts, 2) if self.checkouts else 0.0,
+            "wait_ms_max": round(self.wait_ms_max, 2),
+        }
+        if isinstance(pool, QueuePool):
+            status.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+            })
+        return status
+
+
+class _MeteredPool:
+    """Times every checkout, including the wait for a free connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        wait_ms = (time.perf_counter() - started) * 1000
+        self.metrics.record(wait_ms)
+        stats = query_stats_ctx.get()
+        if stats is not None:
+            stats.record_checkout(wait_ms)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class MeteredQueuePool(_MeteredPool, QueuePool):
+    pass
+
+
+class MeteredAsyncPool(_MeteredPool, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_status(pool: Pool) -> Dict[str, Any]:
+    metrics = getattr(pool, "metrics", None)
+    return metrics.status(pool) if metrics is not None else {}
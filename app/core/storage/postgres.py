@@ -1,31 +1,317 @@
-from typing import AsyncGenerator
-from sqlmodel import SQLModel
+import asyncio
+import itertools
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, List, Optional, Sequence, Union
+from sqlmodel import SQLModel, Session
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import Select, event, inspect, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
 
+from app.core.config.logger import get_logger
 from app.core.exceptions.custom_exceptions.DataBaseException import DataBaseException
+from app.core.storage.connection_budget import MeteredAsyncPool, asyncpg_connect_args, pool_budget, pool_status
+from app.core.storage.query_stats import DEFAULT_SLOW_QUERY_MS, instrument_engine
+
+logger = get_logger(__name__)
+
+# session.info key holding the ReplicaRouter of RoutingSession
+REPLICA_ROUTER = "replica_router"
+
+# 0 when the standby has replayed everything it received, so an idle primary
+# doesn't read as lag; also 0 when the URL points at a primary (dev setups)
+REPLICA_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+def _engine(
+    db_url: str,
+    pool_size: int,
+    max_overflow: int,
+    slow_query_ms: float,
+    pool_timeout: float = 30,
+    connect_args: Optional[Dict[str, Any]] = None,
+) -> AsyncEngine:
+    engine = create_async_engine(
+        db_url,
+        echo=False,
+        poolclass=MeteredAsyncPool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+        connect_args=connect_args or {},
+    )
+    instrument_engine(engine, slow_query_ms)
+    return engine
+
+
+class Replica:
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+        self.lag: Optional[float] = None
+        self.healthy = False
+
+
+class ReplicaRouter:
+    """
+    Picks a replica for read-only work. Replication lag is re-checked at most
+    every ``check_interval`` seconds, by whichever request finds it stale; a
+    replica that lags more than ``max_lag`` or fails the check is skipped
+    until the next check, and reads fall back to the primary.
+    """
+
+    def __init__(self, engines: Sequence[AsyncEngine], max_lag: float, check_interval: float) -> None:
+        self.replicas = [Replica(engine) for engine in engines]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+        self._turn = itertools.count()
+
+    def pick(self) -> Optional[AsyncEngine]:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._turn) % len(healthy)].engine
+
+    async def refresh(self) -> None:
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return
+        async with self._lock:
+            if time.monotonic() - self._checked_at < self.check_interval:
+                return
+            await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+            self._checked_at = time.monotonic()
+
+    async def _check(self, replica: Replica) -> None:
+        was_healthy = replica.healthy
+        try:
+            replica.lag = await asyncio.wait_for(self._lag(replica.engine), timeout=max(self.max_lag, 1.0))
+            replica.healthy = replica.lag <= self.max_lag
+        except Exception as e:
+            replica.lag, replica.healthy = None, False
+            logger.warning("replica_lag_check_failed", {"replica": replica.engine.url.host, "error": str(e)})
+        if was_healthy and not replica.healthy:
+            logger.warning("replica_out_of_rotation", {"replica": replica.engine.url.host, "lag": replica.lag})
+
+    @staticmethod
+    async def _lag(engine: AsyncEngine) -> float:
+        async with engine.connect() as conn:
+            return float(await conn.scalar(REPLICA_LAG_QUERY))
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+class _Routing:
+    """Replica routing state of one request or task."""
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.wrote = False
+        self.picked = False
+        self.replica: Optional[AsyncEngine] = None
+        # reads stay on the primary until then, so a committed write is
+        # visible to the rest of the request even on a lagging replica
+        self.primary_until = 0.0
+
+    def end_transaction(self) -> None:
+        self.wrote = self.picked = False
+        self.replica = None
+
+
+# The container's session is shared by every request in the process, so
+# routing state is kept per request/task here rather than in session.info.
+_routing: ContextVar[Optional[_Routing]] = ContextVar("postgres_routing", default=None)
+
+
+def _routing_state() -> _Routing:
+    state = _routing.get()
+    if state is None:
+        state = _Routing()
+        _routing.set(state)
+    return state
+
+
+class RoutingSession(Session):
+    """
+    Sends SELECTs issued inside ``replica_reads`` to a replica. Everything
+    else stays on the primary: flushes, DML, raw SQL, SELECT ... FOR UPDATE,
+    and any read once the request has written, so a request always reads
+    its own writes. After a commit that wrote, reads stay on the primary
+    for the router's ``max_lag``.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        router = self.info.get(REPLICA_ROUTER)
+        if router is None:
+            return super().get_bind(mapper, clause=clause, **kw)
+        state = _routing_state()
+        if self._flushing or (clause is not None and not isinstance(clause, Select)):
+            state.wrote = True
+        elif (
+            state.depth
+            and not state.wrote
+            and clause is not None
+            and clause._for_update_arg is None
+            and time.monotonic() >= state.primary_until
+        ):
+            # one replica per transaction, so its reads share a snapshot
+            if not state.picked:
+                state.replica, state.picked = router.pick(), True
+            if state.replica is not None:
+                return state.replica.sync_engine
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _after_commit(session: RoutingSession) -> None:
+    state = _routing.get()
+    router = session.info.get(REPLICA_ROUTER)
+    if state is not None and state.wrote and router is not None:
+        state.primary_until = time.monotonic() + router.max_lag
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _after_transaction_end(session: RoutingSession, transaction) -> None:
+    # commit, rollback or close of the outermost transaction
+    state = _routing.get()
+    if state is not None and transaction.parent is None:
+        state.end_transaction()
+
+
+@asynccontextmanager
+async def replica_reads(session: AsyncSession) -> AsyncIterator[None]:
+    router = session.info.get(REPLICA_ROUTER)
+    if not isinstance(router, ReplicaRouter):
+        yield
+        return
+    await router.refresh()
+    state = _routing_state()
+    state.depth += 1
+    try:
+        yield
+    finally:
+        state.depth -= 1
 
 
 class PostgresDatabase:
-    def __init__(self, db_url: str) -> None:
-        self._engine = create_async_engine(
-            db_url,
-            echo=False,
-            pool_size=20,
-            max_overflow=10,
-            pool_timeout=30,
-            pool_recycle=1800,
-            pool_pre_ping=True,
-        )
+    def __init__(
+        self,
+        db_url: str,
+        replica_urls: Union[str, Sequence[str], None] = None,
+        pool_size: int = 20,
+        max_overflow: int = 10,
+        replica_pool_size: int = 10,
+        replica_max_overflow: int = 5,
+        max_replica_lag: float = 2.0,
+        replica_lag_check_interval: float = 5.0,
+        slow_query_ms: float = DEFAULT_SLOW_QUERY_MS,
+        connection_budget: int = 0,
+        workers: int = 1,
+        pool_timeout: float = 30,
+        pgbouncer: bool = False,
+        statement_cache_size: Optional[int] = None,
+    ) -> None:
+        """
+        With a ``connection_budget`` the primary pool is sized so that
+        ``workers`` API processes together stay within it, replacing
+        ``pool_size``/``max_overflow``. ``pgbouncer`` switches asyncpg to
+        statement handling that is safe in PgBouncer transaction mode.
+        """
+        if connection_budget:
+            pool_size, max_overflow = pool_budget(connection_budget, workers)
+        connect_args = asyncpg_connect_args(pgbouncer, statement_cache_size)
+        self._engine = _engine(db_url, pool_size, max_overflow, slow_query_ms, pool_timeout, connect_args)
+
+        if isinstance(replica_urls, str):
+            replica_urls = [url.strip() for url in replica_urls.split(",")]
+        replica_urls = [url for url in replica_urls or [] if url]
+        self._replica_router: Optional[ReplicaRouter] = None
+        info = {}
+        if replica_urls:
+            self._replica_router = ReplicaRouter(
+                [_engine(url, replica_pool_size, replica_max_overflow, slow_query_ms, pool_timeout, connect_args) for url in replica_urls],
+                max_lag=max_replica_lag,
+                check_interval=replica_lag_check_interval,
+            )
+            info[REPLICA_ROUTER] = self._replica_router
+
         self._session_factory = sessionmaker(
-            bind=self._engine, expire_on_commit=False, class_=AsyncSession
+            bind=self._engine, expire_on_commit=False, class_=AsyncSession,
+            sync_session_class=RoutingSession, info=info,
         )
 
+    @property
+    def replica_engines(self) -> List[AsyncEngine]:
+        if self._replica_router is None:
+            return []
+        return [replica.engine for replica in self._replica_router.replicas]
+
+    def pool_status(self) -> Dict[str, Any]:
+        """Checkout counts and wait times of the primary and replica pools."""
+        return {
+            "primary": pool_status(self._engine.pool),
+            "replicas": [pool_status(engine.pool) for engine in self.replica_engines],
+        }
+
+    def session(self) -> AsyncSession:
+        """A new session on the primary, for work outside a request scope."""
+        return self._session_factory()
+
     async def init_db(self) -> None:
         async with self._engine.begin() as conn:
             await conn.run_sync(SQLModel.metadata.create_all)
 
+    async def create_schema_if_unversioned(self) -> bool:
+        """
+        create_all on a database Alembic has never run on (no alembic_version
+        table): the first revision only alters existing tables, so there is
+        nothing to upgrade from otherwise. Every revision also applies on top
+        of a create_all schema. Returns whether tables were created; see
+        migrate.sh.
+        """
+        async with self._engine.begin() as conn:
+            versioned = await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table("alembic_version"))
+            if not versioned:
+                await conn.run_sync(SQLModel.metadata.create_all)
+        return not versioned
+
+    async def check_migrations(self, alembic_config: str = "alembic.ini") -> str:
+        """
+        Make sure the database is at the Alembic head instead of creating
+        tables: a read of alembic_version, no DDL and no schema locks.
+        Returns the head revision.
+        """
+        heads = set(ScriptDirectory.from_config(Config(alembic_config)).get_heads())
+        async with self._engine.connect() as conn:
+            current = set(await conn.run_sync(
+                lambda sync_conn: MigrationContext.configure(sync_conn).get_current_heads()
+            ))
+        if current != heads:
+            raise RuntimeError(
+                f"database is at revision {sorted(current) or 'none'}, expected {sorted(heads)}; "
+                "run migrate.sh (`alembic upgrade head`) before starting the app"
+            )
+        return ", ".join(sorted(heads))
+
+    async def dispose(self) -> None:
+        await self._engine.dispose()
+        if self._replica_router is not None:
+            await self._replica_router.dispose()
+
     async def get_db(self) -> AsyncGenerator[AsyncSession, None]:
         async with self._session_factory() as session:
             try:
@@ -1,7 +1,7 @@
 from datetime import datetime
 import json
 import msgpack
-from typing import Any, Dict, List, Optional, Set, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 import redis
 import redis.asyncio as aioredis
 from uuid import UUID as NativeUUID
@@ -315,6 +315,24 @@ class AsyncRedisService:
     async def pipeline(self) -> aioredis.client.Pipeline:
         return self._client.pipeline()
 
+    async def get_many_with_hashes(self, keys: List[str], hash_keys: List[str]) -> Tuple[List[Any], List[Dict[str, Any]]]:
+        """GET every key and HGETALL every hash key in one round trip, decoded like get / hgetall."""
+        pipe = self._client.pipeline(transaction=False)
+        for key in keys:
+            pipe.get(self._key(key))
+        for key in hash_keys:
+            pipe.hgetall(self._key(key))
+        raw = await pipe.execute()
+
+        values = [self._deserialize(v) for v in raw[:len(keys)]]
+        hashes = []
+        for item in raw[len(keys):]:
+            hashes.append({
+                (k.decode() if isinstance(k, (bytes, bytearray)) else k): self._deserialize(v)
+                for k, v in item.items()
+            })
+        return values, hashes
+
     
     async def flush_db(self) -> bool:
         return await self._client.flushdb()
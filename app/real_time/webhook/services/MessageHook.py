@@ -4,6 +4,7 @@ from typing import Any, Dict, List, Optional
 
 from app.annotations.services.ContactService import ContactService
 from app.core.broker.WhatsappMessagePublisher import WhatsappMessagePublisher
+from app.core.services.OutboxService import OutboxService
 from app.core.config.logger import get_logger
 from app.core.repository.MongoRepository import MongoCRUD
 from app.core.storage.redis import AsyncRedisService
@@ -41,7 +42,7 @@ class MessageHook:
         assignment_service: AssignmentService,
         team_service: TeamService,
         business_profile_service: BusinessProfileService,
-        message_publisher: WhatsappMessagePublisher,
+        outbox_service: OutboxService,
         media_api: WhatsAppMediaApi,
         redis_service: AsyncRedisService,
         socket_message: SocketMessageGateway,
@@ -58,7 +59,7 @@ class MessageHook:
         self.assignment_service = assignment_service
         self.team_service = team_service
         self.business_profile_service = business_profile_service
-        self.message_publisher = message_publisher
+        self.outbox_service = outbox_service
         self.media_api = media_api
         self.redis_service = redis_service
         self.socket_message = socket_message
@@ -190,14 +191,16 @@ class MessageHook:
         try:
             context_message_id = msg.get("context", {}).get("id")
             
-            original_message = await self.mongo_message.find_one({"wa_message_id": context_message_id})
+            original_message = await self.mongo_message.find_one(
+                {"wa_message_id": context_message_id}, projection={"content": 1}
+            )
             
             logger.debug(f"Original message: {original_message}")
 
             if original_message:
-                logger.debug(f"Original message found for context ID: {original_message.wa_message_id}")
+                logger.debug(f"Original message found for context ID: {context_message_id}")
                 
-                data["context"] = original_message.content
+                data["context"] = original_message.get("content")
 
                 logger.debug(f"Context set for reply to message: {context_message_id}")
             else:
@@ -275,22 +278,32 @@ class MessageHook:
         meta = payload.get("metadata", {})
         details = []
 
+        # committed before the webhook is acknowledged, the relay publishes them
+        await self.outbox_service.enqueue(
+            WhatsappMessagePublisher.exchange_name,
+            [
+                WhatsappMessagePublisher.status_payload({
+                    "metadata": {
+                        "display_phone_number": meta.get("display_phone_number"),
+                        "phone_number_id": meta.get("phone_number_id"),
+                    },
+                    "wa_message_id": st.get("id"),
+                    "recipient_id": st.get("recipient_id"),
+                    "status": st.get("status"),
+                    "timestamp": st.get("timestamp"),
+                })
+                for st in statuses
+            ],
+            commit=True,
+        )
+        logger.info(f"queued {len(statuses)} statuses")
+
         for st in statuses:
-            entry = {
-                "metadata": {
-                    "display_phone_number": meta.get("display_phone_number"),
-                    "phone_number_id": meta.get("phone_number_id"),
-                },
-                "wa_message_id": st.get("id"),
-                "recipient_id": st.get("recipient_id"),
-                "status": st.get("status"),
-                "timestamp": st.get("timestamp"),
-            }
-            logger.info(f"publishing status: {entry}")
-            await self.message_publisher.send_message(entry)
-            message_document = await self.mongo_message.find_one({"wa_message_id": st.get("id")})
-            logger.info(f"message_status_document: {message_document.conversation_id} , message_id: {message_document.id} and status: {st.get('status')}")
-            await self.socket_message.emit_message_status(conversation_id=message_document.conversation_id, status=st.get("status"), message_id=message_document.id)
+            message_document = await self.mongo_message.find_one(
+                {"wa_message_id": st.get("id")}, projection={"conversation_id": 1}
+            )
+            logger.info(f"message_status_document: {message_document['conversation_id']} , message_id: {message_document['_id']} and status: {st.get('status')}")
+            await self.socket_message.emit_message_status(conversation_id=message_document["conversation_id"], status=st.get("status"), message_id=message_document["_id"])
 
     def _extract_contact_info(self, contacts: List[Dict[str, Any]]) -> Dict[str, Any]:
         if not contacts:
@@ -1,9 +1,11 @@
 from typing import Dict, List, Optional, Union
-from sqlalchemy import func, or_
+from sqlalchemy import func
 from app.core.exceptions.GlobalException import GlobalException
 from app.core.exceptions.custom_exceptions.DataBaseException import DataBaseException
 from app.user_management.user.models.User import User
+from app.core.decorators.read_only_decorator import read_only
 from app.core.repository.BaseRepository import BaseRepository
+from app.core.repository.TrigramSearch import similarity_rank, text_match
 from sqlmodel import Session, select
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -11,6 +13,9 @@ class UserRepository(BaseRepository[User]):
     def __init__(self, session: Session):
         super().__init__(model=User, session=session)
 
+    def _search_columns(self):
+        return [self.model.email, self.model.first_name, self.model.last_name]
+
     async def get_by_email(self, email: str) -> Optional[User]:
         try:
             statement = select(self.model).where(self.model.email == email)
@@ -19,38 +24,22 @@ class UserRepository(BaseRepository[User]):
         except SQLAlchemyError as e:
             await self.session.rollback()
             raise DataBaseException(str(e))
+    @read_only
     async def get_users_by_client_id(
         self, client_id: str, query: str, page: int, limit: int
     ) -> Dict[str, Union[List[User], int]]:
         try:
-            base_query = select(self.model).where(self.model.client_id == client_id).order_by(
-                self.model.created_at.desc()
-            )
-            if query:
-                base_query = base_query.where(
-                    or_(
-                        self.model.email.ilike(f"%{query}%"),
-                        self.model.first_name.ilike(f"%{query}%"),
-                        self.model.last_name.ilike(f"%{query}%") 
-                    )
-                )
-            
-            if query:
-                total_count = await self.session.exec(
-                    select(func.count(self.model.id)).where(
-                        self.model.client_id == client_id,
-                        or_(
-                            self.model.email.ilike(f"%{query}%"),
-                            self.model.first_name.ilike(f"%{query}%"),
-                            self.model.last_name.ilike(f"%{query}%") 
-                        )
-                    )
+            base_query = select(self.model).where(self.model.client_id == client_id)
+            count_query = select(func.count(self.model.id)).where(self.model.client_id == client_id)
+            if query and query.strip():
+                search_filter = text_match(self._search_columns(), query)
+                base_query = base_query.where(search_filter).order_by(
+                    similarity_rank(self._search_columns(), query)
                 )
-            else:    
-                total_count = await self.session.exec(
-                    select(func.count(self.model.id)).where(self.model.client_id == client_id)
-                )
-            
+                count_query = count_query.where(search_filter)
+            base_query = base_query.order_by(self.model.created_at.desc())
+
+            total_count = await self.session.exec(count_query)
             users = await self.session.exec(
                 base_query.offset((page - 1) * limit).limit(limit)
             )
@@ -69,31 +58,23 @@ class UserRepository(BaseRepository[User]):
         except SQLAlchemyError as e:
             await self.session.rollback()
             raise DataBaseException(str(e))
+    @read_only
     async def search_user(
         self, query_str: str, client_id: str, page: int, limit: int
     ) -> Dict[str, Union[List[User], int]]:
         try:
+            search_filter = text_match(self._search_columns(), query_str)
             count_query = select(func.count(self.model.id)).where(
                 self.model.client_id == client_id,
-                or_(
-                    self.model.email.contains(query_str),
-                    self.model.first_name.contains(query_str),
-                    self.model.last_name.contains(query_str),
-                ),
+                search_filter,
             )
             count_result = await self.session.exec(count_query)
             total_count = count_result.first()
 
             query = (
                 select(self.model)
-                .where(
-                    self.model.client_id == client_id,
-                    or_(
-                        self.model.email.contains(query_str),
-                        self.model.first_name.contains(query_str),
-                        self.model.last_name.contains(query_str),
-                    ),
-                )
+                .where(self.model.client_id == client_id, search_filter)
+                .order_by(similarity_rank(self._search_columns(), query_str), self.model.created_at.desc())
                 .offset((page - 1) * limit)
                 .limit(limit)
             )
@@ -20,6 +20,10 @@ class RedisHelper:
     def redis_user_info_key(user_id: str) -> str:
         return f"auth:user:info:{{{user_id}}}"
     
+    @staticmethod
+    def redis_rate_limit_key(scope: str, identity: str, route_group: str) -> str:
+        return f"ratelimit:{scope}:{{{identity}}}:{route_group}"
+    
     ############################################## conversation and team inbox
     @staticmethod
     def redis_team_online_key(team_id: str) -> str:
@@ -51,6 +55,32 @@ class RedisHelper:
     def redis_broadcast_list_of_numbers_key(broadcast_id: str) -> str:
         return f"broadcast:{{{broadcast_id}}}:contact_list"
     
+    @staticmethod
+    def redis_broadcast_tenant_pending_key() -> str:
+        return "broadcast:{tenants}:pending"
+    
+    @staticmethod
+    def redis_broadcast_tenant_weight_key() -> str:
+        return "broadcast:{tenants}:weight"
+    
+    @staticmethod
+    def redis_broadcast_tenant_running_key(tenant: str) -> str:
+        return f"broadcast:{{tenants}}:running:{tenant}"
+    
+    ############################################## whatsapp throughput
+    
+    @staticmethod
+    def redis_whatsapp_throughput_key(phone_number_id: str) -> str:
+        return f"whatsapp:throughput:{{{phone_number_id}}}:tat"
+    
+    @staticmethod
+    def redis_whatsapp_pair_key(phone_number_id: str, recipient_number: str) -> str:
+        return f"whatsapp:throughput:{{{phone_number_id}}}:pair:{recipient_number}"
+    
+    @staticmethod
+    def redis_whatsapp_penalty_key(phone_number_id: str) -> str:
+        return f"whatsapp:throughput:{{{phone_number_id}}}:penalty"
+    
     ############################################## socket
     
     @staticmethod
@@ -12,4 +12,5 @@ class ErrorCode(str, Enum):
     BUSINESS_LOGIC_ERROR = "BUSINESS_LOGIC_ERROR"
     CONFLICT_ERROR = "CONFLICT_ERROR"
     TOKEN_EXPIRED = "TOKEN_EXPIRED"
-    TOKEN_NOT_FOUND = "TOKEN_NOT_FOUND"
\ No newline at end of file
+    TOKEN_NOT_FOUND = "TOKEN_NOT_FOUND"
+    TOO_MANY_REQUESTS = "TOO_MANY_REQUESTS"
\ No newline at end of file
@@ -1,5 +1,6 @@
 from typing import List
 from sqlmodel import Session, select
+from app.core.decorators.read_only_decorator import read_only
 from app.core.repository.BaseRepository import BaseRepository
 from app.utils.enums.BroadcastStatus import BroadcastStatus
 from app.whatsapp.broadcast.models.BroadCast import BroadCast
@@ -10,6 +11,7 @@ class BroadcastRepository(BaseRepository[BroadCast]):
     
     def __init__(self, session: Session):
         super().__init__(model=BroadCast, session=session)
+    @read_only
     async def get_by_business_profile_id(self, business_profile_id: str) -> List[BroadCast]:
         stmt = select(BroadCast).where(
             BroadCast.business_id == business_profile_id,
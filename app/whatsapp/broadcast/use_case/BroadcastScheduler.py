@@ -1,18 +1,26 @@
 from datetime import datetime, timezone
+from typing import AsyncIterator, List
 from uuid import UUID
+from redis.exceptions import ResponseError
+from sqlalchemy.orm.attributes import set_committed_value
 from app.annotations.services.ContactService import ContactService
 from app.core.broker.MessageBroadcastPublisher import MessageBroadcastPublisher
 from app.core.config.logger import get_logger
+from app.core.config.settings import settings
 from app.core.exceptions.custom_exceptions.BadRequestException import BadRequestException
 from app.core.repository.MongoRepository import MongoCRUD
+from app.core.repository.OutboxRepository import OutboxRepository
+from app.core.services.OutboxService import OutboxService
+from app.core.storage.postgres import PostgresDatabase
 from app.core.storage.redis import AsyncRedisService
 from app.user_management.user.models.Client import Client
 from app.user_management.user.models.User import User
 from app.user_management.user.services.UserService import UserService
 from app.utils.RedisHelper import RedisHelper
 from app.whatsapp.broadcast.models.BroadCast import BroadCast, BroadcastStatus
-from app.whatsapp.broadcast.models.schema.BroadCastTemplate import BroadCastTemplate
+from app.whatsapp.broadcast.models.schema.BroadCastTemplate import TemplateObject
 from app.whatsapp.broadcast.models.schema.SchedualBroadCastRequest import SchedualBroadCastRequest
+from app.whatsapp.broadcast.repositories.BroadCastRepository import BroadcastRepository
 from app.whatsapp.broadcast.services.BroadCastService import BroadcastService
 from app.whatsapp.business_profile.v1.models.BusinessProfile import BusinessProfile
 from app.whatsapp.business_profile.v1.services.BusinessProfileService import BusinessProfileService
@@ -20,6 +28,10 @@ from app.whatsapp.template.models.Template import Template
 from app.whatsapp.template.utils.TemplateBuilder import TemplateBuilder
 
 logger = get_logger(__name__)
+
+# numbers per RPUSH when storing an audience
+AUDIENCE_WRITE_BATCH = 10000
+
 class BroadcastScheduler:
     def __init__(self, 
                 broadcast_service:BroadcastService,
@@ -27,16 +39,18 @@ class BroadcastScheduler:
                 contact_service: ContactService,
                 bussiness_service: BusinessProfileService,
                 redis:AsyncRedisService,
-                message_publisher: MessageBroadcastPublisher,
-                mongo_crud_template: MongoCRUD[Template]
+                mongo_crud_template: MongoCRUD[Template],
+                outbox_service: OutboxService,
+                db: PostgresDatabase,
                 ):
         self.broadcast_service = broadcast_service
         self.user_service = user_service
         self.contact_service = contact_service
         self.bussiness_service = bussiness_service
         self.redis_service = redis
-        self.message_publisher = message_publisher
         self.mongo_crud_template = mongo_crud_template
+        self.outbox_service = outbox_service
+        self.db = db
     
     def _ensure_naive_datetime(self, dt: datetime) -> datetime:
         if dt.tzinfo is not None:
@@ -75,8 +89,7 @@ class BroadcastScheduler:
         created_broadcast = await self.broadcast_service.create(broadcast)
 
         if body_request.is_now:
-            contact_numbers_key = RedisHelper.redis_broadcast_list_of_numbers_key(broadcast.id)
-            await self.redis_service.set(contact_numbers_key, body_request.list_of_numbers, ttl=3600)
+            await self._store_audience(broadcast.id, body_request.list_of_numbers, ttl=3600)
             
             await self._execute_broadcast(created_broadcast, body_request.parameters)          
 
@@ -86,11 +99,35 @@ class BroadcastScheduler:
                 scheduled_time=body_request.scheduled_time,  
                 parameters=body_request.parameters
             )
-            contact_numbers_key = RedisHelper.redis_broadcast_list_of_numbers_key(broadcast.id)
-            await self.redis_service.set(contact_numbers_key, body_request.list_of_numbers, ttl=delay+120)
+            await self._store_audience(broadcast.id, body_request.list_of_numbers, ttl=delay+120)
         
         return created_broadcast
 
+    async def _store_audience(self, broadcast_id: UUID, numbers: List[str], ttl: int) -> None:
+        """Keep the audience as a Redis list so it can be read back a chunk at a time."""
+        key = RedisHelper.redis_broadcast_list_of_numbers_key(broadcast_id)
+        await self.redis_service.delete(key)
+        for start in range(0, len(numbers), AUDIENCE_WRITE_BATCH):
+            await self.redis_service.rpush(key, *numbers[start:start + AUDIENCE_WRITE_BATCH])
+        await self.redis_service.expire(key, ttl)
+
+    async def _audience_chunks(self, broadcast_id: UUID, size: int) -> AsyncIterator[List[str]]:
+        key = RedisHelper.redis_broadcast_list_of_numbers_key(broadcast_id)
+        start = 0
+        while True:
+            try:
+                chunk = await self.redis_service.lrange(key, start, start + size - 1)
+            except ResponseError:
+                # audience stored as one value before it became a list
+                numbers = await self.redis_service.get(key) or []
+                for offset in range(start, len(numbers), size):
+                    yield [str(number) for number in numbers[offset:offset + size]]
+                return
+            if not chunk:
+                return
+            yield [str(number) for number in chunk]
+            start += size
+
     async def _schedule_redis_expiry(self, broadcast_id: str, scheduled_time: datetime, parameters: list[str] = None) -> None:
         try:
             if scheduled_time.tzinfo is None:
@@ -140,43 +177,26 @@ class BroadcastScheduler:
             
             logger.info(f"template_object: {template_object}")
             
-            contact_numbers_key = RedisHelper.redis_broadcast_list_of_numbers_key(broadcast.id)
-            
-            contact_numbers = await self.redis_service.get(contact_numbers_key)
-            
-            logger.info(f"Broadcast contacts:")
-            
-            broadcast_payload = BroadCastTemplate(
-                template_body=template_object,
-                list_of_numbers=contact_numbers
-            )
-            
             logger.info(f"Broadcasting template start")
             
-            result = await self.message_publisher.publish_many(
-                payloads=broadcast_payload,
-                user_id=str(broadcast.user_id),
-                business_number=business_profile.phone_number,
-                bussiness_token=business_profile.access_token,
-                business_number_id=business_profile.phone_number_id
-            )
-
-            logger.info(f"Broadcast {broadcast.id} is completed")
-            
-            if result.get("status") == "success":
-                await self.broadcast_service.update(
-                    broadcast.id,
-                    {"status": BroadcastStatus.SENT}
+            # the outbox rows and the SENT status commit together, in a session
+            # of their own: the shared one is committed and rolled back by
+            # other requests while the audience streams, and a failure here
+            # must not leave half of the chunks behind
+            async with self.db.session() as session, session.begin():
+                chunks = await self._enqueue_chunks(
+                    OutboxRepository(session), broadcast, business_profile,
+                    TemplateObject.model_validate(template_object),
                 )
-                
-                
-            else:
-                await self.broadcast_service.update(
+                await BroadcastRepository(session).update(
                     broadcast.id,
-                    {
-                        "status": BroadcastStatus.FAILED,
-                    }
+                    {"status": BroadcastStatus.SENT},
+                    commit=False,
                 )
+            set_committed_value(broadcast, "status", BroadcastStatus.SENT)
+            self.outbox_service.notify()
+
+            logger.info(f"Broadcast {broadcast.id} is completed: {chunks} chunks queued")
                 
         except Exception as e:
             await self.broadcast_service.update(
@@ -189,6 +209,36 @@ class BroadcastScheduler:
             raise e
                 
 
+    async def _enqueue_chunks(self, outbox: OutboxRepository, broadcast: BroadCast,
+                              business_profile: BusinessProfile, template_body: TemplateObject) -> int:
+        """
+        One outbox row per audience chunk, left uncommitted in ``outbox``'s
+        session. Rows are written ``BROADCAST_MAX_IN_FLIGHT`` chunks per
+        insert so the audience never sits in memory whole.
+        """
+        content = MessageBroadcastPublisher.template_content(template_body)
+        pending, chunks = [], 0
+        async for recipients in self._audience_chunks(broadcast.id, settings.BROADCAST_CHUNK_SIZE):
+            if not recipients:
+                continue
+            pending.append(MessageBroadcastPublisher.chunk_payload(
+                content=content,
+                recipients=recipients,
+                user_id=str(broadcast.user_id),
+                business_number=business_profile.phone_number,
+                bussiness_token=business_profile.access_token,
+                business_number_id=business_profile.phone_number_id,
+            ))
+            if len(pending) >= settings.BROADCAST_MAX_IN_FLIGHT:
+                chunks += await self._enqueue(outbox, pending, business_profile.phone_number_id)
+                pending = []
+        return chunks + await self._enqueue(outbox, pending, business_profile.phone_number_id)
+
+    async def _enqueue(self, outbox: OutboxRepository, payloads: List[dict], tenant: str) -> int:
+        if not payloads:
+            return 0
+        return await outbox.add_events(MessageBroadcastPublisher.exchange_name, payloads, tenant=tenant)
+
     async def _handle_scheduled_broadcast(self, broadcast_id: str) -> None:
         try:
             broadcast = await self.broadcast_service.get(UUID(broadcast_id))
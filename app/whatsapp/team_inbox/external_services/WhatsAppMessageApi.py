@@ -1,14 +1,17 @@
 from typing import Optional, Literal
 import httpx
 from app.core.services.BaseWhatsAppBusinessApi import BaseWhatsAppBusinessApi
+from app.core.services.WhatsAppThroughputGovernor import WhatsAppThroughputGovernor
 from app.core.decorators.log_decorator import log_class_methods
 from app.whatsapp.template.models.schema.SendTemplateRequest import SendTemplateRequest
 
 @log_class_methods("WhatsAppMessageApi")
 class WhatsAppMessageApi(BaseWhatsAppBusinessApi):
-    def __init__(self, client: httpx.AsyncClient):
+    interactive = True
+
+    def __init__(self, client: httpx.AsyncClient, throughput_governor: Optional[WhatsAppThroughputGovernor] = None):
         self.client = client
-        super().__init__()
+        super().__init__(throughput_governor)
 
     async def send_text_message(
         self,
@@ -30,7 +33,6 @@ class WhatsAppMessageApi(BaseWhatsAppBusinessApi):
         :param context_message_id: Message ID to reply to (optional).
         :return: HTTP response from the API.
         """
-        url = f"{self.base_url}/{phone_number_id}/messages"
         headers = self._get_headers(access_token, content_type="application/json")
         
         payload = {
@@ -47,11 +49,7 @@ class WhatsAppMessageApi(BaseWhatsAppBusinessApi):
         if context_message_id:
             payload["context"] = {"message_id": context_message_id}
 
-        response = await self.client.post(
-            url,
-            headers=headers,
-            json=payload
-        )
+        response = await self._post_message(phone_number_id, recipient_number, headers, payload)
         response.raise_for_status()
         return response.json()
     
@@ -86,7 +84,6 @@ class WhatsAppMessageApi(BaseWhatsAppBusinessApi):
         if filename and media_type != 'document':
             raise ValueError("Filename only allowed for documents")
 
-        url = f"{self.base_url}/{phone_number_id}/messages"
         headers = self._get_headers(access_token, "application/json")
 
         media_obj = {}
@@ -112,7 +109,7 @@ class WhatsAppMessageApi(BaseWhatsAppBusinessApi):
         if context_message_id:
             payload["context"] = {"message_id": context_message_id}
 
-        response = await self.client.post(url, headers=headers, json=payload)
+        response = await self._post_message(phone_number_id, recipient_number, headers, payload)
         response.raise_for_status()
         return response.json()
     
@@ -121,7 +118,6 @@ class WhatsAppMessageApi(BaseWhatsAppBusinessApi):
                                         recipient_number: str,
                                         message_id: str,
                                         emoji: str):
-        url = f"{self.base_url}/{phone_number_id}/messages"
         headers = self._get_headers(access_token, "application/json")
 
         payload = {
@@ -135,7 +131,7 @@ class WhatsAppMessageApi(BaseWhatsAppBusinessApi):
             }
         }
 
-        response = await self.client.post(url, headers=headers, json=payload)
+        response = await self._post_message(phone_number_id, recipient_number, headers, payload)
         response.raise_for_status()
         return response.json()
     
@@ -149,7 +145,6 @@ class WhatsAppMessageApi(BaseWhatsAppBusinessApi):
         message_id: Optional[str] = None,
         name: Optional[str] = None,
         address: Optional[str] = None):
-        url = f"{self.base_url}/{phone_number_id}/messages"
         headers = self._get_headers(access_token, "application/json")
 
         payload = {
@@ -168,7 +163,7 @@ class WhatsAppMessageApi(BaseWhatsAppBusinessApi):
         if message_id:
             payload["context"] = {"message_id": message_id}
 
-        response = await self.client.post(url, headers=headers, json=payload)
+        response = await self._post_message(phone_number_id, recipient_number, headers, payload)
         response.raise_for_status()
         return response.json()
     
@@ -200,7 +195,6 @@ class WhatsAppMessageApi(BaseWhatsAppBusinessApi):
         for btn in buttons:
             if 'id' not in btn or 'title' not in btn:
                 raise ValueError("Each button must contain 'id' and 'title' keys")
-        url = f"{self.base_url}/{phone_number_id}/messages"
         headers = self._get_headers(access_token, "application/json")
 
         action_buttons = [
@@ -233,19 +227,18 @@ class WhatsAppMessageApi(BaseWhatsAppBusinessApi):
         if context_message_id:
             payload["context"] = {"message_id": context_message_id}
 
-        response = await self.client.post(url, headers=headers, json=payload)
+        response = await self._post_message(phone_number_id, recipient_number, headers, payload)
         response.raise_for_status()
         return response.json()
     
     async def send_template_message(self,accessToken: str , phone_number_id:str,payload: SendTemplateRequest,context_message_id: Optional[str] = None) -> httpx.Response:
-        url = f"{self.base_url}/{phone_number_id}/messages"
         headers = self._get_headers(accessToken, content_type = "application/json")
         body = payload.model_dump(exclude_none=True)
         
         if context_message_id:
             body["context"] = {"message_id": context_message_id}
 
-        response = await self.client.post(url, headers=headers, json=body)
+        response = await self._post_message(phone_number_id, payload.to, headers, body)
         response.raise_for_status()
         return response.json()
     
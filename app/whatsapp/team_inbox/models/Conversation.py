@@ -1,14 +1,25 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 from uuid import UUID
 
-from sqlmodel import Field, Relationship
+from sqlalchemy import DateTime, func
+from sqlmodel import Field, Index, Relationship
 from app.core.schemas.BaseEntity import BaseEntity
+from app.utils.DateTimeHelper import DateTimeHelper
 from app.user_management.user.models.Team import Team
 from app.whatsapp.team_inbox.utils.conversation_status import ConversationStatus
 
+LAST_MESSAGE_PREVIEW_LENGTH = 255
+
 
 class Conversation(BaseEntity, table=True):
     __tablename__ = "conversations"
+    __table_args__ = (
+        # inbox listing: newest activity first, keyset on (last_message_at, id)
+        Index("ix_conversations_client_last_message", "client_id", "last_message_at", "id"),
+        # one conversation per contact; arbiter for broadcast_messaging_batch
+        Index("ux_conversations_contact", "contact_id", unique=True),
+    )
 
     status: ConversationStatus = Field(default=ConversationStatus.PENDING,nullable=True)
     
@@ -19,6 +30,16 @@ class Conversation(BaseEntity, table=True):
     assignment_id: UUID = Field(foreign_key="assignments.id")
     
     client_id: UUID = Field(foreign_key="clients.id", index=True, ondelete="CASCADE")
+
+    # denormalized from messages, kept current by MessageRepository.create and broadcast_messaging
+    last_message_at: datetime = Field(
+        sa_type=DateTime(timezone=True),
+        default_factory=DateTimeHelper.now_utc,
+        sa_column_kwargs={"server_default": func.now()},
+        nullable=False,
+    )
+    last_message_preview: Optional[str] = Field(default=None, max_length=LAST_MESSAGE_PREVIEW_LENGTH, nullable=True)
+    last_inbound_at: Optional[datetime] = Field(sa_type=DateTime(timezone=True), default=None, nullable=True)
     
     conversation_link: List["ConversationTeamLink"] = Relationship(
         back_populates="conversation",
@@ -1,12 +1,13 @@
 from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
-from pydantic import Field
+from pydantic import Field, model_validator
 from app.core.schemas.BaseModelNoNone import BaseModelNoNone
 from beanie import Document, Indexed, Insert, Replace, before_event
-from pymongo import ASCENDING, DESCENDING
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
 
 from app.utils.DateTimeHelper import DateTimeHelper
+from app.whatsapp.team_inbox.utils.message_search import build_search_text
 
 
 class Message(Document, BaseModelNoNone):
@@ -20,6 +21,7 @@ class Message(Document, BaseModelNoNone):
     context: Optional[dict] = None
     is_from_contact: Optional[bool] = None
     member_id: Optional[UUID] = None
+    search_text: Optional[str] = None
 
     created_at: datetime = Field(
         default_factory= DateTimeHelper.now_utc
@@ -28,6 +30,12 @@ class Message(Document, BaseModelNoNone):
         default_factory= DateTimeHelper.now_utc
     )
     
+    @model_validator(mode="after")
+    def set_search_text(self):
+        if self.search_text is None:
+            self.search_text = build_search_text(self.content)
+        return self
+
     @before_event([Insert, Replace])
     def set_updated(self):
         self.updated_at = DateTimeHelper.now_utc()    
@@ -41,6 +49,19 @@ class Message(Document, BaseModelNoNone):
                 ("_id", DESCENDING),
             ],
             "wa_message_id",
+            # drives the archive_messages task's oldest-first sweep
+            [("created_at", ASCENDING)],
+            # text queries must pin conversation_id, so every search stays
+            # inside one conversation's slice of the index
+            IndexModel(
+                [
+                    ("conversation_id", ASCENDING),
+                    ("search_text", TEXT),
+                    ("created_at", DESCENDING),
+                ],
+                name="conversation_search_text",
+                default_language="none",
+            ),
         ]
 
     class Config:
@@ -1,21 +1,53 @@
+from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
+from sqlalchemy import DateTime, event
 from sqlmodel import Field, Index
 from app.core.schemas.BaseEntity import BaseEntity
+from app.utils.DateTimeHelper import DateTimeHelper
+from app.whatsapp.team_inbox.utils.message_partitions import (
+    DEFAULT_MONTHS_AHEAD,
+    create_partition_sql,
+    upcoming_months,
+)
 
 
 class MessageMeta(BaseEntity, table=True):
+    """
+    Range-partitioned by month on created_at (see utils/message_partitions.py).
+    The table's primary key is (id, created_at) because a partitioned table's
+    keys must include the partition column; the mapper still identifies rows
+    by id alone. Filter on created_at wherever possible so the planner can
+    skip partitions.
+    """
     __tablename__ = "messages"
     __table_args__ = (
         Index("idx_conv_created", "conversation_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    __mapper_args__ = {"primary_key": ["id"]}
+
+    created_at: datetime = Field(
+        sa_type=DateTime(timezone=True),
+        default_factory=DateTimeHelper.now_utc,
+        primary_key=True,
+        index=True,
+        nullable=False,
     )
     message_type: str = Field(nullable=False)
     message_status: str = Field(default=None,nullable=True)
-    whatsapp_message_id: str = Field(nullable=True)
+    whatsapp_message_id: str = Field(nullable=True, index=True)
     is_from_contact: bool = Field(nullable=False,default=False)
     member_id: UUID = Field(foreign_key="users.id", nullable=True, index=True)
     contact_id: UUID = Field(foreign_key="contacts.id", nullable=True)
     
     conversation_id: UUID = Field(foreign_key="conversations.id", index=True)
-    
\ No newline at end of file
+
+
+@event.listens_for(MessageMeta.__table__, "after_create")
+def _create_upcoming_partitions(target, connection, **kw) -> None:
+    # a partitioned table without partitions rejects every insert
+    if connection.dialect.name == "postgresql":
+        for month in upcoming_months(DateTimeHelper.now_utc(), DEFAULT_MONTHS_AHEAD):
+            connection.exec_driver_sql(create_partition_sql(month))
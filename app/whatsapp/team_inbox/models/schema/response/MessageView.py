@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+import msgspec
+
+
+class MessageView(msgspec.Struct, omit_defaults=True):
+    id: UUID = msgspec.field(name="_id")
+    message_type: str = ""
+    conversation_id: Optional[UUID] = None
+    message_status: Optional[str] = None
+    wa_message_id: Optional[str] = None
+    content: Optional[dict] = None
+    context: Optional[dict] = None
+    is_from_contact: Optional[bool] = None
+    member_id: Optional[UUID] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
@@ -0,0 +1,87 @@
+import asyncio
+from typing import Any, Dict, List
+
+from sqlmodel import select
+
+from app.core.config.logger import get_logger
+from app.core.config.settings import settings
+from app.core.repository.MongoRepository import MongoCRUD
+from app.core.storage.MongoDB import MongoDB
+from app.core.storage.postgres import PostgresDatabase
+from app.utils.Helper import Helper
+from app.whatsapp.team_inbox.models.Conversation import Conversation, LAST_MESSAGE_PREVIEW_LENGTH
+from app.whatsapp.team_inbox.models.Message import Message
+from app.whatsapp.team_inbox.repositories.ConversationRepository import ConversationRepository
+
+logger = get_logger(__name__)
+
+
+def preview_from_document(doc: Dict[str, Any]) -> str:
+    content = dict(doc.get("content") or {})
+    # outbound text is stored as text_body, inbound as text
+    content.setdefault("text", content.get("text_body", ""))
+    message_type = doc.get("message_type", "unknown")
+    preview = Helper._get_last_message_content({"type": message_type, "content": content})
+    return (preview or message_type)[:LAST_MESSAGE_PREVIEW_LENGTH]
+
+
+class BackfillConversationPreview:
+    """
+    Fill ``conversations.last_message_preview`` for rows that predate the
+    column, from each conversation's newest message in MongoDB.
+    """
+
+    def __init__(self,
+                 conversation_repo: ConversationRepository,
+                 message_repo: MongoCRUD[Message],
+                 batch_size: int = 500):
+        self.conversation_repo = conversation_repo
+        self.message_repo = message_repo
+        self.batch_size = batch_size
+
+    async def run(self) -> int:
+        updated = 0
+        last_id = None
+        while True:
+            query = select(Conversation.id).where(Conversation.last_message_preview.is_(None))
+            if last_id is not None:
+                query = query.where(Conversation.id > last_id)
+            ids = (await self.conversation_repo.session.exec(
+                query.order_by(Conversation.id).limit(self.batch_size)
+            )).all()
+            if not ids:
+                return updated
+
+            latest = await self.message_repo.collection.aggregate([
+                {"$match": {"conversation_id": {"$in": list(ids)}}},
+                {"$sort": {"conversation_id": 1, "created_at": -1}},
+                {"$group": {
+                    "_id": "$conversation_id",
+                    "message_type": {"$first": "$message_type"},
+                    "content": {"$first": "$content"},
+                }},
+            ]).to_list(length=None)
+
+            rows: List[Dict[str, Any]] = [
+                {"id": doc["_id"], "last_message_preview": preview_from_document(doc)}
+                for doc in latest
+            ]
+            await self.conversation_repo.bulk_update(rows)
+            updated += len(rows)
+            last_id = ids[-1]
+            await logger.ainfo("conversation_preview_backfill_progress", {"updated": updated})
+
+
+async def main() -> None:
+    mongo = MongoDB(settings.MONGO_URI, settings.MONGO_DB)
+    await mongo.init_db([Message])
+    psql = PostgresDatabase(settings.POSTGRES_DATABASE_URL)
+    try:
+        async with psql._session_factory() as session:
+            await BackfillConversationPreview(ConversationRepository(session), MongoCRUD(Message)).run()
+    finally:
+        mongo.client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
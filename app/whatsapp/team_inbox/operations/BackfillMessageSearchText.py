@@ -0,0 +1,60 @@
+import asyncio
+from typing import List
+
+from app.core.config.logger import get_logger
+from app.core.config.settings import settings
+from app.core.repository.MongoRepository import MongoCRUD, UpdateOperation
+from app.core.storage.MongoDB import MongoDB
+from app.whatsapp.team_inbox.models.Message import Message
+from app.whatsapp.team_inbox.utils.message_search import build_search_text
+
+logger = get_logger(__name__)
+
+
+class BackfillMessageSearchText:
+    """Populate ``search_text`` on messages written before it existed."""
+
+    def __init__(self, message_repo: MongoCRUD[Message], batch_size: int = 1000):
+        self.message_repo = message_repo
+        self.batch_size = batch_size
+
+    async def run(self) -> int:
+        updated = 0
+        last_id = None
+        while True:
+            query = {"search_text": {"$exists": False}}
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+            batch = await self.message_repo.find_many(
+                query=query,
+                limit=self.batch_size,
+                sort=[("_id", 1)],
+                projection={"content": 1},
+            )
+            if not batch:
+                return updated
+
+            operations: List[UpdateOperation] = [
+                UpdateOperation(
+                    filter={"_id": doc["_id"]},
+                    update={"$set": {"search_text": build_search_text(doc.get("content"))}},
+                )
+                for doc in batch
+            ]
+            await self.message_repo.bulk_write(operations)
+            updated += len(operations)
+            last_id = batch[-1]["_id"]
+            await logger.ainfo("search_text_backfill_progress", {"updated": updated})
+
+
+async def main() -> None:
+    mongo = MongoDB(settings.MONGO_URI, settings.MONGO_DB)
+    await mongo.init_db([Message])
+    try:
+        await BackfillMessageSearchText(MongoCRUD(Message)).run()
+    finally:
+        mongo.client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+import asyncio
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+from pymongo.errors import BulkWriteError
+
+from app.core.config.logger import get_logger
+from app.core.config.settings import settings
+from app.core.storage.MongoDB import MongoDB
+from app.whatsapp.team_inbox.models.Message import Message
+from app.whatsapp.team_inbox.repositories.MessageBucketRepository import MessageBucketRepository
+
+logger = get_logger(__name__)
+
+DUPLICATE_KEY = 11000
+
+
+class MigrateMessagesToBuckets:
+    """
+    Copy the per-message ``messages`` collection into bucket storage.
+
+    Messages are read in (conversation_id, created_at, _id) index order and
+    grouped per conversation and day into buckets of at most ``bucket_size``.
+    A day is only chunked once all of its messages have been read, so bucket
+    membership and ids (derived from each bucket's first message) depend on
+    the source alone, never on batch boundaries or on what an earlier run
+    already wrote. A re-run rebuilds the same buckets, skips those whose
+    messages all have lookup entries and fills in missing lookups, so the
+    tool can be stopped and re-run. The source collection is left untouched;
+    drop it once the bucket mode has been verified.
+    """
+
+    def __init__(self, buckets: MessageBucketRepository, batch_size: int = 5000):
+        self.buckets = buckets
+        self.batch_size = batch_size
+
+    async def run(self) -> int:
+        await self.buckets.ensure_indexes()
+        source = Message.get_motor_collection()
+        migrated = 0
+        last = None
+        # the newest day read so far, it may continue in the next batch
+        carry: List[Dict[str, Any]] = []
+        while True:
+            query: Dict[str, Any] = {}
+            if last is not None:
+                conversation_id, created_at, _id = last
+                query = {"$or": [
+                    {"conversation_id": {"$gt": conversation_id}},
+                    {"conversation_id": conversation_id, "created_at": {"$lt": created_at}},
+                    {"conversation_id": conversation_id, "created_at": created_at, "_id": {"$lt": _id}},
+                ]}
+            batch = await (
+                source.find(query)
+                .sort([("conversation_id", 1), ("created_at", -1), ("_id", -1)])
+                .limit(self.batch_size)
+                .to_list(length=None)
+            )
+            if not batch:
+                return migrated + await self._write(carry)
+            last = (batch[-1]["conversation_id"], batch[-1]["created_at"], batch[-1]["_id"])
+
+            messages = carry + batch
+            split = len(messages)
+            while split and _day_key(messages[split - 1]) == _day_key(messages[-1]):
+                split -= 1
+            carry = messages[split:]
+            migrated += await self._write(messages[:split])
+            await logger.ainfo("bucket_migration_progress", {"migrated": migrated})
+
+    async def _write(self, messages: List[Dict[str, Any]]) -> int:
+        """Bucket whole days of ``messages``; returns how many messages got a lookup entry."""
+        groups: Dict[Tuple[Any, str], List[Dict[str, Any]]] = defaultdict(list)
+        for doc in reversed(messages):
+            groups[_day_key(doc)].append(doc)
+
+        existing = {
+            entry["_id"] async for entry in self.buckets.lookup.find(
+                {"_id": {"$in": [doc["_id"] for doc in messages]}}, {"_id": 1}
+            )
+        } if messages else set()
+
+        buckets, lookups = [], []
+        for (conversation_id, day), docs in groups.items():
+            for start in range(0, len(docs), self.buckets.bucket_size):
+                chunk = docs[start:start + self.buckets.bucket_size]
+                missing = [doc for doc in chunk if doc["_id"] not in existing]
+                if not missing:
+                    continue
+                bucket_id = f"migrated:{chunk[0]['_id']}"
+                # a bucket written by an interrupted run is a duplicate here, only its lookups are added
+                buckets.append({
+                    "_id": bucket_id,
+                    "conversation_id": conversation_id,
+                    "day": day,
+                    # closed for appends, new messages open a fresh bucket
+                    "count": self.buckets.bucket_size,
+                    "start_at": chunk[0]["created_at"],
+                    "end_at": chunk[-1]["created_at"],
+                    "messages": chunk,
+                })
+                lookups.extend(
+                    {
+                        "_id": doc["_id"],
+                        "wa_message_id": doc.get("wa_message_id") or None,
+                        "bucket_id": bucket_id,
+                        "conversation_id": conversation_id,
+                    }
+                    for doc in missing
+                )
+        if not buckets:
+            return 0
+
+        # buckets first: a lookup never points at a bucket that isn't there
+        for collection, documents in ((self.buckets.buckets, buckets), (self.buckets.lookup, lookups)):
+            try:
+                await collection.insert_many(documents, ordered=False)
+            except BulkWriteError as e:
+                if any(err.get("code") != DUPLICATE_KEY for err in e.details.get("writeErrors", [])):
+                    raise
+        return len(lookups)
+
+
+def _day_key(doc: Dict[str, Any]) -> Tuple[Any, str]:
+    return doc["conversation_id"], doc["created_at"].strftime("%Y-%m-%d")
+
+
+async def main() -> None:
+    mongo = MongoDB(settings.MONGO_URI, settings.MONGO_DB)
+    await mongo.init_db([Message])
+    try:
+        buckets = MessageBucketRepository(bucket_size=settings.MESSAGE_BUCKET_SIZE)
+        await MigrateMessagesToBuckets(buckets).run()
+    finally:
+        mongo.client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
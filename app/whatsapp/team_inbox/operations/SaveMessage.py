@@ -41,7 +41,7 @@ class SaveMessage:
                 context=message_data.get("context", {}),
                 is_from_contact=meta.is_from_contact
             )
-            await self.message_repo.create(doc)
+            await self.message_repo.create_deferred(doc)
             
             last_message_content = Helper._get_last_message_content(message_data=message_data)
             
@@ -65,5 +65,6 @@ class SaveMessage:
                 is_from_contact=not message_data.get("metadata", {}).get("is_sent_by_business", False),
                 message_text=text,
                 contact_id=contact_id
-            )
+            ),
+            preview=Helper._get_last_message_content(message_data=message_data),
         )
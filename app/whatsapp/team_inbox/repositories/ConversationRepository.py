@@ -1,21 +1,21 @@
+from datetime import datetime
 from typing import Optional
 from uuid import UUID
-from sqlalchemy import desc, func
+from sqlalchemy import tuple_
 from sqlmodel import Session , select
 from app.annotations.models.Contact import Contact
 from app.core.config import logger
 from app.core.exceptions.custom_exceptions.DataBaseException import DataBaseException
+from app.core.decorators.read_only_decorator import read_only
 from app.core.repository.BaseRepository import BaseRepository
 from app.user_management.user.models.Team import Team
 from app.user_management.user.models.UserTeam import UserTeam
 from app.whatsapp.business_profile.v1.models.BusinessProfile import BusinessProfile
 from app.whatsapp.team_inbox.models.Conversation import Conversation
 from app.whatsapp.team_inbox.models.ConversationTeamLink import ConversationTeamLink
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import noload, selectinload
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.whatsapp.team_inbox.models.MessageMeta import MessageMeta
-
 class ConversationRepository(BaseRepository[Conversation]):
     def __init__(self, session: Session):
         super().__init__(model=Conversation, session=session)
@@ -56,59 +56,45 @@ class ConversationRepository(BaseRepository[Conversation]):
             await self.session.rollback()
             raise  DataBaseException(e)
     
-    async def get_user_conversations(self, user_id: UUID, page: int = 1, limit: int = 10) -> dict:
-        offset = (page - 1) * limit
-    
+    @read_only
+    async def get_user_conversations(self,
+                                     user_id: UUID,
+                                     limit: int = 10,
+                                     client_id: Optional[UUID] = None,
+                                     before_last_message_at: Optional[datetime] = None,
+                                     before_id: Optional[UUID] = None) -> dict:
+        """
+        Newest-activity-first page of the conversations visible to the user's
+        teams, keyset-paginated on (last_message_at, id). Passing ``client_id``
+        lets Postgres walk ix_conversations_client_last_message and stop after
+        ``limit`` rows instead of sorting every visible conversation.
+        """
         try:
-            subquery_latest_msg = (
-                select(
-                    MessageMeta.conversation_id,
-                    func.max(MessageMeta.created_at).label("latest_msg_time")
-                )
-                .group_by(MessageMeta.conversation_id)
-                .subquery()
+            user_conversations = (
+                select(ConversationTeamLink.conversation_id)
+                .join(UserTeam, UserTeam.team_id == ConversationTeamLink.team_id)
+                .where(UserTeam.user_id == user_id)
             )
-    
             query = (
                 select(Conversation)
-                .join(ConversationTeamLink, Conversation.id == ConversationTeamLink.conversation_id)
-                .join(UserTeam, UserTeam.team_id == ConversationTeamLink.team_id)
-                .outerjoin(subquery_latest_msg, Conversation.id == subquery_latest_msg.c.conversation_id)
-                .where(UserTeam.user_id == user_id)
-                .options(selectinload(Conversation.conversation_link))
+                .where(Conversation.id.in_(user_conversations))
+                # the inbox list shows the assignee but not the teams
+                .options(noload(Conversation.conversation_link))
                 .options(selectinload(Conversation.assignment))
-                .order_by(desc(subquery_latest_msg.c.latest_msg_time))  
-                .offset(offset)
-                .limit(limit)
+                .order_by(Conversation.last_message_at.desc(), Conversation.id.desc())
+                .limit(limit + 1)
             )
-    
+            if client_id:
+                query = query.where(Conversation.client_id == client_id)
+            if before_last_message_at and before_id:
+                query = query.where(
+                    tuple_(Conversation.last_message_at, Conversation.id) < tuple_(before_last_message_at, before_id)
+                )
+
             result = await self.session.exec(query)
             conversations = result.all()
-    
-            count_query = (
-                select(func.count(func.distinct(Conversation.id)))
-                .join(ConversationTeamLink, Conversation.id == ConversationTeamLink.conversation_id)
-                .join(UserTeam, UserTeam.team_id == ConversationTeamLink.team_id)
-                .where(UserTeam.user_id == user_id)
-            )
-    
-            total_items = (await self.session.exec(count_query)).one()
-            total_pages = (total_items + limit - 1) // limit
-    
-            return {
-                "data": conversations,
-                "meta": {
-                    "total_items": total_items,
-                    "total_pages": total_pages,
-                    "current_page": page,
-                    "page_size": limit,
-                    "has_next": page < total_pages,
-                    "has_prev": page > 1,
-                    "next_page": page + 1 if page < total_pages else None,
-                    "prev_page": page - 1 if page > 1 else None,
-                },
-            }
-    
+            return {"data": conversations[:limit], "has_more": len(conversations) > limit}
+
         except SQLAlchemyError as e:
             await self.session.rollback()
-            raise DataBaseException(str(e))
\ No newline at end of file
+            raise DataBaseException(str(e))
@@ -0,0 +1,76 @@
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from bson import Binary
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.whatsapp.team_inbox.models.Message import Message
+from app.whatsapp.team_inbox.utils.message_archive import ARCHIVE_COLLECTION_PREFIX, archive_month
+
+
+class MessageArchiveRepository:
+    """
+    Read side of the monthly ``messages_archive_yyyy_mm`` collections that the
+    celery ``archive_messages`` task moves old messages into.
+    """
+
+    def __init__(self, months_ttl_seconds: int = 300):
+        self.months_ttl_seconds = months_ttl_seconds
+        self._months: List[tuple] = []
+        self._months_loaded_at = 0.0
+
+    @property
+    def database(self) -> AsyncIOMotorDatabase:
+        return Message.get_motor_collection().database
+
+    async def _archive_collections(self) -> List[tuple]:
+        """(yyyymm, name) for every archive collection, newest first."""
+        if time.monotonic() - self._months_loaded_at > self.months_ttl_seconds:
+            names = await self.database.list_collection_names(
+                filter={"name": {"$regex": f"^{ARCHIVE_COLLECTION_PREFIX}"}}
+            )
+            months = [(archive_month(name), name) for name in names]
+            self._months = sorted((m for m in months if m[0] is not None), reverse=True)
+            self._months_loaded_at = time.monotonic()
+        return self._months
+
+    async def find_page(self,
+                        conversation_id: UUID,
+                        limit: int,
+                        before_created_at: Optional[datetime] = None,
+                        before_id: Optional[UUID] = None,
+                        not_before: Optional[datetime] = None,
+                        projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Continue a newest-first page into the archive, walking months backwards
+        from the cursor until ``limit`` messages are found. ``not_before`` (the
+        conversation's start) stops the walk early.
+        """
+        query: Dict[str, Any] = {"conversation_id": Binary.from_uuid(conversation_id)}
+        if before_created_at and before_id:
+            query["$or"] = [
+                {"created_at": {"$lt": before_created_at}},
+                {"created_at": before_created_at, "_id": {"$lt": Binary.from_uuid(before_id)}}
+            ]
+
+        newest = before_created_at.year * 100 + before_created_at.month if before_created_at else None
+        oldest = not_before.year * 100 + not_before.month if not_before else None
+
+        messages: List[Dict[str, Any]] = []
+        for month, name in await self._archive_collections():
+            if newest is not None and month > newest:
+                continue
+            if oldest is not None and month < oldest:
+                break
+            cursor = (
+                self.database[name]
+                .find(query, projection)
+                .sort([("created_at", -1), ("_id", -1)])
+                .limit(limit - len(messages))
+            )
+            messages.extend(await cursor.to_list(length=None))
+            if len(messages) >= limit:
+                break
+        return messages
@@ -0,0 +1,246 @@
+import asyncio
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+from uuid import UUID
+
+from beanie.odm.utils.dump import get_dict
+from beanie.odm.utils.parsing import parse_obj
+from bson import Binary
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pydantic import BaseModel
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel, ReturnDocument
+
+from app.core.repository.MongoRepository import MongoCRUD
+from app.utils.DateTimeHelper import DateTimeHelper
+from app.whatsapp.team_inbox.models.Message import Message
+
+BUCKETS_COLLECTION = "message_buckets"
+LOOKUP_COLLECTION = "message_bucket_lookup"
+
+BUCKET_INDEXES = [
+    IndexModel([("conversation_id", ASCENDING), ("end_at", DESCENDING)]),
+    IndexModel([("conversation_id", ASCENDING), ("day", ASCENDING), ("count", ASCENDING)]),
+    # drives the archive_messages task's oldest-first sweep
+    IndexModel([("end_at", ASCENDING)]),
+    # like the messages index, text queries must pin conversation_id
+    IndexModel(
+        [("conversation_id", ASCENDING), ("messages.search_text", TEXT)],
+        name="bucket_search_text",
+        default_language="none",
+    ),
+]
+LOOKUP_INDEXES = [
+    IndexModel([("wa_message_id", ASCENDING)], sparse=True),
+]
+
+
+def _uuid(value: Any) -> Binary:
+    return value if isinstance(value, Binary) else Binary.from_uuid(UUID(str(value)))
+
+
+def _page_key(message: Dict[str, Any]) -> tuple:
+    return message["created_at"], _uuid(message["_id"])
+
+
+def _search_pattern(search: str) -> str:
+    # $text matches any of the words; negated words only narrow the buckets
+    words = [word.strip('"') for word in search.split() if not word.startswith("-")]
+    return "|".join(re.escape(word) for word in words if word)
+
+
+class MessageBucketRepository(MongoCRUD[Message]):
+    """
+    Bucket-pattern storage for messages: each conversation's history lives in
+    ``message_buckets`` documents of at most ``bucket_size`` messages from one
+    UTC day, appended with ``$push``. ``message_bucket_lookup`` maps a
+    message id (``_id``) and its ``wa_message_id`` to the owning bucket.
+
+    Drop-in for ``MongoCRUD[Message]`` on the calls the inbox makes: create,
+    lookups by id / wa_message_id, and partial updates, which become
+    positional ``messages.$`` updates inside the bucket. Conversation pages
+    and search have their own methods.
+    """
+
+    def __init__(self, bucket_size: int = 100):
+        super().__init__(model=Message)
+        self.bucket_size = bucket_size
+        self._indexes_ready = False
+
+    @property
+    def database(self) -> AsyncIOMotorDatabase:
+        return self.collection.database
+
+    @property
+    def buckets(self) -> AsyncIOMotorCollection:
+        return self.database[BUCKETS_COLLECTION]
+
+    @property
+    def lookup(self) -> AsyncIOMotorCollection:
+        return self.database[LOOKUP_COLLECTION]
+
+    async def ensure_indexes(self) -> None:
+        if self._indexes_ready:
+            return
+        await self.buckets.create_indexes(BUCKET_INDEXES)
+        await self.lookup.create_indexes(LOOKUP_INDEXES)
+        self._indexes_ready = True
+
+    async def create(self, data: Message) -> Message:
+        await self.ensure_indexes()
+        doc = get_dict(data, to_db=True, keep_nulls=data.get_settings().keep_nulls)
+        created_at = doc.get("created_at") or DateTimeHelper.now_utc()
+        bucket = await self.buckets.find_one_and_update(
+            {
+                "conversation_id": doc["conversation_id"],
+                "day": created_at.strftime("%Y-%m-%d"),
+                "count": {"$lt": self.bucket_size},
+            },
+            {
+                "$push": {"messages": doc},
+                "$inc": {"count": 1},
+                "$min": {"start_at": created_at},
+                "$max": {"end_at": created_at},
+            },
+            upsert=True,
+            projection={"_id": 1},
+            return_document=ReturnDocument.AFTER,
+        )
+        await self.lookup.insert_one({
+            "_id": doc["_id"],
+            "wa_message_id": doc.get("wa_message_id") or None,
+            "bucket_id": bucket["_id"],
+            "conversation_id": doc["conversation_id"],
+        })
+        return data
+
+    async def create_deferred(self, data: Message) -> asyncio.Future:
+        # a $push is already a single small write, there is nothing to batch
+        await self.create(data)
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(data.id)
+        return future
+
+    async def _locate(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if set(query) == {"_id"}:
+            return await self.lookup.find_one({"_id": _uuid(query["_id"])})
+        if set(query) == {"wa_message_id"}:
+            return await self.lookup.find_one({"wa_message_id": query["wa_message_id"]})
+        return None
+
+    async def _message(self, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        bucket = await self.buckets.find_one(
+            {"_id": entry["bucket_id"]},
+            {"messages": {"$elemMatch": {"_id": entry["_id"]}}},
+        )
+        messages = (bucket or {}).get("messages") or []
+        return messages[0] if messages else None
+
+    @staticmethod
+    def _project(doc: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if not projection:
+            return doc
+        if any(projection.values()):
+            return {k: v for k, v in doc.items() if k == "_id" or projection.get(k)}
+        return {k: v for k, v in doc.items() if k not in projection}
+
+    async def get_by_id(self, id: Any) -> Optional[Message]:
+        return await self.find_one({"_id": id})
+
+    async def find_one(self,
+                    query: Dict[str, Any],
+                    projection: Optional[Dict[str, Any]] = None,
+                    raw: bool = False,
+                    as_type=None):
+        entry = await self._locate(query)
+        if entry is None:
+            return None
+        doc = await self._message(entry)
+        if doc is None:
+            return None
+        if projection is not None or raw or as_type is not None:
+            return self._convert_raw(self._project(doc, projection), as_type)
+        return parse_obj(self.model, doc)
+
+    async def update(self,
+                id: Any,
+                data: Union[Dict[str, Any], BaseModel],
+                partial: bool = True,
+                projection: Optional[Dict[str, Any]] = None,
+                upsert: bool = False) -> Optional[Union[Message, Dict[str, Any]]]:
+        entry = await self.lookup.find_one({"_id": _uuid(id)})
+        if entry is None:
+            return None
+        updates = self._update_document(data, partial)
+        result = await self.buckets.update_one(
+            {"_id": entry["bucket_id"], "messages._id": entry["_id"]},
+            {"$set": {f"messages.$.{field}": value for field, value in updates.items()}},
+        )
+        if not result.matched_count:
+            return None
+        if "wa_message_id" in updates:
+            await self.lookup.update_one(
+                {"_id": entry["_id"]}, {"$set": {"wa_message_id": updates["wa_message_id"]}}
+            )
+        if projection is not None and not set(projection) - {"_id"}:
+            return {"_id": entry["_id"]}
+        doc = await self._message(entry)
+        if doc is None or projection is not None:
+            return self._project(doc, projection) if doc else None
+        return parse_obj(self.model, doc)
+
+    async def find_conversation_page(self,
+                                    conversation_id: UUID,
+                                    limit: int,
+                                    before_created_at: Optional[datetime] = None,
+                                    before_id: Optional[UUID] = None,
+                                    projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Newest-first page of one conversation, read bucket by bucket. Buckets
+        can overlap in time when two writers opened one concurrently, so
+        reading stops only once the next bucket ends before the page's oldest
+        message.
+        """
+        query: Dict[str, Any] = {"conversation_id": _uuid(conversation_id)}
+        if before_created_at:
+            query["start_at"] = {"$lte": before_created_at}
+        cursor = self.buckets.find(query).sort("end_at", DESCENDING)
+
+        before_key = (before_created_at, _uuid(before_id)) if before_created_at and before_id else None
+        collected: List[Dict[str, Any]] = []
+        async for bucket in cursor:
+            if len(collected) >= limit and bucket["end_at"] < collected[limit - 1]["created_at"]:
+                break
+            for message in bucket.get("messages", []):
+                if before_key is None or _page_key(message) < before_key:
+                    collected.append(message)
+            collected.sort(key=_page_key, reverse=True)
+        return [self._project(message, projection) for message in collected[:limit]]
+
+    async def search_conversation(self,
+                                conversation_id: UUID,
+                                search: str,
+                                limit: int,
+                                query: Optional[Dict[str, Any]] = None,
+                                projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Newest-first messages of one conversation matching ``search`` and the
+        message-level ``query``. ``$text`` can only pick buckets, so every
+        message of a matching bucket is checked again for one of the words
+        (case-insensitive, without the text index's stemming).
+        """
+        await self.ensure_indexes()
+        pipeline: List[Dict[str, Any]] = [
+            {"$match": {"conversation_id": _uuid(conversation_id), "$text": {"$search": search}}},
+            {"$unwind": "$messages"},
+            {"$replaceRoot": {"newRoot": "$messages"}},
+            {"$match": {
+                **self._encoder.encode(query or {}),
+                "search_text": {"$regex": _search_pattern(search), "$options": "i"},
+            }},
+            {"$sort": {"created_at": -1, "_id": -1}},
+            {"$limit": limit},
+        ]
+        if projection:
+            pipeline.append({"$project": projection})
+        return await self.buckets.aggregate(pipeline).to_list(length=limit)
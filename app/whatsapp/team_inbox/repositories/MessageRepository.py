@@ -1,5 +1,8 @@
+from typing import Optional
+from sqlalchemy import case, func, update
 from sqlmodel import Session, select
 from app.core.exceptions.custom_exceptions.DataBaseException import DataBaseException
+from app.whatsapp.team_inbox.models.Conversation import Conversation, LAST_MESSAGE_PREVIEW_LENGTH
 from app.whatsapp.team_inbox.models.MessageMeta import MessageMeta
 from app.core.repository.BaseRepository import BaseRepository
 from sqlalchemy.exc import SQLAlchemyError
@@ -7,12 +10,57 @@ from sqlalchemy.exc import SQLAlchemyError
 class MessageRepository(BaseRepository[MessageMeta]):
     def __init__(self, session: Session) -> None:
         super().__init__(model=MessageMeta, session=session)
-    
+
+    async def create(self, obj: MessageMeta, commit: bool = True, preview: Optional[str] = None) -> MessageMeta:
+        """
+        Insert the message and move its conversation's last_message_* columns
+        forward in the same transaction. ``preview`` replaces the stored
+        preview when given; a message older than the current last one leaves
+        both untouched.
+        """
+        try:
+            self.session.add(obj)
+            await self.session.execute(self._touch_conversation(obj, preview))
+            if commit:
+                await self.session.commit()
+                await self.session.refresh(obj)
+            return obj
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise e
+
+    @staticmethod
+    def _touch_conversation(message: MessageMeta, preview: Optional[str]):
+        is_newest = Conversation.last_message_at <= message.created_at
+        values = {
+            Conversation.last_message_at: func.greatest(Conversation.last_message_at, message.created_at),
+        }
+        if preview is not None:
+            values[Conversation.last_message_preview] = case(
+                (is_newest, preview[:LAST_MESSAGE_PREVIEW_LENGTH]),
+                else_=Conversation.last_message_preview,
+            )
+        if message.is_from_contact:
+            # greatest() skips NULLs, so the first inbound message just sets it
+            values[Conversation.last_inbound_at] = func.greatest(Conversation.last_inbound_at, message.created_at)
+        return (
+            update(Conversation)
+            .where(Conversation.id == message.conversation_id)
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+
     async def get_last_message(self, conversation_id: str) -> MessageMeta:
         try:
             query = (
                 select(MessageMeta)
-                .where(MessageMeta.conversation_id == conversation_id)
+                .where(
+                    MessageMeta.conversation_id == conversation_id,
+                    # lets the planner skip partitions older than the conversation
+                    MessageMeta.created_at >= select(Conversation.created_at)
+                    .where(Conversation.id == conversation_id)
+                    .scalar_subquery(),
+                )
                 .order_by(MessageMeta.created_at.desc())
                 .limit(1)
             )
@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
 from app.core.services.BaseService import BaseService
 from app.utils.Helper import Helper
 from app.whatsapp.team_inbox.models.Conversation import Conversation
@@ -17,5 +20,12 @@ class ConversationService(BaseService[Conversation]):
     async def find_by_contact_and_client_id(self, contact_phone_number: str, client_id: str) -> Conversation:
         return await self.repository.find_by_contact_and_client_id(str(contact_phone_number), client_id)
     
-    async def get_user_conversations(self, user_id: str, page: int = 1, limit: int = 10) -> dict:
-        return await self.repository.get_user_conversations(user_id, page, limit)
\ No newline at end of file
+    async def get_user_conversations(self,
+                                     user_id: str,
+                                     limit: int = 10,
+                                     client_id: Optional[UUID] = None,
+                                     before_last_message_at: Optional[datetime] = None,
+                                     before_id: Optional[UUID] = None) -> dict:
+        return await self.repository.get_user_conversations(
+            user_id, limit, client_id, before_last_message_at, before_id
+        )
\ No newline at end of file
@@ -1,3 +1,4 @@
+from typing import Optional
 from app.core.services.BaseService import BaseService
 from app.whatsapp.team_inbox.models.MessageMeta import MessageMeta
 from app.whatsapp.team_inbox.repositories.MessageRepository import MessageRepository
@@ -7,6 +8,9 @@ class MessageService(BaseService[MessageMeta]):
     def __init__(self, repository: MessageRepository):
         super().__init__(repository)
         self.repository = repository
+
+    async def create(self, obj: MessageMeta, commit: bool = True, preview: Optional[str] = None) -> MessageMeta:
+        return await self.repository.create(obj, commit=commit, preview=preview)
     
     async def getLastMessage(self,conversation_id: str):
         return await self.repository.get_last_message(conversation_id)
\ No newline at end of file
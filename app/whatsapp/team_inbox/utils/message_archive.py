@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Optional
+
+ARCHIVE_COLLECTION_PREFIX = "messages_archive_"
+
+
+def archive_collection_name(created_at: datetime) -> str:
+    """Monthly archive collection a message created at ``created_at`` belongs to."""
+    return f"{ARCHIVE_COLLECTION_PREFIX}{created_at.year:04d}_{created_at.month:02d}"
+
+
+def archive_month(collection_name: str) -> Optional[int]:
+    """Sortable ``yyyymm`` of an archive collection name, None for anything else."""
+    if not collection_name.startswith(ARCHIVE_COLLECTION_PREFIX):
+        return None
+    suffix = collection_name[len(ARCHIVE_COLLECTION_PREFIX):]
+    year, _, month = suffix.partition("_")
+    if not (year.isdigit() and month.isdigit()):
+        return None
+    return int(year) * 100 + int(month)
@@ -0,0 +1,77 @@
+import re
+from datetime import datetime, timezone
+from typing import List, Optional
+
+MESSAGES_TABLE = "messages"
+PARTITION_PREFIX = "messages_"
+# pre-partitioning rows, ranged from MINVALUE to the month after the migration
+LEGACY_PARTITION = "messages_legacy"
+# detached partitions are moved here rather than dropped
+ARCHIVE_SCHEMA = "messages_archive"
+DEFAULT_MONTHS_AHEAD = 3
+
+
+def month_start(moment: datetime) -> datetime:
+    moment = moment.astimezone(timezone.utc) if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    """Monthly ``messages`` partition holding rows created in ``month``."""
+    return f"{PARTITION_PREFIX}{month.year:04d}_{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[int]:
+    """Sortable ``yyyymm`` of a monthly partition name, None for anything else."""
+    if not name.startswith(PARTITION_PREFIX):
+        return None
+    year, _, month = name[len(PARTITION_PREFIX):].partition("_")
+    if not (len(year) == 4 and year.isdigit() and len(month) == 2 and month.isdigit()):
+        return None
+    return int(year) * 100 + int(month)
+
+
+def create_partition_sql(month: datetime) -> str:
+    start = month_start(month)
+    end = add_months(start, 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(start)} PARTITION OF {MESSAGES_TABLE} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def range_upper_bound(bound: Optional[str]) -> Optional[datetime]:
+    """The TO value of a partition bound as printed by pg_get_expr(relpartbound), None without one."""
+    match = re.search(r"TO \('([^']+)'\)", bound or "")
+    return datetime.fromisoformat(match.group(1)) if match else None
+
+
+def upcoming_months(now: datetime, months_ahead: int, covered_until: Optional[datetime] = None) -> List[datetime]:
+    """
+    The current month and the next ``months_ahead``, as month starts.
+    Months starting before ``covered_until`` (the upper bound of the legacy
+    partition) are left out, a partition for them would overlap it.
+    """
+    current = month_start(now)
+    months = [add_months(current, i) for i in range(months_ahead + 1)]
+    if covered_until is None:
+        return months
+    return [month for month in months if month >= covered_until]
+
+
+def expired_partitions(names: List[str], now: datetime, retention_months: int) -> List[str]:
+    """Monthly partitions entirely older than ``retention_months`` full months, oldest first."""
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(now), -retention_months)
+    cutoff_month = cutoff.year * 100 + cutoff.month
+    months = {name: partition_month(name) for name in names}
+    return sorted(
+        (name for name, month in months.items() if month is not None and month < cutoff_month),
+        key=months.get,
+    )
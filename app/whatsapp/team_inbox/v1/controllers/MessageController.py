@@ -1,8 +1,10 @@
-from typing import Optional
+from datetime import datetime
+from typing import Literal, Optional
 from app.whatsapp.team_inbox.v1.schemas.request.CreateConversationRequest import CreateConversationRequest
 from app.whatsapp.team_inbox.v1.schemas.request.TemplateMessageRequest import TemplateMessageRequest
 from app.whatsapp.team_inbox.v1.use_case.CreateNewConversation import CreateNewConversation
 from app.whatsapp.team_inbox.v1.use_case.GetConversationMessages import GetConversationMessages
+from app.whatsapp.team_inbox.v1.use_case.SearchConversationMessages import SearchConversationMessages
 from app.whatsapp.team_inbox.v1.use_case.TemplateMessage import TemplateMessage
 from fastapi import APIRouter, Body, Depends, File, Form, Query, UploadFile, logger
 from dependency_injector.wiring import Provide, inject
@@ -36,6 +38,30 @@ async def get_by_conversation(
         except Exception as e:
                 raise e
 
+@router.get("/search")
+@inject
+async def search_conversation_messages(
+        conversation_id: str = Query(..., description="Conversation id"),
+        q: str = Query(..., min_length=1, max_length=256, description="Text to search for"),
+        limit: int = Query(20, ge=1, le=100, description="Number of items per page"),
+        before_created_at: Optional[str] = Query(None, description="Before created at"),
+        before_id: Optional[str] = Query(None, description="Before id"),
+        date_from: Optional[datetime] = Query(None, description="Only messages created at or after this time"),
+        date_to: Optional[datetime] = Query(None, description="Only messages created before this time"),
+        message_type: Optional[str] = Query(None, description="Message type, e.g. text, image, template"),
+        direction: Optional[Literal["inbound", "outbound"]] = Query(None, description="inbound (from contact) or outbound"),
+        token: str = Depends(get_current_user),
+        search_messages: SearchConversationMessages = Depends(Provide[Container.search_conversation_messages])):
+        try:
+                result = await search_messages.execute(token["userId"], conversation_id, q, limit,
+                                                before_created_at, before_id, date_from, date_to,
+                                                message_type, direction)
+                return result
+        except GlobalException as e:
+                raise e
+        except Exception as e:
+                raise e
+
 @router.post("/text")
 @inject
 async def send_text_message(text_message_request: TextMessageRequest,
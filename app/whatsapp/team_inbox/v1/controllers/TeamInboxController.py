@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
 
 from dependency_injector.wiring import Provide, inject
 
@@ -37,12 +38,13 @@ async def create_conversation(
 @inject
 async def get_conversations(
                                 token: str = Depends(get_current_user),
-                                page: int = 1,
-                                limit: int = 10,
+                                limit: int = Query(10, ge=1, le=100, description="Number of items per page"),
+                                before_last_message_at: Optional[str] = Query(None, description="Cursor: last_message_at of the previous page's last item"),
+                                before_id: Optional[str] = Query(None, description="Cursor: id of the previous page's last item"),
                                 get_conversations: GetUserConversations = Depends(Provide[Container.get_conversations]),
                                 ):
         try:
-                result = await get_conversations.excute(token["userId"], page, limit)
+                result = await get_conversations.excute(token["userId"], limit, before_last_message_at, before_id)
                 return result
         except GlobalException as e:
                 raise e
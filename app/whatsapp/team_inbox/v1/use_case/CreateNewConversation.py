@@ -136,7 +136,7 @@ class CreateNewConversation:
                 conversation_id=new_conversation.id
             )
             
-            message_meta = await self.message_service.create(template_message)
+            message_meta = await self.message_service.create(template_message, preview="template")
             
             mongo_doc = Message(
                 id=message_meta.id,
@@ -8,6 +8,8 @@ from app.core.storage.redis import AsyncRedisService
 from app.user_management.user.services.UserService import UserService
 from app.utils.RedisHelper import RedisHelper
 from app.whatsapp.team_inbox.models.Message import Message
+from app.whatsapp.team_inbox.repositories.MessageArchiveRepository import MessageArchiveRepository
+from app.whatsapp.team_inbox.repositories.MessageBucketRepository import MessageBucketRepository
 from app.whatsapp.team_inbox.services.ConversationService import ConversationService
 from app.whatsapp.team_inbox.utils.conversation_status import ConversationStatus
 
@@ -15,10 +17,12 @@ class GetConversationMessages:
     def __init__(self, conversation_service: ConversationService,
                 user_service: UserService,
                 mongo_crud: MongoCRUD[Message],
+                message_archive: MessageArchiveRepository,
                 ):
         self.conversation_service = conversation_service
         self.user_service = user_service
         self.mongo_crud = mongo_crud
+        self.message_archive = message_archive
 
     async def execute(self,
                     user_id: str,
@@ -35,6 +39,7 @@ class GetConversationMessages:
             raise EntityNotFoundException("Conversation not found")
 
         query: Dict[str, Any] = {"conversation_id": UUID(conversation_id)}
+        ts = uid = None
         if before_created_at and before_id:
             ts = datetime.fromisoformat(before_created_at)
             uid = UUID(before_id)
@@ -44,15 +49,39 @@ class GetConversationMessages:
             ]
 
         sort = [("created_at", -1), ("_id", -1)]
-        messages = await self.mongo_crud.find_many(
-            query=query, limit=limit, sort=sort
-        )
+        # search_text only exists for the text index, it is not part of the message
+        projection = {"search_text": 0}
+        if isinstance(self.mongo_crud, MessageBucketRepository):
+            messages = await self.mongo_crud.find_conversation_page(
+                UUID(conversation_id), limit, before_created_at=ts, before_id=uid, projection=projection
+            )
+        else:
+            # the page goes straight out as JSON, so skip model validation
+            messages = await self.mongo_crud.find_many(
+                query=query, limit=limit, sort=sort, projection=projection, raw=True
+            )
+
+        # hot tier ran out, carry on into the monthly archives from where it stopped
+        if len(messages) < limit:
+            if messages:
+                ts, uid = messages[-1]["created_at"], messages[-1]["_id"]
+            archived = await self.message_archive.find_page(
+                conversation_id=UUID(conversation_id),
+                limit=limit - len(messages),
+                before_created_at=ts,
+                before_id=uid,
+                not_before=conversation.created_at,
+                projection=projection,
+            )
+            # a message being archived right now can briefly exist in both tiers
+            seen = {m["_id"] for m in messages}
+            messages.extend(m for m in archived if m["_id"] not in seen)
 
         if messages:
             last = messages[-1]
             next_cursor = {
-                "before_created_at": last.created_at.isoformat(),
-                "before_id": str(last.id)
+                "before_created_at": last["created_at"].isoformat(),
+                "before_id": str(last["_id"])
             }
         else:
             next_cursor = None
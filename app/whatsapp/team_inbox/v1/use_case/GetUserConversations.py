@@ -1,12 +1,13 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
 from app.annotations.services.ContactService import ContactService
 from app.core.config.logger import get_logger
 from app.core.exceptions.custom_exceptions.EntityNotFoundException import EntityNotFoundException
-from app.core.schemas.PageableResponse import PageableResponse
 from app.core.storage.redis import AsyncRedisService
 from app.user_management.user.services.UserService import UserService
 from app.utils.Helper import Helper
 from app.utils.RedisHelper import RedisHelper
-from app.whatsapp.team_inbox.models.Conversation import Conversation
 from app.whatsapp.team_inbox.models.schema.response.ConversationWithContact import ConversationWithContact
 from app.whatsapp.team_inbox.services.ConversationService import ConversationService
 from app.whatsapp.team_inbox.services.MessageService import MessageService
@@ -19,34 +20,45 @@ class GetUserConversations:
         self.contact_service = contact_service
         self.message_service = message_service
         self.redis = redis
-    async def excute(self, user_id: str, page: int = 1, limit: int = 10)-> PageableResponse[Conversation]:
+    async def excute(self,
+                     user_id: str,
+                     limit: int = 10,
+                     before_last_message_at: Optional[str] = None,
+                     before_id: Optional[str] = None) -> dict:
         user = await self.user_service.get(user_id)
         if not user:
             raise EntityNotFoundException("User not found")
-        
-        conversations : Conversation = await self.conversation_service.get_user_conversations(user_id, page, limit)
-        logger.info(conversations)
-        conversations_data = []        
-        for conversation in conversations['data']:
-            contact = await self.contact_service.get(conversation.contact_id)
-            
-            redis_key = RedisHelper.redis_conversation_last_message_key(conversation.id)
-            
-            conversation_redis_data = await self.redis.get(redis_key)
-            
+
+        ts = uid = None
+        if before_last_message_at and before_id:
+            ts = datetime.fromisoformat(before_last_message_at)
+            uid = UUID(before_id)
+
+        conversations = await self.conversation_service.get_user_conversations(
+            user_id, limit, client_id=user.client_id, before_last_message_at=ts, before_id=uid
+        )
+        page = conversations['data']
+
+        # whole-page enrichment: one contact query and one Redis round trip, whatever the page size
+        contacts = await self.contact_service.get_summaries_by_ids([c.contact_id for c in page])
+        expirations, unread = await self.redis.get_many_with_hashes(
+            [RedisHelper.redis_conversation_expired_key(c.id) for c in page],
+            [RedisHelper.redis_business_conversation_unread_key(conversation_id=c.id) for c in page],
+        )
+
+        conversations_data = []
+        for conversation, redis_expiration_time, unread_status in zip(page, expirations, unread):
+            contact = contacts.get(conversation.contact_id)
+            if contact is None:
+                logger.warning("conversation_contact_missing", {"conversation_id": str(conversation.id)})
+                continue
+
             conversation_expiration_time = None
-            
-            redis_conversation_expiration_time = RedisHelper.redis_conversation_expired_key(conversation.id)
-            redis_expiration_time = await self.redis.get(redis_conversation_expiration_time)    
             if redis_expiration_time:
                 conversation_expiration_time = Helper.conversation_expiration_calculate(redis_expiration_time)
-                
+
             assignments = conversation.assignment
-            
-            unread_key = RedisHelper.redis_business_conversation_unread_key(conversation_id= conversation.id)
-            unread_status = await self.redis.hgetall(unread_key)
-            unread_count = int(unread_status.get('unread_count', 0)) if unread_status else 0   
-            logger.debug(f"user_id:assignments:{assignments} {conversation.id}")
+            unread_count = int(unread_status.get('unread_count', 0)) if unread_status else 0
             conversations_data.append(ConversationWithContact(
                 id=conversation.id,
                 status=conversation.status,
@@ -56,14 +68,27 @@ class GetUserConversations:
                 contact_name=contact.name,
                 contact_phone_number=contact.phone_number,
                 country_code_phone_number=contact.country_code,
-                last_message=conversation_redis_data['last_message'] if conversation_redis_data else None,
-                last_message_time=conversation_redis_data['last_message_time'] if conversation_redis_data else None,
+                last_message=conversation.last_message_preview,
+                last_message_time=f"{conversation.last_message_at}",
                 conversation_is_expired= conversation_expiration_time if False else True,
                 conversation_expiration_time=conversation_expiration_time,
                 unread_count=unread_count
-            ))            
-        
-        return PageableResponse[ConversationWithContact](data = conversations_data, meta = conversations['meta'])
+            ))
+
+        next_cursor = None
+        if conversations['has_more']:
+            last = page[-1]
+            next_cursor = {
+                "before_last_message_at": last.last_message_at.isoformat(),
+                "before_id": str(last.id)
+            }
+
+        return {
+            "data": conversations_data,
+            "cursor": next_cursor,
+            "limit": limit,
+            "has_more": conversations['has_more']
+        }
     
 
 #TODO think about the last message and how much ttl need to be in redis
\ No newline at end of file
@@ -78,7 +78,7 @@ class LocationMessage:
                 is_from_contact=False,
                 member_id=user.id,
             )
-            meta_db = await self.message_service.create(meta)
+            meta_db = await self.message_service.create(meta, preview="location")
 
             content = {
                 "latitude": request_body.latitude,
@@ -126,7 +126,7 @@ class MediaMessage:
                 member_id = user.id
             ) 
             
-            message_created_data = await self.message_service.create(message_meta_data)
+            message_created_data = await self.message_service.create(message_meta_data, preview=content_type)
             
             content_data = {
                 "cdn_url": f"https://{self.aws_s3_bucket_name}.s3.{self.aws_region}.amazonaws.com/{file_s3_key}",
@@ -148,7 +148,7 @@ class MediaMessage:
                 member_id = user.id
             )            
             
-            await self.mongo_crud.create(message_document)
+            await self.mongo_crud.create_deferred(message_document)
             
             redis_last_message = RedisHelper.redis_conversation_last_message_data(last_message=content_type ,last_message_time=f"{message_created_data.created_at}")
             await self.redis_service.set(key=RedisHelper.redis_conversation_last_message_key(str(conversation.id)),value= redis_last_message,ttl=None)            
@@ -75,7 +75,7 @@ class ReplyWithReactionMessage:
                 member_id = user.id
             ) 
             
-            message_created_data = await self.message_service.create(message_meta_data)
+            message_created_data = await self.message_service.create(message_meta_data, preview=f"reacted with emoji {emoji}")
             
             message_content = {"emoji": emoji}
             context_message : dict = None
@@ -0,0 +1,107 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+from app.core.exceptions.custom_exceptions.BadRequestException import BadRequestException
+from app.core.exceptions.custom_exceptions.EntityNotFoundException import EntityNotFoundException
+from app.core.repository.MongoRepository import MongoCRUD
+from app.user_management.user.services.UserService import UserService
+from app.whatsapp.team_inbox.models.Message import Message
+from app.whatsapp.team_inbox.repositories.MessageBucketRepository import MessageBucketRepository
+from app.whatsapp.team_inbox.services.ConversationService import ConversationService
+from app.whatsapp.team_inbox.utils.message_search import normalize_search_text
+
+DIRECTIONS = {
+    "inbound": True,
+    "outbound": False,
+}
+
+MAX_LIMIT = 100
+
+
+class SearchConversationMessages:
+    def __init__(self, conversation_service: ConversationService,
+                user_service: UserService,
+                mongo_crud: MongoCRUD[Message],
+                ):
+        self.conversation_service = conversation_service
+        self.user_service = user_service
+        self.mongo_crud = mongo_crud
+
+    async def execute(self,
+                    user_id: str,
+                    conversation_id: str,
+                    search: str,
+                    limit: int = 20,
+                    before_created_at: Optional[str] = None,
+                    before_id: Optional[str] = None,
+                    date_from: Optional[datetime] = None,
+                    date_to: Optional[datetime] = None,
+                    message_type: Optional[str] = None,
+                    direction: Optional[str] = None,
+                    ) -> dict:
+        search = normalize_search_text(search or "")
+        if not search:
+            raise BadRequestException("Search text is required")
+        if direction is not None and direction not in DIRECTIONS:
+            raise BadRequestException("direction must be 'inbound' or 'outbound'")
+        limit = max(1, min(limit, MAX_LIMIT))
+
+        conversation = await self.conversation_service.get(conversation_id)
+        if not conversation:
+            raise EntityNotFoundException("Conversation not found")
+        user = await self.user_service.get(user_id)
+        if not user or user.client_id != conversation.client_id:
+            raise EntityNotFoundException("Conversation not found")
+
+        # equality on conversation_id is required by the compound text index
+        query: Dict[str, Any] = {
+            "conversation_id": UUID(conversation_id),
+            "$text": {"$search": search},
+        }
+        created_at: Dict[str, Any] = {}
+        if date_from:
+            created_at["$gte"] = date_from
+        if date_to:
+            created_at["$lt"] = date_to
+        if created_at:
+            query["created_at"] = created_at
+        if message_type:
+            query["message_type"] = message_type
+        if direction:
+            query["is_from_contact"] = DIRECTIONS[direction]
+        if before_created_at and before_id:
+            ts = datetime.fromisoformat(before_created_at)
+            uid = UUID(before_id)
+            query["$or"] = [
+                {"created_at": {"$lt": ts}},
+                {"created_at": ts, "_id": {"$lt": uid}}
+            ]
+
+        if isinstance(self.mongo_crud, MessageBucketRepository):
+            message_query = {k: v for k, v in query.items() if k not in ("conversation_id", "$text")}
+            messages = await self.mongo_crud.search_conversation(
+                UUID(conversation_id), search, limit, query=message_query, projection={"search_text": 0}
+            )
+        else:
+            messages = await self.mongo_crud.find_many(
+                query=query,
+                limit=limit,
+                sort=[("created_at", -1), ("_id", -1)],
+                projection={"search_text": 0},
+            )
+
+        has_more = len(messages) == limit
+        next_cursor = None
+        if messages and has_more:
+            last = messages[-1]
+            next_cursor = {
+                "before_created_at": last["created_at"].isoformat(),
+                "before_id": str(last["_id"])
+            }
+
+        return {
+            "data": messages,
+            "cursor": next_cursor,
+            "limit": limit,
+            "has_more": has_more
+        }
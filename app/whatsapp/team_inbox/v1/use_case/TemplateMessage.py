@@ -100,7 +100,7 @@ class TemplateMessage:
                 member_id = user.id
             ) 
             
-            message_created_data = await self.message_service.create(message_meta_data)
+            message_created_data = await self.message_service.create(message_meta_data, preview="template")
             
             message_document : Message = Message(
                 id = message_created_data.id,
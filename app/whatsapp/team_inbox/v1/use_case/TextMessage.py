@@ -85,7 +85,7 @@ class TextMessage:
                 member_id = user.id
             ) 
             
-            message_created_data = await self.message_service.create(message_meta_data)
+            message_created_data = await self.message_service.create(message_meta_data, preview=message_body)
             
             message_content = {"text_body": message_body}
     
@@ -101,7 +101,7 @@ class TextMessage:
                 context=context_message
             )            
             
-            await self.mongo_crud.create(message_document)
+            await self.mongo_crud.create_deferred(message_document)
             redis_last_message = RedisHelper.redis_conversation_last_message_data(last_message = message_content["text_body"] , last_message_time=f"{message_created_data.created_at}")
             await self.redis_service.set(key=RedisHelper.redis_conversation_last_message_key(str(conversation.id)),value= redis_last_message,ttl=None)
             
@@ -1,6 +1,7 @@
 from typing import Optional
 import httpx
 from app.core.services.BaseWhatsAppBusinessApi import BaseWhatsAppBusinessApi
+from app.core.services.WhatsAppThroughputGovernor import WhatsAppThroughputGovernor
 
 from app.core.decorators.log_decorator import log_class_methods
 from app.core.exceptions.custom_exceptions.ClientExceptionHandler import ClientException
@@ -19,28 +20,26 @@ from app.whatsapp.template.models.schema.MultiProductMessageTemplate import (
 
 @log_class_methods("WhatsAppTemplateApi")
 class WhatsAppTemplateApi(BaseWhatsAppBusinessApi):
-    def __init__(self, client: httpx.AsyncClient):
+    def __init__(self, client: httpx.AsyncClient, throughput_governor: Optional[WhatsAppThroughputGovernor] = None):
         self.client = client
-        super().__init__()
+        super().__init__(throughput_governor)
 
     async def send_text_template(
         self, phone_number_id: str, access_token: str, template: TextMessageTemplate
     ):
-        url = f"{self.base_url}/{phone_number_id}/messages"
         headers = self._get_headers(access_token)
         payload = template.model_dump()
 
-        response = await self.client.post(url, headers=headers, json=payload)
+        response = await self._post_message(phone_number_id, payload.get("to"), headers, payload)
         return response.json()
 
     async def send_media_template(
         self, phone_number_id: str, access_token: str, template: MediaMessageTemplate
     ):
-        url = f"{self.base_url}/{phone_number_id}/messages"
         headers = self._get_headers(access_token)
         payload = template.model_dump()
 
-        response = await self.client.post(url, headers=headers, json=payload)
+        response = await self._post_message(phone_number_id, payload.get("to"), headers, payload)
         return response.json()
 
 
@@ -50,30 +49,27 @@ class WhatsAppTemplateApi(BaseWhatsAppBusinessApi):
         access_token: str,
         template: InteractiveMessageTemplate,
     ):
-        url = f"{self.base_url}/{phone_number_id}/messages"
         headers = self._get_headers(access_token)
         payload = template.model_dump()
-        response = await self.client.post(url, headers=headers, json=payload)
+        response = await self._post_message(phone_number_id, payload.get("to"), headers, payload)
         return response.json()
 
 
     async def send_location_template(
         self, phone_number_id: str, access_token: str, template: LocationMessageTemplate
     ):
-        url = f"{self.base_url}/{phone_number_id}/messages"
         headers = self._get_headers(access_token)
         payload = template.model_dump()
-        response = await self.client.post(url, headers=headers, json=payload)
+        response = await self._post_message(phone_number_id, payload.get("to"), headers, payload)
         return response.json()
 
 
     async def send_auth_template(
         self, phone_number_id: str, access_token: str, template: AuthMessageTemplate
     ):
-        url = f"{self.base_url}/{phone_number_id}/messages"
         headers = self._get_headers(access_token)
         payload = template.model_dump()
-        response = await self.client.post(url, headers=headers, json=payload)
+        response = await self._post_message(phone_number_id, payload.get("to"), headers, payload)
         return response.json()
 
 
@@ -83,10 +79,9 @@ class WhatsAppTemplateApi(BaseWhatsAppBusinessApi):
         access_token: str,
         template: MultiProductMessageTemplate,
     ):
-        url = f"{self.base_url}/{phone_number_id}/messages"
         headers = self._get_headers(access_token)
         payload = template.model_dump()
-        response = await self.client.post(url, headers=headers, json=payload)
+        response = await self._post_message(phone_number_id, payload.get("to"), headers, payload)
         return response.json()
 
 
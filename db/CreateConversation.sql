@@ -47,6 +47,11 @@ BEGIN
             p_whatsapp_message_id, FALSE,
             p_user_id, v_contact_id, p_conversation_id
         );
+        UPDATE conversations
+        SET last_message_at      = GREATEST(last_message_at, ts_now),
+            last_message_preview = 'template',
+            updated_at           = ts_now
+        WHERE id = p_conversation_id;
         RETURN;
     END IF;
 
@@ -96,10 +101,12 @@ BEGIN
     p_conversation_id := uuid_generate_v7();
     INSERT INTO conversations (
         id, created_at, updated_at,
-        status, contact_id, assignment_id, client_id
+        status, contact_id, assignment_id, client_id,
+        last_message_at, last_message_preview
     ) VALUES (
         p_conversation_id, ts_now, ts_now,
-        'pending', v_contact_id, v_assignment_id, v_client_id
+        'pending', v_contact_id, v_assignment_id, v_client_id,
+        ts_now, 'template'
     );
 
     p_message_id := uuid_generate_v7();
@@ -116,3 +123,117 @@ BEGIN
     );
 END;
 $$;
+
+
+-- Set-based variant of broadcast_messaging for one chunk of a broadcast:
+-- recipient i is (p_contact_phones[i], p_country_code_phones[i],
+-- p_whatsapp_message_ids[i]). Contacts and conversations are resolved or
+-- created with one INSERT ... ON CONFLICT each (arbiters ux_contacts_client_phone
+-- and ux_conversations_contact), messages with one INSERT ... SELECT, and
+-- one row per recipient comes back. A function rather than a procedure so
+-- it can return the set.
+CREATE OR REPLACE FUNCTION broadcast_messaging_batch(
+    p_contact_phones        TEXT[],
+    p_country_code_phones   TEXT[],
+    p_business_phone        TEXT,
+    p_whatsapp_message_ids  TEXT[],
+    p_user_id               UUID
+)
+RETURNS TABLE (whatsapp_message_id TEXT, conversation_id UUID, message_id UUID)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    v_client_id        UUID;
+    v_assignment_id    UUID;
+    v_contact_source   TEXT := 'WHATSAPP';
+    ts_now             TIMESTAMP;
+BEGIN
+    ts_now := NOW() AT TIME ZONE 'UTC';
+
+    IF cardinality(p_contact_phones) <> cardinality(p_country_code_phones)
+       OR cardinality(p_contact_phones) <> cardinality(p_whatsapp_message_ids) THEN
+        RAISE EXCEPTION 'broadcast_messaging_batch: recipient arrays differ in length';
+    END IF;
+
+    SELECT bp.client_id INTO v_client_id
+    FROM business_profile bp
+    WHERE bp.phone_number = p_business_phone
+    LIMIT 1;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Business profile not found for phone %', p_business_phone;
+    END IF;
+
+    SELECT a.id INTO v_assignment_id
+    FROM assignments a
+    WHERE a.user_id = p_user_id
+    LIMIT 1;
+
+    IF NOT FOUND THEN
+        v_assignment_id := uuid_generate_v7();
+        INSERT INTO assignments (
+            id, created_at, updated_at,
+            user_id, assigned_by
+        ) VALUES (
+            v_assignment_id, ts_now, ts_now,
+            p_user_id, p_user_id
+        );
+    END IF;
+
+    INSERT INTO contacts (
+        id, created_at, updated_at,
+        name, country_code, phone_number, source,
+        status, allow_broadcast, allow_sms,
+        client_id
+    )
+    SELECT DISTINCT ON (r.phone)
+        uuid_generate_v7(), ts_now, ts_now,
+        r.country_code || r.phone, r.country_code, r.phone, v_contact_source,
+        'valid', TRUE, TRUE,
+        v_client_id
+    FROM unnest(p_contact_phones, p_country_code_phones) AS r(phone, country_code)
+    ON CONFLICT (client_id, phone_number) DO NOTHING;
+
+    -- separate statements so each sees rows a concurrent chunk committed
+    -- after the previous one ran
+    INSERT INTO conversations (
+        id, created_at, updated_at,
+        status, contact_id, assignment_id, client_id,
+        last_message_at, last_message_preview
+    )
+    SELECT
+        uuid_generate_v7(), ts_now, ts_now,
+        'pending', ct.id, v_assignment_id, v_client_id,
+        ts_now, 'template'
+    FROM contacts ct
+    WHERE ct.client_id = v_client_id
+      AND ct.phone_number = ANY(p_contact_phones)
+    ON CONFLICT (contact_id) DO NOTHING;
+
+    RETURN QUERY
+    WITH inserted AS (
+        INSERT INTO messages (
+            id, created_at, updated_at,
+            message_type, message_status,
+            whatsapp_message_id, is_from_contact,
+            member_id, contact_id, conversation_id
+        )
+        SELECT
+            uuid_generate_v7(), ts_now, ts_now,
+            'template', 'sent',
+            r.wa_message_id, FALSE,
+            p_user_id, ct.id, cv.id
+        FROM unnest(p_contact_phones, p_whatsapp_message_ids) AS r(phone, wa_message_id)
+        JOIN contacts ct ON ct.client_id = v_client_id AND ct.phone_number = r.phone
+        JOIN conversations cv ON cv.contact_id = ct.id
+        RETURNING messages.whatsapp_message_id, messages.conversation_id, messages.id
+    ), touched AS (
+        UPDATE conversations cv
+        SET last_message_at      = GREATEST(cv.last_message_at, ts_now),
+            last_message_preview = 'template',
+            updated_at           = ts_now
+        WHERE cv.id IN (SELECT i.conversation_id FROM inserted i)
+    )
+    SELECT i.whatsapp_message_id, i.conversation_id, i.id FROM inserted i;
+END;
+$$;
@@ -0,0 +1,35 @@
+#!/bin/sh
+# Brings Postgres to the Alembic head. Outside development the API only
+# checks the revision on startup (PostgresDatabase.check_migrations), so run
+# this before starting it. alembic.ini's sqlalchemy.url and
+# POSTGRES_DATABASE_URL must point at the same database.
+#
+# There is no baseline revision: the first one (a7c3e91d2f40) alters tables
+# that already exist. A database Alembic has never run on (no
+# alembic_version table) therefore gets its tables from the models first,
+# the same create_all development uses. Every revision also applies on top
+# of such a schema, so `upgrade head` then adds what create_all doesn't
+# create (extensions, trigram and unique indexes, storage parameters) and
+# records the revision.
+set -e
+cd "$(dirname "$0")"
+
+python - <<'EOF'
+import asyncio
+
+from app.core.config.container import Container  # imports every model
+
+
+async def main() -> None:
+    db = Container.psql()
+    try:
+        if await db.create_schema_if_unversioned():
+            print("unversioned database: tables created from the models")
+    finally:
+        await db.dispose()
+
+
+asyncio.run(main())
+EOF
+
+alembic upgrade head
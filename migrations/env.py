@@ -29,6 +29,7 @@ from app.whatsapp.team_inbox.models.MessageMeta import MessageMeta
 from app.whatsapp.team_inbox.models.Conversation import Conversation
 from app.whatsapp.team_inbox.models.ConversationTeamLink import ConversationTeamLink
 from app.chat_bot.models.ChatBotMeta import ChatBotMeta
+from app.core.broker.models.OutboxEvent import OutboxEvent
 
 
 # this is the Alembic Config object, which provides
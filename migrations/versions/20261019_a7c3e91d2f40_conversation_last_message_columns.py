@@ -0,0 +1,69 @@
+"""conversation last message columns
+
+Adds the denormalized last_message_at / last_message_preview / last_inbound_at
+columns to conversations, backfills them from messages and indexes them for
+the inbox listing. Written with IF NOT EXISTS so it also applies to databases
+whose schema was created by create_all.
+
+last_message_preview is not backfilled here: message bodies live in MongoDB,
+see app/whatsapp/team_inbox/operations/BackfillConversationPreview.py.
+
+Revision ID: a7c3e91d2f40
+Revises: 
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e91d2f40'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE conversations
+            ADD COLUMN IF NOT EXISTS last_message_at TIMESTAMP WITH TIME ZONE,
+            ADD COLUMN IF NOT EXISTS last_message_preview VARCHAR(255),
+            ADD COLUMN IF NOT EXISTS last_inbound_at TIMESTAMP WITH TIME ZONE
+    """)
+    op.execute("""
+        UPDATE conversations c
+        SET last_message_at = latest.last_message_at,
+            last_inbound_at = latest.last_inbound_at
+        FROM (
+            SELECT conversation_id,
+                   max(created_at) AS last_message_at,
+                   max(created_at) FILTER (WHERE is_from_contact) AS last_inbound_at
+            FROM messages
+            GROUP BY conversation_id
+        ) latest
+        WHERE latest.conversation_id = c.id
+    """)
+    op.execute("UPDATE conversations SET last_message_at = created_at WHERE last_message_at IS NULL")
+    op.execute("""
+        ALTER TABLE conversations
+            ALTER COLUMN last_message_at SET DEFAULT now(),
+            ALTER COLUMN last_message_at SET NOT NULL
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_conversations_client_last_message
+        ON conversations (client_id, last_message_at, id)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_conversations_client_last_message")
+    op.execute("""
+        ALTER TABLE conversations
+            DROP COLUMN IF EXISTS last_inbound_at,
+            DROP COLUMN IF EXISTS last_message_preview,
+            DROP COLUMN IF EXISTS last_message_at
+    """)
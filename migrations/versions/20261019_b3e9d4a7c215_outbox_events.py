@@ -0,0 +1,57 @@
+"""outbox events
+
+Table of broker messages written in the same transaction as the change they
+announce, drained by app/core/broker/OutboxRelay.py. Rows live for
+milliseconds and are deleted in batches, so autovacuum is told to visit the
+table far more often than the default 20% of dead rows.
+
+Revision ID: b3e9d4a7c215
+Revises: f81d2b6c4a57
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e9d4a7c215'
+down_revision: Union[str, None] = 'f81d2b6c4a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # a schema created by create_all has the table and its indexes already
+    if not sa.inspect(op.get_bind()).has_table('outbox_events'):
+        _create_table()
+    op.execute("""
+        ALTER TABLE outbox_events SET (
+            autovacuum_vacuum_scale_factor = 0.0,
+            autovacuum_vacuum_threshold = 1000
+        )
+    """)
+
+
+def _create_table() -> None:
+    op.create_table(
+        'outbox_events',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('topic', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('tenant', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_outbox_events_id'), 'outbox_events', ['id'], unique=False)
+    op.create_index(op.f('ix_outbox_events_created_at'), 'outbox_events', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_outbox_events_created_at'), table_name='outbox_events')
+    op.drop_index(op.f('ix_outbox_events_id'), table_name='outbox_events')
+    op.drop_table('outbox_events')
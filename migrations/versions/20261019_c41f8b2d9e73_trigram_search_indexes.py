@@ -0,0 +1,59 @@
+"""trigram search indexes
+
+pg_trgm GIN indexes for the contact, user, tag and attribute searches (see
+app/core/repository/TrigramSearch.py), plus digits-only expression indexes
+for phone-number prefix search on contacts. btree_gin lets client_id lead
+each GIN index so a search only walks its own tenant's entries.
+
+Indexes are built CONCURRENTLY outside the migration transaction so large
+contacts tables keep taking writes while they build.
+
+Revision ID: c41f8b2d9e73
+Revises: a7c3e91d2f40
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f8b2d9e73'
+down_revision: Union[str, None] = 'a7c3e91d2f40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# name -> definition; the phone expressions must stay identical to
+# contact_phone_expressions()/digits_of() or the planner won't use them
+INDEXES = {
+    "ix_contacts_name_trgm":
+        "contacts USING gin (client_id, name gin_trgm_ops)",
+    "ix_contacts_phone_digits":
+        r"contacts (client_id, regexp_replace(phone_number, '\D', '', 'g') text_pattern_ops)",
+    "ix_contacts_e164_digits":
+        r"contacts (client_id, regexp_replace(country_code || phone_number, '\D', '', 'g') text_pattern_ops)",
+    "ix_users_search_trgm":
+        "users USING gin (client_id, email gin_trgm_ops, first_name gin_trgm_ops, last_name gin_trgm_ops)",
+    "ix_tags_name_trgm":
+        "tags USING gin (client_id, name gin_trgm_ops)",
+    "ix_attributes_name_trgm":
+        "attributes USING gin (client_id, name gin_trgm_ops)",
+}
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
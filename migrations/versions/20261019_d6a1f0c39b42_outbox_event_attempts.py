@@ -0,0 +1,37 @@
+"""outbox event attempts
+
+Failed publishes are counted per row instead of rolling back the whole
+relay batch: ``attempts`` and ``last_error`` record them, ``retry_at`` backs
+the row off, and a row that failed OUTBOX_MAX_ATTEMPTS times is parked.
+A schema created by create_all has the columns already.
+
+Revision ID: d6a1f0c39b42
+Revises: b3e9d4a7c215
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6a1f0c39b42'
+down_revision: Union[str, None] = 'b3e9d4a7c215'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE outbox_events
+            ADD COLUMN IF NOT EXISTS attempts integer NOT NULL DEFAULT 0,
+            ADD COLUMN IF NOT EXISTS last_error varchar,
+            ADD COLUMN IF NOT EXISTS retry_at timestamp with time zone
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('outbox_events', 'retry_at')
+    op.drop_column('outbox_events', 'last_error')
+    op.drop_column('outbox_events', 'attempts')
@@ -0,0 +1,60 @@
+"""broadcast batch unique keys
+
+Unique (client_id, phone_number) on contacts and unique contact_id on
+conversations: the invariants the application already assumes (one contact
+per number per client, one conversation per contact), made explicit so
+broadcast_messaging_batch in db/CreateConversation.sql can resolve rows with
+INSERT ... ON CONFLICT.
+
+Existing duplicates have to be merged by hand first; the upgrade stops with
+a count instead of guessing which row to keep.
+
+Revision ID: e5a0c7f3b918
+Revises: c41f8b2d9e73
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a0c7f3b918'
+down_revision: Union[str, None] = 'c41f8b2d9e73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+UNIQUE_KEYS = {
+    "ux_contacts_client_phone": ("contacts", "client_id, phone_number"),
+    "ux_conversations_contact": ("conversations", "contact_id"),
+}
+
+
+def _assert_no_duplicates(table: str, columns: str) -> None:
+    duplicates = op.get_bind().execute(sa.text(f"""
+        SELECT count(*) FROM (
+            SELECT 1 FROM {table} GROUP BY {columns} HAVING count(*) > 1
+        ) d
+    """)).scalar()
+    if duplicates:
+        raise RuntimeError(
+            f"{duplicates} duplicate ({columns}) groups in {table}; merge them before applying this revision"
+        )
+
+
+def upgrade() -> None:
+    for table, columns in UNIQUE_KEYS.values():
+        _assert_no_duplicates(table, columns)
+    with op.get_context().autocommit_block():
+        for name, (table, columns) in UNIQUE_KEYS.items():
+            op.execute(f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in UNIQUE_KEYS:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,119 @@
+"""partition messages by month
+
+Turns ``messages`` into a table range-partitioned on created_at. The existing
+table is kept as the partition ``messages_legacy`` covering everything up to
+the start of next month, so no rows are copied; monthly partitions
+``messages_yyyy_mm`` take over from there and are created ahead of time by
+the maintain_message_partitions Celery task.
+
+ATTACH PARTITION and the new primary key scan messages_legacy under an
+ACCESS EXCLUSIVE lock: run this in a maintenance window on large databases.
+On a schema created by create_all ``messages`` is partitioned already and
+this revision does nothing.
+
+Revision ID: f81d2b6c4a57
+Revises: e5a0c7f3b918
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f81d2b6c4a57'
+down_revision: Union[str, None] = 'e5a0c7f3b918'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+MONTHS_AHEAD = 3
+
+FOREIGN_KEYS = {
+    "messages_member_id_fkey": "FOREIGN KEY (member_id) REFERENCES users (id)",
+    "messages_contact_id_fkey": "FOREIGN KEY (contact_id) REFERENCES contacts (id)",
+    "messages_conversation_id_fkey": "FOREIGN KEY (conversation_id) REFERENCES conversations (id)",
+}
+
+INDEXES = {
+    "ix_messages_id": "(id)",
+    "ix_messages_created_at": "(created_at)",
+    "ix_messages_conversation_id": "(conversation_id)",
+    "ix_messages_member_id": "(member_id)",
+    "ix_messages_whatsapp_message_id": "(whatsapp_message_id)",
+    "idx_conv_created": "(conversation_id, created_at)",
+}
+
+
+def _month(index: int) -> datetime:
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def upgrade() -> None:
+    now = datetime.now(timezone.utc)
+    this_month = now.year * 12 + now.month - 1
+
+    already_partitioned = op.get_bind().execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('messages'))"
+    )).scalar()
+    if already_partitioned:
+        # created by create_all (MessageMeta), monthly partitions included
+        return
+
+    op.execute("ALTER TABLE messages RENAME TO messages_legacy")
+    # free the index names for the partitioned parent; the primary key
+    # becomes (id, created_at) since it has to include the partition column
+    op.execute("""
+        DO $$
+        DECLARE r record;
+        BEGIN
+            FOR r IN SELECT indexname FROM pg_indexes
+                     WHERE schemaname = current_schema() AND tablename = 'messages_legacy' LOOP
+                EXECUTE format('ALTER INDEX %I RENAME TO %I', r.indexname, left(r.indexname, 50) || '_legacy');
+            END LOOP;
+            FOR r IN SELECT conname FROM pg_constraint
+                     WHERE conrelid = 'messages_legacy'::regclass AND contype = 'p' LOOP
+                EXECUTE format('ALTER TABLE messages_legacy DROP CONSTRAINT %I', r.conname);
+            END LOOP;
+        END $$
+    """)
+    op.execute("ALTER TABLE messages_legacy ADD CONSTRAINT messages_legacy_pkey PRIMARY KEY (id, created_at)")
+
+    op.execute("""
+        CREATE TABLE messages (LIKE messages_legacy INCLUDING DEFAULTS)
+        PARTITION BY RANGE (created_at)
+    """)
+    op.execute("ALTER TABLE messages ADD CONSTRAINT messages_pkey PRIMARY KEY (id, created_at)")
+    for name, definition in FOREIGN_KEYS.items():
+        op.execute(f"ALTER TABLE messages ADD CONSTRAINT {name} {definition}")
+
+    op.execute(f"""
+        ALTER TABLE messages ATTACH PARTITION messages_legacy
+        FOR VALUES FROM (MINVALUE) TO ('{_month(this_month + 1).isoformat()}')
+    """)
+    # matching indexes on messages_legacy are attached rather than rebuilt
+    for name, columns in INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON messages {columns}")
+
+    for index in range(this_month + 1, this_month + 1 + MONTHS_AHEAD):
+        start, end = _month(index), _month(index + 1)
+        op.execute(
+            f"CREATE TABLE messages_{start.year:04d}_{start.month:02d} PARTITION OF messages "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+
+
+def downgrade() -> None:
+    op.execute("CREATE TABLE messages_unpartitioned (LIKE messages INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO messages_unpartitioned SELECT * FROM messages")
+    op.execute("DROP TABLE messages CASCADE")
+    op.execute("ALTER TABLE messages_unpartitioned RENAME TO messages")
+    op.execute("ALTER TABLE messages ADD CONSTRAINT messages_pkey PRIMARY KEY (id)")
+    for name, definition in FOREIGN_KEYS.items():
+        op.execute(f"ALTER TABLE messages ADD CONSTRAINT {name} {definition}")
+    for name, columns in INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON messages {columns}")
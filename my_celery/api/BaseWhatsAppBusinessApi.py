@@ -1,7 +1,8 @@
 from typing import Any
 
-from requests import Response
+from requests import HTTPError, Response
 from my_celery.api import http_session
+from my_celery.api.throughput_governor import throughput_governor
 from my_celery.config.settings import settings
 
 
@@ -25,7 +26,18 @@ def send_template_message(accessToken: str , phone_number_id:str,payload: dict[s
         url = f"{base_url}/{phone_number_id}/messages"
         headers = _get_headers(accessToken, content_type = "application/json")
         
+        recipient_number = payload.get("to")
+        throughput_governor.acquire(phone_number_id, recipient_number)
+        
         response : Response = client.post(url, headers=headers, json_data=payload)
-        response.raise_for_status()
+        try:
+            response.raise_for_status()
+        except HTTPError:
+            try:
+                error_body = response.json()
+            except ValueError:
+                error_body = None
+            throughput_governor.report_error(phone_number_id, recipient_number, response.status_code, error_body)
+            raise
         response_data = response.json()
         return response_data
\ No newline at end of file
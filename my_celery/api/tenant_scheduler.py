@@ -0,0 +1,100 @@
+from typing import Optional
+
+import redis
+import structlog
+
+from my_celery.config.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+# keep in sync with app/core/services/BroadcastFairScheduler.py, the API
+# counts chunks as pending when it publishes them and workers move them to
+# running here
+
+# Admit one chunk of a tenant unless it already runs its share of the
+# workers while another tenant has chunks waiting. Running chunks are leased,
+# so a worker that dies without releasing frees its slot after the lease.
+# KEYS    : pending hash, tenant running zset, weight hash
+# ARGV    : tenant, task id, lease ms, capacity, max share
+# returns : {admitted, running, limit}
+ADMIT_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now - tonumber(ARGV[3]))
+
+local capacity = tonumber(ARGV[4])
+local weight = tonumber(redis.call('HGET', KEYS[3], ARGV[1]) or '1')
+local limit = math.max(1, math.min(capacity, math.floor(capacity * tonumber(ARGV[5]) * weight)))
+local running = redis.call('ZCARD', KEYS[2])
+
+if running >= limit and redis.call('ZSCORE', KEYS[2], ARGV[2]) == false then
+    local pending = redis.call('HGETALL', KEYS[1])
+    for i = 1, #pending, 2 do
+        if pending[i] ~= ARGV[1] and tonumber(pending[i + 1]) > 0 then
+            return {0, running, limit}
+        end
+    end
+end
+
+redis.call('ZADD', KEYS[2], now, ARGV[2])
+if redis.call('HINCRBY', KEYS[1], ARGV[1], -1) < 0 then
+    redis.call('HSET', KEYS[1], ARGV[1], 0)
+end
+return {1, redis.call('ZCARD', KEYS[2]), limit}
+"""
+
+
+def _pending_key() -> str:
+    return "broadcast:{tenants}:pending"
+
+def _weight_key() -> str:
+    return "broadcast:{tenants}:weight"
+
+def _running_key(tenant: str) -> str:
+    return f"broadcast:{{tenants}}:running:{tenant}"
+
+def _delivered_key(task_id: str) -> str:
+    return f"broadcast:chunk:{task_id}:delivered"
+
+
+class TenantScheduler:
+    def __init__(self, client: Optional[redis.Redis] = None):
+        self.capacity = settings.BROADCAST_WORKER_CAPACITY
+        self.max_share = settings.BROADCAST_TENANT_MAX_SHARE
+        self.lease_ms = settings.BROADCAST_CHUNK_LEASE_SECONDS * 1000
+        self.dedupe_ttl = 24 * 60 * 60
+        self.client = client or redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB)
+        self._admit = self.client.register_script(ADMIT_LUA)
+
+    def admit(self, tenant: str, task_id: str) -> bool:
+        """Take a running slot for this chunk, False when the tenant must wait its turn."""
+        admitted, running, limit = self._admit(
+            keys=[_pending_key(), _running_key(tenant), _weight_key()],
+            args=[tenant, task_id, self.lease_ms, self.capacity, self.max_share],
+        )
+        if not admitted:
+            logger.info("broadcast_chunk_deferred", tenant=tenant, running=running, limit=limit)
+        return bool(admitted)
+
+    def first_delivery(self, task_id: str) -> bool:
+        """
+        False when this chunk message was already received: the outbox relay
+        publishes at least once, and a second copy must not send again.
+        """
+        return bool(self.client.set(_delivered_key(task_id), 1, nx=True, ex=self.dedupe_ttl))
+
+    def discard(self, tenant: str) -> None:
+        """Stop counting a chunk that will never run (a duplicate) as pending."""
+        if self.client.hincrby(_pending_key(), tenant, -1) < 0:
+            self.client.hset(_pending_key(), tenant, 0)
+
+    def release(self, tenant: str, task_id: str, requeued: bool = False) -> None:
+        """Free the chunk's slot; a requeued chunk (a retry) is pending again."""
+        pipe = self.client.pipeline(transaction=False)
+        pipe.zrem(_running_key(tenant), task_id)
+        if requeued:
+            pipe.hincrby(_pending_key(), tenant, 1)
+        pipe.execute()
+
+
+tenant_scheduler = TenantScheduler()
@@ -0,0 +1,133 @@
+import time
+from typing import Any, Optional
+
+import redis
+import structlog
+
+from my_celery.config.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+# keep in sync with app/core/services/WhatsAppThroughputGovernor.py, both
+# processes share the same Redis buckets for a phone_number_id
+THROUGHPUT_TIERS = {
+    "standard": 80,
+    "high": 1000,
+}
+
+THROUGHPUT_ERROR_CODES = {4, 80007, 130429}
+PAIR_RATE_ERROR_CODE = 131056
+
+RESERVE_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local factor = tonumber(redis.call('GET', KEYS[3]) or '1')
+local number_interval = tonumber(ARGV[1]) / factor
+local max_wait = tonumber(ARGV[2])
+
+local number_tat = math.max(tonumber(redis.call('GET', KEYS[1]) or '0'), now)
+local ready = number_tat
+if ARGV[3] == '1' then
+    ready = math.max(ready, tonumber(redis.call('GET', KEYS[2]) or '0'))
+end
+local delay = ready - now
+
+if delay > max_wait then
+    return {0, math.floor(delay)}
+end
+
+local next_number = number_tat + number_interval
+redis.call('SET', KEYS[1], tostring(next_number), 'PX', math.ceil(next_number - now) + 1000)
+return {1, math.floor(delay)}
+"""
+
+PENALIZE_LUA = """
+local factor = tonumber(redis.call('GET', KEYS[1]) or '1') * 0.5
+factor = math.max(factor, tonumber(ARGV[1]))
+redis.call('SET', KEYS[1], tostring(factor), 'PX', ARGV[2])
+return tostring(factor)
+"""
+
+PAIR_COOLDOWN_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local until_ms = now + tonumber(ARGV[1])
+redis.call('SET', KEYS[1], tostring(until_ms), 'PX', ARGV[1])
+return until_ms
+"""
+
+
+class ThroughputExceeded(Exception):
+    def __init__(self, phone_number_id: str, retry_after: int):
+        self.phone_number_id = phone_number_id
+        self.retry_after = retry_after
+        super().__init__(f"rate limit: throughput exceeded for {phone_number_id}, retry in {retry_after}s")
+
+
+def _throughput_key(phone_number_id: str) -> str:
+    return f"whatsapp:throughput:{{{phone_number_id}}}:tat"
+
+def _pair_key(phone_number_id: str, recipient_number: str) -> str:
+    return f"whatsapp:throughput:{{{phone_number_id}}}:pair:{recipient_number}"
+
+def _penalty_key(phone_number_id: str) -> str:
+    return f"whatsapp:throughput:{{{phone_number_id}}}:penalty"
+
+
+class ThroughputGovernor:
+    def __init__(self):
+        mps = THROUGHPUT_TIERS.get(settings.WHATSAPP_THROUGHPUT_TIER, THROUGHPUT_TIERS["standard"])
+        self.number_interval_ms = 1000 / (mps * settings.WHATSAPP_THROUGHPUT_HEADROOM)
+        self.pair_interval_ms = settings.WHATSAPP_PAIR_RATE_SECONDS * 1000
+        self.max_wait_ms = max(settings.WHATSAPP_THROUGHPUT_MAX_WAIT, settings.WHATSAPP_PAIR_RATE_SECONDS) * 1000
+        self.penalty_ms = 60 * 1000
+        self.min_penalty_factor = 0.125
+        self.client = redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB)
+        self._reserve = self.client.register_script(RESERVE_LUA)
+        self._penalize = self.client.register_script(PENALIZE_LUA)
+        self._pair_cooldown = self.client.register_script(PAIR_COOLDOWN_LUA)
+
+    def acquire(self, phone_number_id: str, recipient_number: Optional[str]) -> None:
+        reserved, delay_ms = self._reserve(
+            keys=[
+                _throughput_key(phone_number_id),
+                _pair_key(phone_number_id, recipient_number or "*"),
+                _penalty_key(phone_number_id),
+            ],
+            args=[self.number_interval_ms, self.max_wait_ms, 1 if recipient_number else 0],
+        )
+        if not reserved:
+            raise ThroughputExceeded(phone_number_id, max(1, -(-int(delay_ms) // 1000)))
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+    def report_error(self, phone_number_id: str, recipient_number: Optional[str],
+                     status_code: Optional[int], error_body: Any) -> None:
+        error_code = extract_error_code(error_body)
+        if error_code == PAIR_RATE_ERROR_CODE and recipient_number:
+            self._pair_cooldown(
+                keys=[_pair_key(phone_number_id, recipient_number)],
+                args=[int(self.pair_interval_ms)],
+            )
+            logger.warning("whatsapp_pair_rate_hit", phone_number_id=phone_number_id)
+        elif status_code == 429 or error_code in THROUGHPUT_ERROR_CODES:
+            factor = self._penalize(
+                keys=[_penalty_key(phone_number_id)],
+                args=[self.min_penalty_factor, self.penalty_ms],
+            )
+            logger.warning("whatsapp_throughput_backoff", phone_number_id=phone_number_id,
+                           factor=factor, error_code=error_code)
+
+
+def extract_error_code(error_body: Any) -> Optional[int]:
+    if not isinstance(error_body, dict):
+        return None
+    error = error_body.get("error", error_body)
+    code = error.get("code") if isinstance(error, dict) else None
+    try:
+        return int(code) if code is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+throughput_governor = ThroughputGovernor()
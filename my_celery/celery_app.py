@@ -17,6 +17,7 @@ celery_app.conf.update(
     task_queues=celery_config.QUEUES,
     task_default_exchange="direct",
     task_routes=celery_config.TASK_ROUTES,
+    beat_schedule=celery_config.BEAT_SCHEDULE,
     task_create_missing_queues=True,
     task_reject_on_worker_lost=True,
     task_ignore_result=True,
@@ -7,25 +7,49 @@ import msgspec
 whatsapp_exchange = Exchange("whatsapp_default_exchange", type="direct", durable=True)
 broadcast_exchange = Exchange("message_broadcast_exchange", type="direct", durable=True)
 trigger_chatbot_exchange = Exchange("trigger_chatbot_exchange", type="direct", durable=True)
+maintenance_exchange = Exchange("maintenance_exchange", type="direct", durable=True)
+
+# keep in sync with app/core/broker/BasePublisher.py, the publishers declare the same queues
+MAX_PRIORITY = 10
+PRIORITY_QUEUE_ARGUMENTS = {"x-max-priority": MAX_PRIORITY}
 
 QUEUES = [
-    Queue("whatsapp_message_queue", whatsapp_exchange, routing_key="chat_messages", durable=True, delivery_mode=2),
-    Queue("message_broadcast_queue", broadcast_exchange, routing_key="broadcast_messages", durable=True, delivery_mode=2),
+    Queue("whatsapp_message_queue", whatsapp_exchange, routing_key="chat_messages", durable=True, delivery_mode=2,
+          queue_arguments=PRIORITY_QUEUE_ARGUMENTS),
+    Queue("message_broadcast_queue", broadcast_exchange, routing_key="broadcast_messages", durable=True, delivery_mode=2,
+          queue_arguments=PRIORITY_QUEUE_ARGUMENTS),
     Queue("trigger_chatbot_queue", trigger_chatbot_exchange, routing_key="trigger_chatbot_event", durable=True, delivery_mode=2),
+    Queue("maintenance_queue", maintenance_exchange, routing_key="maintenance", durable=True, delivery_mode=2),
 ]
 
 TASK_ROUTES = {
     "my_celery.tasks.status_whatsapp_message": {"queue": "whatsapp_message_queue"},
     "my_celery.tasks.template_broadcast": {"queue": "message_broadcast_queue"},
+    "my_celery.tasks.template_broadcast_batch": {"queue": "message_broadcast_queue"},
     "my_celery.tasks.trigger_chatbot_task": {"queue": "trigger_chatbot_queue"},
+    "my_celery.tasks.archive_messages": {"queue": "maintenance_queue"},
+    "my_celery.tasks.maintain_message_partitions": {"queue": "maintenance_queue"},
 }
 
 CELERY_TASK = [
     "my_celery.tasks.status_whatsapp_message", 
     "my_celery.tasks.template_broadcast",
-    "my_celery.tasks.trigger_chatbot_task"
+    "my_celery.tasks.trigger_chatbot_task",
+    "my_celery.tasks.archive_messages",
+    "my_celery.tasks.message_partitions",
     ]
 
+BEAT_SCHEDULE = {
+    "archive-messages": {
+        "task": "my_celery.tasks.archive_messages",
+        "schedule": 60 * 60,
+    },
+    "maintain-message-partitions": {
+        "task": "my_celery.tasks.maintain_message_partitions",
+        "schedule": 24 * 60 * 60,
+    },
+}
+
 def msgpack_dumps(obj):
     return msgspec.msgpack.encode(obj)
 
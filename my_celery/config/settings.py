@@ -31,6 +31,17 @@ class Settings(BaseSettings):
     # WhatsApp API
     WHATSAPP_API_VERSION: str
     WHATSAPP_WEBHOOK_VERIFY_TOKEN: str
+    WHATSAPP_THROUGHPUT_TIER: str = "standard"
+    WHATSAPP_THROUGHPUT_HEADROOM: float = 0.9
+    WHATSAPP_PAIR_RATE_SECONDS: float = 6
+    WHATSAPP_THROUGHPUT_MAX_WAIT: float = 6
+    # broadcast worker processes, and the share of them one tenant may hold while others wait
+    BROADCAST_WORKER_CAPACITY: int = 8
+    BROADCAST_TENANT_MAX_SHARE: float = 0.5
+    # delay before a chunk refused by the tenant scheduler is tried again
+    BROADCAST_DEFER_SECONDS: float = 5
+    # a running chunk not released after this long is assumed lost with its worker
+    BROADCAST_CHUNK_LEASE_SECONDS: int = 900
     
     SESSION_SECRET_KEY: str
 
@@ -41,12 +52,35 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
     POSTGRES_DATABASE_URL_CELERY: str
+    SQL_SLOW_QUERY_MS: float = 500
+    # connections all processes of this worker container together may hold;
+    # 0 keeps 20 + 40 per process. Set per container (docker-compose.yml),
+    # every worker container and the API each get their own budget
+    POSTGRES_CELERY_CONNECTION_BUDGET: int = 0
+    # the worker's --autoscale maximum (or --concurrency)
+    CELERY_WORKER_PROCESSES: int = 10
 
     # Mongo DB
     MONGO_USER: str
     MONGO_PASSWORD: str
     MONGO_DB: str
     MONGO_URI: str
+    # opt-in; when enabled, MONGO_WRITE_BEHIND_SPILL_DIR must be on a durable
+    # volume, every worker process spills to its own file there
+    MONGO_WRITE_BEHIND_ENABLED: bool = False
+    MONGO_WRITE_BEHIND_BATCH_SIZE: int = 500
+    MONGO_WRITE_BEHIND_FLUSH_INTERVAL: float = 0.05
+    MONGO_WRITE_BEHIND_SPILL_DIR: str = ""
+    # "document" (one document per message) or "bucket" (per-conversation buckets)
+    MESSAGE_STORAGE_MODE: str = "document"
+    MESSAGE_BUCKET_SIZE: int = 100
+    MESSAGE_ARCHIVE_AFTER_DAYS: int = 180
+    MESSAGE_ARCHIVE_BATCH_SIZE: int = 1000
+    MESSAGE_PARTITION_MONTHS_AHEAD: int = 3
+    # 0 keeps every monthly partition attached
+    MESSAGE_PARTITION_RETENTION_MONTHS: int = 0
+    # status webhooks first look for their message this far back, then everywhere
+    MESSAGE_STATUS_LOOKBACK_DAYS: int = 31
     
     # RabbitMQ
     RABBITMQ_HOST: str
@@ -0,0 +1,95 @@
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Union
+
+from odmantic import SyncEngine
+from pydantic import BaseModel
+from pymongo import ReturnDocument
+
+from my_celery.database.MongoCRUD import MongoCRUD
+from my_celery.models.Message import Message
+
+# keep in sync with app/whatsapp/team_inbox/repositories/MessageBucketRepository.py
+BUCKETS_COLLECTION = "message_buckets"
+LOOKUP_COLLECTION = "message_bucket_lookup"
+
+
+class MessageBucketCRUD(MongoCRUD[Message]):
+    def __init__(self, engine: SyncEngine, bucket_size: int = 100):
+        super().__init__(Message, engine)
+        self.bucket_size = bucket_size
+        database = engine.get_collection(Message).database
+        self.buckets = database[BUCKETS_COLLECTION]
+        self.lookup = database[LOOKUP_COLLECTION]
+
+    def create(self, data: Union[Message, Dict[str, Any]]) -> Message:
+        instance = self.model(**data) if isinstance(data, dict) else data
+        doc = instance.model_dump_doc()
+        created_at = doc.get("created_at") or datetime.now(timezone.utc)
+        bucket = self.buckets.find_one_and_update(
+            {
+                "conversation_id": doc["conversation_id"],
+                "day": created_at.strftime("%Y-%m-%d"),
+                "count": {"$lt": self.bucket_size},
+            },
+            {
+                "$push": {"messages": doc},
+                "$inc": {"count": 1},
+                "$min": {"start_at": created_at},
+                "$max": {"end_at": created_at},
+            },
+            upsert=True,
+            projection={"_id": 1},
+            return_document=ReturnDocument.AFTER,
+        )
+        self.lookup.insert_one({
+            "_id": doc["_id"],
+            "wa_message_id": doc.get("wa_message_id") or None,
+            "bucket_id": bucket["_id"],
+            "conversation_id": doc["conversation_id"],
+        })
+        return instance
+
+    def create_deferred(self, data: Message) -> Future:
+        self.create(data)
+        future: Future = Future()
+        future.set_result(data.id)
+        return future
+
+    def get_by_id(self, id: Any) -> Optional[Message]:
+        entry = self.lookup.find_one({"_id": id})
+        if entry is None:
+            return None
+        bucket = self.buckets.find_one(
+            {"_id": entry["bucket_id"]},
+            {"messages": {"$elemMatch": {"_id": entry["_id"]}}},
+        )
+        messages = (bucket or {}).get("messages") or []
+        return self.model.model_validate_doc(messages[0]) if messages else None
+
+    def update(
+        self,
+        id: Any,
+        data: Union[Dict[str, Any], BaseModel],
+        partial: bool = True,
+        projection: Optional[Dict[str, Any]] = None,
+        upsert: bool = False,
+    ) -> Optional[Union[Message, Dict[str, Any]]]:
+        entry = self.lookup.find_one({"_id": id})
+        if entry is None:
+            return None
+
+        updates = data.model_dump(exclude_unset=partial) if isinstance(data, BaseModel) else dict(data)
+        updates.pop("id", None)
+        updates["updated_at"] = datetime.now(timezone.utc)
+        result = self.buckets.update_one(
+            {"_id": entry["bucket_id"], "messages._id": entry["_id"]},
+            {"$set": {f"messages.$.{field}": value for field, value in updates.items()}},
+        )
+        if not result.matched_count:
+            return None
+        if "wa_message_id" in updates:
+            self.lookup.update_one({"_id": entry["_id"]}, {"$set": {"wa_message_id": updates["wa_message_id"]}})
+        if projection is not None:
+            return {"_id": entry["_id"]}
+        return self.get_by_id(id)
@@ -1,15 +1,44 @@
+from concurrent.futures import Future
+from dataclasses import dataclass
 from typing import TypeVar, Generic, Type, List, Optional, Dict, Any, Union
 from datetime import datetime, timezone
 from pydantic import BaseModel
 from odmantic import Model, SyncEngine
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReturnDocument, UpdateMany, UpdateOne
+from pymongo.results import BulkWriteResult
 from celery.utils.log import get_task_logger
+from my_celery.database.MongoWriteBehind import MongoWriteBehind
 T = TypeVar("T", bound=Model)
 logger = get_task_logger(__name__)
 
+
+@dataclass
+class InsertOperation:
+    document: Union[Model, Dict[str, Any]]
+
+
+@dataclass
+class UpdateOperation:
+    filter: Dict[str, Any]
+    update: Dict[str, Any]
+    upsert: bool = False
+    many: bool = False
+
+
+@dataclass
+class DeleteOperation:
+    filter: Dict[str, Any]
+    many: bool = False
+
+
+BulkOperation = Union[InsertOperation, UpdateOperation, DeleteOperation]
+
+
 class MongoCRUD(Generic[T]):
-    def __init__(self, model: Type[T], engine: SyncEngine):
+    def __init__(self, model: Type[T], engine: SyncEngine, write_behind: Optional[MongoWriteBehind] = None):
         self.model = model
         self.engine = engine
+        self.write_behind = write_behind
 
     def create(self, data: Union[T, Dict[str, Any]]) -> T:
 
@@ -20,6 +49,20 @@ class MongoCRUD(Generic[T]):
         self.engine.save(instance)
         return instance
 
+    def create_deferred(self, data: T) -> Future:
+        if self.write_behind is None:
+            self.create(data)
+            future: Future = Future()
+            future.set_result(data.id)
+            return future
+        future = self.write_behind.submit(data.model_dump_doc())
+        future.add_done_callback(lambda done: self._report_deferred(data.id, done))
+        return future
+
+    def _report_deferred(self, id: Any, future: Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("write_behind_document_failed id=%s error=%s", id, future.exception())
+
     def get_by_id(self, id: Any) -> Optional[T]:
         return self.engine.find_one(self.model, self.model.id == id)
 
@@ -43,36 +86,36 @@ class MongoCRUD(Generic[T]):
         self,
         id: Any,
         data: Union[Dict[str, Any], BaseModel],
-        partial: bool = True
-    ) -> Optional[T]:
+        partial: bool = True,
+        projection: Optional[Dict[str, Any]] = None,
+        upsert: bool = False,
+    ) -> Optional[Union[T, Dict[str, Any]]]:
         try:
-            instance = self.get_by_id(id)
-            if not instance:
-                return None
-    
             if isinstance(data, BaseModel):
-                updates = data.model_dump(exclude_unset=True)
+                updates = data.model_dump(exclude_unset=partial)
             else:
-                updates = data
+                updates = dict(data)
     
             updates["updated_at"] = datetime.now(timezone.utc)
             updates.pop("id", None)
     
-            for k, v in updates.items():
-                setattr(instance, k, v)
-    
-            self.engine.save(instance)
-            return instance
+            raw = self.engine.get_collection(self.model).find_one_and_update(
+                {"_id": id},
+                {"$set": updates},
+                projection=projection,
+                upsert=upsert,
+                return_document=ReturnDocument.AFTER,
+            )
+            if raw is None or projection is not None:
+                return raw
+            return self.model.model_validate_doc(raw)
         except Exception as e:
             logger.error("mongo_update_failed", error=str(e))
             raise
     
     def delete(self, id: Any) -> bool:
-        instance = self.get_by_id(id)
-        if not instance:
-            return False
-        self.engine.delete(instance)
-        return True
+        result = self.engine.get_collection(self.model).delete_one({"_id": id})
+        return result.deleted_count > 0
 
     def bulk_create(self, items: List[Dict[str, Any]]) -> List[T]:
         instances: List[T] = []
@@ -118,10 +161,24 @@ class MongoCRUD(Generic[T]):
         )
 
     def soft_delete(self, id: Any, field_name: str = "is_active"):
-        instance = self.get_by_id(id)
-        if not instance:
+        return self.update(id, {field_name: False})
+
+    def bulk_write(self, operations: List[BulkOperation], ordered: bool = False) -> Optional[BulkWriteResult]:
+        if not operations:
             return None
 
-        setattr(instance, field_name, False)
-        self.engine.save(instance)
-        return instance
+        requests = []
+        for op in operations:
+            if isinstance(op, InsertOperation):
+                document = op.document if isinstance(op.document, Model) else self.model(**op.document)
+                requests.append(InsertOne(document.model_dump_doc()))
+            elif isinstance(op, UpdateOperation):
+                update_cls = UpdateMany if op.many else UpdateOne
+                requests.append(update_cls(op.filter, op.update, upsert=op.upsert))
+            elif isinstance(op, DeleteOperation):
+                delete_cls = DeleteMany if op.many else DeleteOne
+                requests.append(delete_cls(op.filter))
+            else:
+                raise TypeError(f"Unsupported bulk operation: {type(op).__name__}")
+
+        return self.engine.get_collection(self.model).bulk_write(requests, ordered=ordered)
@@ -0,0 +1,206 @@
+import fcntl
+import glob
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import bson
+from bson.binary import UuidRepresentation
+from bson.codec_options import CodecOptions
+import structlog
+from celery.utils.log import get_task_logger
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError, ConnectionFailure, OperationFailure, WriteConcernError
+
+logger = structlog.wrap_logger(get_task_logger(__name__))
+
+# keep in sync with app/core/repository/MongoWriteBehind.py
+DUPLICATE_KEY = 11000
+SPILL_CODEC_OPTIONS = CodecOptions(uuid_representation=UuidRepresentation.STANDARD)
+
+Pending = Tuple[Dict[str, Any], Future]
+
+
+class MongoWriteBehind:
+    def __init__(
+        self,
+        collection: Collection,
+        enabled: bool = True,
+        max_batch_size: int = 500,
+        flush_interval: float = 0.05,
+        max_retries: int = 3,
+        spill_dir: Optional[str] = None,
+    ):
+        if enabled and not spill_dir:
+            raise ValueError("write-behind needs a spill directory on a durable volume")
+        self.collection = collection
+        self.enabled = enabled
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.spill_dir = spill_dir
+        self._pending: List[Pending] = []
+        self._requeued: Set[Any] = set()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._closing = False
+
+    def start(self) -> None:
+        if not self.enabled or self._thread is not None:
+            return
+        self._replay_spill()
+        self._thread = threading.Thread(target=self._run, name="mongo-write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, document: Dict[str, Any]) -> Future:
+        future: Future = Future()
+        if not self.enabled or self._thread is None or self._closing:
+            self._write([(document, future)])
+            future.result()
+            return future
+
+        with self._lock:
+            self._pending.append((document, future))
+            full = len(self._pending) >= self.max_batch_size
+        if full:
+            self._wakeup.set()
+        return future
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = self._pending[:self.max_batch_size]
+                    del self._pending[:self.max_batch_size]
+                if not batch:
+                    return
+                try:
+                    self._write(batch)
+                except ConnectionFailure:
+                    with self._lock:
+                        self._pending[:0] = batch
+                        self._requeued.update(doc.get("_id") for doc, _ in batch)
+                    raise
+                except Exception as e:
+                    # rejected as a whole: writing it again would fail the same way
+                    with self._lock:
+                        self._requeued.difference_update(doc.get("_id") for doc, _ in batch)
+                    logger.error("write_behind_batch_failed", batch=len(batch), error=str(e))
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+
+    def close(self) -> None:
+        self._closing = True
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        try:
+            self.flush()
+        except ConnectionFailure:
+            pass
+        finally:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                self._requeued.clear()
+            if pending:
+                self._spill([doc for doc, _ in pending])
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(ConnectionFailure("write-behind closed before flush, document spilled"))
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(timeout=self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("write_behind_flush_failed", error=str(e))
+
+    def _write(self, batch: List[Pending]) -> None:
+        documents = [doc for doc, _ in batch]
+        failed: Dict[int, Exception] = {}
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.collection.insert_many(documents, ordered=False)
+                break
+            except BulkWriteError as e:
+                for error in e.details.get("writeErrors", []):
+                    # on a retry, a duplicate is the part of the batch that made it last time
+                    retried = attempt or documents[error["index"]].get("_id") in self._requeued
+                    if retried and error.get("code") == DUPLICATE_KEY:
+                        continue
+                    failed[error["index"]] = OperationFailure(error.get("errmsg"), error.get("code"))
+                concern_errors = e.details.get("writeConcernErrors")
+                if concern_errors:
+                    # written on the primary but not acknowledged as durable
+                    concern = WriteConcernError(concern_errors[0].get("errmsg"), concern_errors[0].get("code"))
+                    for index in range(len(documents)):
+                        failed.setdefault(index, concern)
+                break
+            except ConnectionFailure:
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(min(2 ** attempt * 0.1, 2))
+
+        with self._lock:
+            self._requeued.difference_update(doc.get("_id") for doc in documents)
+        if failed:
+            logger.error("write_behind_insert_failed", failed=len(failed), batch=len(batch))
+        for index, (doc, future) in enumerate(batch):
+            if future.done():
+                continue
+            if index in failed:
+                future.set_exception(failed[index])
+            else:
+                future.set_result(doc.get("_id"))
+
+    def _spill_file(self) -> str:
+        return os.path.join(self.spill_dir, f"{self.collection.name}-{os.getpid()}.bson")
+
+    def _spill(self, documents: List[Dict[str, Any]]) -> None:
+        if not self.spill_dir:
+            logger.error("write_behind_documents_dropped", documents=len(documents))
+            return
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = self._spill_file()
+        with open(path, "ab") as spill:
+            fcntl.flock(spill, fcntl.LOCK_EX)
+            for doc in documents:
+                spill.write(bson.encode(doc, codec_options=SPILL_CODEC_OPTIONS))
+            spill.flush()
+            os.fsync(spill.fileno())
+        logger.warning("write_behind_spilled", documents=len(documents), path=path)
+
+    def _replay_spill(self) -> None:
+        if not self.spill_dir:
+            return
+        for path in sorted(glob.glob(os.path.join(self.spill_dir, f"{self.collection.name}-*.bson"))):
+            with open(path, "rb") as spill:
+                try:
+                    fcntl.flock(spill, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    # another worker process is writing or replaying it
+                    continue
+                # UUIDs come back as Binary subtype 4, exactly as they were encoded
+                documents = bson.decode_all(spill.read())
+                if documents:
+                    try:
+                        self.collection.insert_many(documents, ordered=False)
+                    except BulkWriteError as e:
+                        if any(err.get("code") != DUPLICATE_KEY for err in e.details.get("writeErrors", [])):
+                            raise
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    # replayed by another worker process just before us
+                    pass
+            logger.info("write_behind_spill_replayed", documents=len(documents), path=path)
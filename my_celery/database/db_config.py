@@ -3,17 +3,28 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from my_celery.config.settings import settings
+from my_celery.database.connection_budget import MeteredQueuePool, pool_budget
+from my_celery.database.query_stats import instrument_engine
+
+# every prefork child opens its own pool: size them from the budget so that
+# the busiest autoscale setting still fits
+if settings.POSTGRES_CELERY_CONNECTION_BUDGET:
+    pool_size, max_overflow = pool_budget(settings.POSTGRES_CELERY_CONNECTION_BUDGET, settings.CELERY_WORKER_PROCESSES)
+else:
+    pool_size, max_overflow = 20, 40
 
 psql_engine = create_engine(
     settings.POSTGRES_DATABASE_URL_CELERY,
     echo=False,
+    poolclass=MeteredQueuePool,
     pool_pre_ping=True,    
-    pool_size=20,          
-    max_overflow=40,       
+    pool_size=pool_size,
+    max_overflow=max_overflow,
     pool_timeout=10,      
     pool_recycle=3600,     
     pool_use_lifo=True     
 )
+instrument_engine(psql_engine, settings.SQL_SLOW_QUERY_MS)
 SessionLocal = sessionmaker(bind=psql_engine)
 
 @contextmanager
@@ -26,4 +37,4 @@ def get_db():
         db.rollback()
         raise
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
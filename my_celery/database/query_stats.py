@@ -0,0 +1,153 @@
+# keep in sync with app/core/storage/query_stats.py
+import hashlib
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = structlog.get_logger(__name__)
+
+# statements of the current task (or API request); None outside a scope
+query_stats_ctx: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+DEFAULT_SLOW_QUERY_MS = 200.0
+# slow statements kept per scope, the log line already has every one of them
+MAX_SLOW_QUERIES = 10
+# execution context attribute holding the statement start time
+_STARTED_AT = "_query_started_at"
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<![:\w]):\w+|\?")
+_NUMBER = re.compile(r"(?<![\w.])\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_ROWS = re.compile(r"(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class NPlusOneQueryError(AssertionError):
+    """The same statement ran more often in one scope than the scope allows."""
+
+
+def fingerprint(statement: str) -> str:
+    """
+    ``statement`` with literals and bind parameters replaced by ``?`` and
+    IN lists / multi-row VALUES collapsed, so every execution of the same
+    query shape maps to the same string whatever its arguments.
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (?)", normalized)
+    normalized = _VALUES_ROWS.sub(r"\1", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def fingerprint_id(fingerprint_: str) -> str:
+    return hashlib.sha1(fingerprint_.encode()).hexdigest()[:12]
+
+
+class QueryStats:
+    """Counters for the statements executed inside one ``query_scope``."""
+
+    def __init__(self, max_repeats: Optional[int] = None) -> None:
+        self.max_repeats = max_repeats
+        self.count = 0
+        self.duration_ms = 0.0
+        self.fingerprints: Counter = Counter()
+        self.slow: List[Dict[str, Any]] = []
+        self.checkouts = 0
+        self.pool_wait_ms = 0.0
+
+    def record(self, fingerprint_: str, duration_ms: float, slow: bool) -> None:
+        self.count += 1
+        self.duration_ms += duration_ms
+        self.fingerprints[fingerprint_] += 1
+        if slow and len(self.slow) < MAX_SLOW_QUERIES:
+            self.slow.append({"fingerprint": fingerprint_, "duration_ms": round(duration_ms, 1)})
+
+    def record_checkout(self, wait_ms: float) -> None:
+        self.checkouts += 1
+        self.pool_wait_ms += wait_ms
+
+    def repeated(self, more_than: int = 1) -> Dict[str, int]:
+        return {fp: n for fp, n in self.fingerprints.most_common() if n > more_than}
+
+    def summary(self) -> Dict[str, Any]:
+        """Fields for the request/task log context."""
+        return {
+            "db_queries": self.count,
+            "db_time_ms": round(self.duration_ms, 1),
+            "db_distinct_queries": len(self.fingerprints),
+            "db_repeated_queries": {fingerprint_id(fp): n for fp, n in list(self.repeated().items())[:5]},
+            "db_slow_queries": self.slow,
+            "db_checkouts": self.checkouts,
+            "db_pool_wait_ms": round(self.pool_wait_ms, 1),
+        }
+
+    def check_n_plus_one(self) -> None:
+        if not self.max_repeats:
+            return
+        offenders = self.repeated(self.max_repeats)
+        if offenders:
+            details = "\n".join(f"  {n}x {fp}" for fp, n in offenders.items())
+            raise NPlusOneQueryError(
+                f"statements ran more than {self.max_repeats} times in one scope (N+1?):\n{details}"
+            )
+
+
+@contextmanager
+def query_scope(max_repeats: Optional[int] = None) -> Iterator[QueryStats]:
+    """
+    Collect the statements run by every instrumented engine until exit.
+    With ``max_repeats`` the scope raises NPlusOneQueryError on exit when a
+    single fingerprint ran more often than that.
+    """
+    stats = QueryStats(max_repeats)
+    token = query_stats_ctx.set(stats)
+    try:
+        yield stats
+    finally:
+        query_stats_ctx.reset(token)
+    stats.check_n_plus_one()
+
+
+def instrument_engine(engine: Union[Engine, AsyncEngine], slow_query_ms: float = DEFAULT_SLOW_QUERY_MS) -> None:
+    """
+    Time every statement on ``engine``: it is counted in the current
+    query_scope, if any, and logged as ``slow_query`` past ``slow_query_ms``.
+    """
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            setattr(context, _STARTED_AT, time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started_at = getattr(context, _STARTED_AT, None)
+        if started_at is None:
+            return
+        duration_ms = (time.perf_counter() - started_at) * 1000
+        stats = query_stats_ctx.get()
+        slow = duration_ms >= slow_query_ms
+        if stats is None and not slow:
+            return
+        fingerprint_ = fingerprint(statement)
+        if stats is not None:
+            stats.record(fingerprint_, duration_ms, slow)
+        if slow:
+            logger.warning(
+                "slow_query",
+                duration_ms=round(duration_ms, 1),
+                fingerprint=fingerprint_,
+                fingerprint_id=fingerprint_id(fingerprint_),
+                executemany=executemany,
+            )
@@ -2,6 +2,9 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 from odmantic import  Field, Model
+from pydantic import model_validator
+
+from my_celery.utils.message_search import build_search_text
 
 class Message(Model):
     id: UUID = Field(primary_field=True)
@@ -12,10 +15,19 @@ class Message(Model):
     content: Optional[dict] = None
     is_from_contact: Optional[bool] = None
     member_id:  Optional[UUID] = None
+    search_text: Optional[str] = None
 
     created_at: datetime
     updated_at: datetime
 
+    # odmantic does not allow attribute assignment inside an "after" validator
+    @model_validator(mode="before")
+    @classmethod
+    def set_search_text(cls, data):
+        if isinstance(data, dict) and data.get("search_text") is None:
+            data = {**data, "search_text": build_search_text(data.get("content"))}
+        return data
+
     model_config = {
         "collection": "messages"
     }
\ No newline at end of file
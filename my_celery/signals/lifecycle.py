@@ -3,13 +3,16 @@ from celery.signals import (
     worker_ready, 
     setup_logging, 
     worker_process_init,
+    worker_process_shutdown,
     worker_shutdown
 )
 from odmantic import SyncEngine
 from pymongo import MongoClient
 from my_celery.config.settings import settings
 from my_celery.config.celery_config import task_log
+from my_celery.database.MessageBucketCRUD import MessageBucketCRUD
 from my_celery.database.MongoCRUD import MongoCRUD
+from my_celery.database.MongoWriteBehind import MongoWriteBehind
 from my_celery.models.ChatBot import ChatBot
 from my_celery.models.Message import Message
 from my_celery.database.db_config import psql_engine
@@ -18,16 +21,28 @@ mongo_client: Optional[MongoClient] = None
 mongo_engine: Optional[SyncEngine] = None
 message_crud: Optional[MongoCRUD] = None
 chatbot_crud: Optional[MongoCRUD] = None
+message_write_behind: Optional[MongoWriteBehind] = None
 
 def initialize_mongo_resources():
-    global mongo_client, mongo_engine, message_crud, chatbot_crud
+    global mongo_client, mongo_engine, message_crud, chatbot_crud, message_write_behind
     mongo_client = MongoClient(
         settings.MONGO_URI,
         uuidRepresentation="standard",
         connect=False,
     )
     mongo_engine = SyncEngine(client=mongo_client, database=settings.MONGO_DB)
-    message_crud = MongoCRUD(Message, mongo_engine)
+    message_write_behind = MongoWriteBehind(
+        mongo_engine.get_collection(Message),
+        enabled=settings.MONGO_WRITE_BEHIND_ENABLED,
+        max_batch_size=settings.MONGO_WRITE_BEHIND_BATCH_SIZE,
+        flush_interval=settings.MONGO_WRITE_BEHIND_FLUSH_INTERVAL,
+        spill_dir=settings.MONGO_WRITE_BEHIND_SPILL_DIR,
+    )
+    message_write_behind.start()
+    if settings.MESSAGE_STORAGE_MODE == "bucket":
+        message_crud = MessageBucketCRUD(mongo_engine, bucket_size=settings.MESSAGE_BUCKET_SIZE)
+    else:
+        message_crud = MongoCRUD(Message, mongo_engine, write_behind=message_write_behind)
     chatbot_crud = MongoCRUD(ChatBot, mongo_engine)
 
         
@@ -52,6 +67,15 @@ def init_worker_process(**kwargs):
         task_log.error(f"Failed to initialize worker resources: {e}")
         raise
 
+@worker_process_shutdown.connect
+def shutdown_worker_process(**_kwargs):
+    try:
+        if message_write_behind:
+            message_write_behind.close()
+            task_log.info("Message write-behind flushed")
+    except Exception as e:
+        task_log.warning("Error flushing message write-behind", error=str(e))
+
 @worker_shutdown.connect
 def shutdown_worker(**_kwargs):
     task_log.info("Shutting down worker resources...")
@@ -0,0 +1,111 @@
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, List, Set
+
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import BulkWriteError
+
+from my_celery.celery_app import celery_app
+from my_celery.config.settings import settings
+from my_celery.database.MessageBucketCRUD import MessageBucketCRUD
+from my_celery.models.Message import Message
+from my_celery.signals.lifecycle import get_message_crud
+from my_celery.tasks.base_task import BaseTask
+from my_celery.utils.DateTimeHelper import DateTimeHelper
+from my_celery.utils.message_archive import archive_collection_name
+
+DUPLICATE_KEY = 11000
+
+_indexed_archives: Set[str] = set()
+
+
+def _ensure_archive_indexes(archive) -> None:
+    if archive.name in _indexed_archives:
+        return
+    archive.create_index(
+        [("conversation_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]
+    )
+    archive.create_index("wa_message_id")
+    _indexed_archives.add(archive.name)
+
+
+def _copy_to_archives(database, docs: List[dict]) -> None:
+    by_month: Dict[str, List[dict]] = defaultdict(list)
+    for doc in docs:
+        by_month[archive_collection_name(doc["created_at"])].append(doc)
+
+    for name, month_docs in by_month.items():
+        archive = database[name]
+        _ensure_archive_indexes(archive)
+        try:
+            archive.insert_many(month_docs, ordered=False)
+        except BulkWriteError as e:
+            if any(err.get("code") != DUPLICATE_KEY for err in e.details.get("writeErrors", [])):
+                raise
+
+
+def _archive_documents(hot, cutoff, max_batches: int) -> int:
+    moved = 0
+    for _ in range(max_batches):
+        batch = list(
+            hot.find({"created_at": {"$lt": cutoff}})
+            .sort("created_at", ASCENDING)
+            .limit(settings.MESSAGE_ARCHIVE_BATCH_SIZE)
+        )
+        if not batch:
+            break
+
+        _copy_to_archives(hot.database, batch)
+        hot.delete_many({"_id": {"$in": [doc["_id"] for doc in batch]}})
+        moved += len(batch)
+    return moved
+
+
+def _archive_buckets(crud: MessageBucketCRUD, cutoff, max_batches: int) -> int:
+    """Bucket storage: move whole buckets whose newest message is older than ``cutoff``."""
+    buckets_per_batch = max(1, settings.MESSAGE_ARCHIVE_BATCH_SIZE // crud.bucket_size)
+    moved = 0
+    for _ in range(max_batches):
+        buckets = list(
+            crud.buckets.find({"end_at": {"$lt": cutoff}})
+            .sort("end_at", ASCENDING)
+            .limit(buckets_per_batch)
+        )
+        if not buckets:
+            break
+
+        _copy_to_archives(crud.buckets.database, [m for bucket in buckets for m in bucket.get("messages", [])])
+
+        for bucket in buckets:
+            # a message pushed since the copy keeps the bucket until the next pass
+            if crud.buckets.delete_one({"_id": bucket["_id"], "count": bucket["count"]}).deleted_count:
+                crud.lookup.delete_many({"bucket_id": bucket["_id"]})
+                moved += len(bucket.get("messages", []))
+    return moved
+
+
+@celery_app.task(
+    name="my_celery.tasks.archive_messages",
+    bind=True,
+    base=BaseTask,
+    max_retries=0,
+)
+def archive_messages(self, max_batches: int = 50):
+    """
+    Move messages older than MESSAGE_ARCHIVE_AFTER_DAYS out of the hot
+    ``messages`` collection into ``messages_archive_yyyy_mm``.
+
+    Each batch is copied before it is deleted, and duplicate keys on the copy
+    are ignored, so a batch interrupted half way is simply redone next run.
+    With MESSAGE_STORAGE_MODE=bucket the messages come out of
+    ``message_buckets`` instead and are archived one message per document.
+    """
+    crud = get_message_crud()
+    cutoff = DateTimeHelper.now_utc() - timedelta(days=settings.MESSAGE_ARCHIVE_AFTER_DAYS)
+    if isinstance(crud, MessageBucketCRUD):
+        moved = _archive_buckets(crud, cutoff, max_batches)
+    else:
+        moved = _archive_documents(crud.engine.get_collection(Message), cutoff, max_batches)
+
+    self.logger.info("messages_archived", moved=moved, cutoff=cutoff.isoformat())
+    return {"moved": moved}
@@ -8,9 +8,15 @@ from celery import Task
 import structlog
 from typing import Any, Callable
 from celery.exceptions import MaxRetriesExceededError, Retry
+from my_celery.api.throughput_governor import ThroughputExceeded
+from my_celery.database.query_stats import query_scope
 
 RETRY_COUNTDOWN = 60  
 MAX_RETRIES = 5
+# throttling has its own budget, carried in a message header, so waiting
+# for a WhatsApp send slot never uses up the task's max_retries
+THROTTLE_MAX_RETRIES = 100
+THROTTLE_RETRIES_HEADER = "throttle_retries"
 
 class BaseTask(Task):
     abstract = True
@@ -24,24 +30,26 @@ class BaseTask(Task):
         )
         self.logger.info("task_started", args=args, kwargs=kwargs)
 
-        try:
-            result = super().__call__(*args, **kwargs)
-
-            duration = (DateTimeHelper.now_utc() - self.start_time).total_seconds()
-            self.logger.info("task_completed", duration=duration)
-            return result
-
-        except Retry:
-            raise
-        except Exception as exc:
-            duration = (DateTimeHelper.now_utc() - self.start_time).total_seconds()
-            self.logger.error(
-                "task_failed",
-                error=str(exc),
-                duration=duration,
-                traceback=traceback.format_exc(),
-            )
-            raise
+        with query_scope() as queries:
+            try:
+                result = super().__call__(*args, **kwargs)
+
+                duration = (DateTimeHelper.now_utc() - self.start_time).total_seconds()
+                self.logger.info("task_completed", duration=duration, **queries.summary())
+                return result
+
+            except Retry:
+                raise
+            except Exception as exc:
+                duration = (DateTimeHelper.now_utc() - self.start_time).total_seconds()
+                self.logger.error(
+                    "task_failed",
+                    error=str(exc),
+                    duration=duration,
+                    traceback=traceback.format_exc(),
+                    **queries.summary(),
+                )
+                raise
 
     def on_failure(self, exc, task_id, args, kwargs, einfo):
         self.logger = structlog.get_logger().bind(task=self.name, task_id=task_id)
@@ -73,6 +81,9 @@ class BaseTask(Task):
     def retry_task(self, exc=None, countdown=None, **kwargs):
         self.logger = structlog.get_logger().bind(task=self.name, task_id=self.request.id)
         try:
+            if isinstance(exc, ThroughputExceeded):
+                return self._throttle_retry(exc, **kwargs)
+
             if exc and "rate limit" in str(exc).lower():
                 retry_countdown = self.default_retry_delay * (2 ** self.request.retries)
                 retry_countdown += uniform(0, retry_countdown)  # jitter
@@ -90,6 +101,31 @@ class BaseTask(Task):
             )
             raise exc 
 
+    @property
+    def throttle_retries(self) -> int:
+        """How many times this message was published again for throttling."""
+        request = self.request
+        return int((request.headers or {}).get(THROTTLE_RETRIES_HEADER) or request.get(THROTTLE_RETRIES_HEADER) or 0)
+
+    def _throttle_retry(self, exc: ThroughputExceeded, args=None, kwargs=None):
+        """Publish the task again after the governor's retry_after, keeping request.retries unchanged."""
+        request = self.request
+        throttled = self.throttle_retries
+        if request.called_directly or throttled >= THROTTLE_MAX_RETRIES:
+            self.logger.critical("throttle_retries_exceeded", error=str(exc), throttle_retries=throttled)
+            raise exc
+
+        retry_countdown = int(exc.retry_after + uniform(0, exc.retry_after))
+        self.logger.info("throughput_governor_backoff", retry_countdown=retry_countdown, throttle_retries=throttled + 1)
+        signature = self.signature_from_request(
+            request, args, kwargs,
+            countdown=retry_countdown,
+            retries=request.retries,
+            headers={**(request.headers or {}), THROTTLE_RETRIES_HEADER: throttled + 1},
+        )
+        signature.apply_async()
+        raise Retry(exc=exc, when=retry_countdown, sig=signature)
+
     def run_async(self, coro_func):
         return asyncio.run(coro_func)
 
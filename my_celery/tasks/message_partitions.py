@@ -0,0 +1,73 @@
+from sqlalchemy import text
+
+from my_celery.celery_app import celery_app
+from my_celery.config.settings import settings
+from my_celery.database.db_config import psql_engine
+from my_celery.tasks.base_task import BaseTask
+from my_celery.utils.DateTimeHelper import DateTimeHelper
+from my_celery.utils.message_partitions import (
+    ARCHIVE_SCHEMA,
+    LEGACY_PARTITION,
+    MESSAGES_TABLE,
+    create_partition_sql,
+    expired_partitions,
+    partition_name,
+    range_upper_bound,
+    upcoming_months,
+)
+
+ATTACHED_PARTITIONS = text("""
+    SELECT child.relname
+    FROM pg_inherits
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE parent.relname = :table
+""")
+
+PARTITION_BOUND = text("""
+    SELECT pg_get_expr(child.relpartbound, child.oid)
+    FROM pg_inherits
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE parent.relname = :table AND child.relname = :partition
+""")
+
+
+@celery_app.task(
+    name="my_celery.tasks.maintain_message_partitions",
+    bind=True,
+    base=BaseTask,
+    max_retries=0,
+)
+def maintain_message_partitions(self):
+    """
+    Keep the monthly partitions of ``messages`` ahead of the clock and move
+    expired ones out of it.
+
+    Partitions for the current month and the next
+    MESSAGE_PARTITION_MONTHS_AHEAD are created if missing, except for months
+    still covered by ``messages_legacy``. With
+    MESSAGE_PARTITION_RETENTION_MONTHS set, older monthly partitions are
+    detached (CONCURRENTLY, so inserts are not blocked) and moved to the
+    ``messages_archive`` schema, where they can be dumped or dropped.
+    ``messages_legacy`` (pre-partitioning rows) is never detached here.
+    """
+    now = DateTimeHelper.now_utc()
+    created, archived = [], []
+    # DETACH ... CONCURRENTLY can't run inside a transaction block
+    with psql_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        legacy_bound = conn.execute(PARTITION_BOUND, {"table": MESSAGES_TABLE, "partition": LEGACY_PARTITION}).scalar()
+        covered_until = range_upper_bound(legacy_bound)
+        for month in upcoming_months(now, settings.MESSAGE_PARTITION_MONTHS_AHEAD, covered_until):
+            conn.exec_driver_sql(create_partition_sql(month))
+            created.append(partition_name(month))
+
+        attached = list(conn.execute(ATTACHED_PARTITIONS, {"table": MESSAGES_TABLE}).scalars())
+        for name in expired_partitions(attached, now, settings.MESSAGE_PARTITION_RETENTION_MONTHS):
+            conn.exec_driver_sql(f"ALTER TABLE {MESSAGES_TABLE} DETACH PARTITION {name} CONCURRENTLY")
+            conn.exec_driver_sql(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}")
+            conn.exec_driver_sql(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}")
+            archived.append(name)
+
+    self.logger.info("message_partitions_maintained", ensured=created, archived=archived)
+    return {"ensured": created, "archived": archived}
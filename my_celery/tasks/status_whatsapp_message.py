@@ -1,13 +1,49 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional, Tuple
 from sqlalchemy import text
+from celery.exceptions import MaxRetriesExceededError
 from sqlalchemy.exc import OperationalError
+from my_celery.config.settings import settings
 from my_celery.signals.lifecycle import get_message_crud
 from my_celery.tasks.base_task import BaseTask
 from my_celery.celery_app import celery_app
 from my_celery.database.db_config import get_db
-from my_celery.models.Message import Message
 
 RETRY_COUNTDOWN = 60
 MAX_RETRIES = 5
+# seconds before looking again for a Mongo document that isn't written yet
+MONGO_MISSING_RETRY_COUNTDOWN = 2
+
+UPDATE_STATUS_SQL = text("""
+    UPDATE messages
+    SET message_status = :new_status
+    WHERE whatsapp_message_id = :wa_id
+    RETURNING id
+""")
+
+# same update bounded on created_at so only the partitions around the
+# status timestamp are scanned
+UPDATE_STATUS_IN_WINDOW_SQL = text("""
+    UPDATE messages
+    SET message_status = :new_status
+    WHERE whatsapp_message_id = :wa_id
+      AND created_at >= :created_from
+      AND created_at < :created_to
+    RETURNING id
+""")
+
+
+def _created_window(timestamp: Any) -> Optional[Tuple[datetime, datetime]]:
+    """created_at range a message with a status at ``timestamp`` (unix seconds) can fall in."""
+    try:
+        status_at = datetime.fromtimestamp(int(timestamp), tz=timezone.utc)
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+    return (
+        status_at - timedelta(days=settings.MESSAGE_STATUS_LOOKBACK_DAYS),
+        status_at + timedelta(days=1),
+    )
+
 
 @celery_app.task(
     name="my_celery.tasks.status_whatsapp_message",
@@ -28,18 +64,20 @@ def status_whatsapp_message(self, data):
     wa_id = data["wa_message_id"]
     new_status = data["status"]
 
+    params = {"new_status": new_status, "wa_id": wa_id}
+    window = _created_window(data.get("timestamp"))
+
     with get_db() as db:
         try:
-            result = db.execute(
-                text("""
-                    UPDATE messages
-                    SET message_status = :new_status
-                    WHERE whatsapp_message_id = :wa_id
-                    RETURNING id
-                """),
-                {"new_status": new_status, "wa_id": wa_id},
-            )
-            updated_row = result.fetchone()
+            updated_row = None
+            if window:
+                created_from, created_to = window
+                updated_row = db.execute(
+                    UPDATE_STATUS_IN_WINDOW_SQL,
+                    {**params, "created_from": created_from, "created_to": created_to},
+                ).fetchone()
+            if not updated_row:
+                updated_row = db.execute(UPDATE_STATUS_SQL, params).fetchone()
         except OperationalError as oe:
             self.logger.warning("db_update_failed", error=str(oe))
             raise self.retry(exc=oe)
@@ -52,16 +90,22 @@ def status_whatsapp_message(self, data):
         self.logger.info("message_updated", message_id=message_id)
 
     try:
-        mongo_msg : Message = message_crud.get_by_id(message_id)
-        if not mongo_msg:
-            self.logger.warning("no_mongo_document_found", message_id=message_id)
-            return {"updated": False}
-
-        mongo_msg.message_status = new_status
-        mongo_msg.wa_message_id = wa_id
-        message_crud.update(id=message_id, data=mongo_msg)
-
-        self.logger.info("mongo_doc_updated", message_id=message_id)
+        mongo_msg = message_crud.update(
+            id=message_id,
+            data={"message_status": new_status, "wa_message_id": wa_id},
+            projection={"_id": 1},
+        )
     except Exception as e:
         self.logger.error("mongo_update_failed", error=str(e))
-        return self.retry(exc=e)
\ No newline at end of file
+        return self.retry(exc=e)
+
+    if not mongo_msg:
+        # the insert may still be queued in a write-behind buffer; the
+        # Postgres update above is idempotent, so run the whole task again
+        self.logger.warning("no_mongo_document_found", message_id=message_id, retries=self.request.retries)
+        try:
+            return self.retry(countdown=MONGO_MISSING_RETRY_COUNTDOWN * (self.request.retries + 1))
+        except MaxRetriesExceededError:
+            return {"updated": False}
+
+    self.logger.info("mongo_doc_updated", message_id=message_id)
\ No newline at end of file
@@ -1,8 +1,15 @@
 from datetime import datetime, timezone
+from random import uniform
+from typing import Any, Dict, List, Tuple
+from celery.exceptions import Retry
+from requests import HTTPError
 from sqlalchemy import text
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
 
 from my_celery.api.BaseWhatsAppBusinessApi import send_template_message
+from my_celery.api.tenant_scheduler import tenant_scheduler
+from my_celery.api.throughput_governor import PAIR_RATE_ERROR_CODE, THROUGHPUT_ERROR_CODES, extract_error_code
+from my_celery.config.settings import settings
 from my_celery.signals.lifecycle import get_message_crud
 from my_celery.tasks.base_task import BaseTask
 from my_celery.celery_app import celery_app
@@ -104,8 +111,204 @@ def template_broadcast(self, data):
             created_at=DateTimeHelper.now_utc(),
             updated_at=DateTimeHelper.now_utc()
         )
-        message_crud.create(message_doc)
+        message_crud.create_deferred(message_doc)
     except Exception as mongo_exc:
         self.logger.error("mongo_insertion_failed", error=str(mongo_exc))
         return self.retry_task(exc=mongo_exc)
-    
\ No newline at end of file
+
+
+BATCH_SQL = text("""
+    SELECT whatsapp_message_id, conversation_id, message_id
+    FROM broadcast_messaging_batch(
+        :p_contact_phones,
+        :p_country_code_phones,
+        :p_business_phone,
+        :p_whatsapp_message_ids,
+        :p_user_id
+    )
+""")
+
+
+def _is_rejected_recipient(exc: HTTPError) -> bool:
+    """A 4xx about this recipient (bad number, opted out...), not throttling: retrying won't help."""
+    response = exc.response
+    if response is None or not 400 <= response.status_code < 500 or response.status_code == 429:
+        return False
+    try:
+        error_code = extract_error_code(response.json())
+    except ValueError:
+        error_code = None
+    return error_code not in THROUGHPUT_ERROR_CODES and error_code != PAIR_RATE_ERROR_CODE
+
+
+def _record_sent(business_number: str, user_id: str, sent: Dict[str, str]) -> List[Tuple[Any, Any, Any]]:
+    phones, country_codes, wa_message_ids = [], [], []
+    for phone_to, wa_message_id in sent.items():
+        country_code, contact_number = Helper.number_parsed(phone_to)
+        phones.append(str(contact_number))
+        country_codes.append(country_code)
+        wa_message_ids.append(wa_message_id)
+    with get_db() as db:
+        return db.execute(BATCH_SQL, {
+            "p_contact_phones": phones,
+            "p_country_code_phones": country_codes,
+            "p_business_phone": business_number,
+            "p_whatsapp_message_ids": wa_message_ids,
+            "p_user_id": user_id,
+        }).fetchall()
+
+
+def _log_unrecorded(task, business_number: str, sent: Dict[str, str], exc: Exception) -> None:
+    """These templates went out but have no conversation/message rows; keep their ids for a manual backfill."""
+    task.logger.critical(
+        "broadcast_sent_unrecorded",
+        business_number=business_number,
+        sent=[{"to": phone_to, "wa_message_id": wa_message_id} for phone_to, wa_message_id in sent.items()],
+        error=str(exc),
+    )
+
+
+@celery_app.task(
+    name="my_celery.tasks.template_broadcast_batch",
+    bind=True,
+    base=BaseTask,
+    max_retries=MAX_RETRIES,
+    retry_jitter=True,
+    default_retry_delay=RETRY_COUNTDOWN,
+    acks_late=False,
+)
+def template_broadcast_batch(self, data):
+    """
+    One chunk of a broadcast: every number in ``data["recipients"]`` gets
+    ``data["content"]`` (a template request without ``to``), then all sent
+    messages are recorded with a single broadcast_messaging_batch call.
+
+    ``data["sent"]`` ({phone: wa_message_id}) carries messages that went out
+    but aren't recorded yet across retries, so a failed database write
+    never sends a template twice.
+
+    The chunk first needs a slot from the tenant scheduler; while its
+    business number already holds its share of the workers and another
+    tenant is waiting, it is published again after BROADCAST_DEFER_SECONDS
+    with the same priority, without using up a retry. A second delivery of
+    the same message (the outbox relays at least once) is dropped; retries,
+    including throttling retries, reuse the task id and are not duplicates.
+    """
+    tenant = data.get("business_number_id")
+    redelivered = self.request.retries or self.throttle_retries
+    if not redelivered and not tenant_scheduler.first_delivery(self.request.id):
+        self.logger.warning("broadcast_chunk_duplicate")
+        if tenant:
+            tenant_scheduler.discard(tenant)
+        return {"duplicate": True}
+
+    if tenant and not tenant_scheduler.admit(tenant, self.request.id):
+        self.apply_async(
+            args=[data],
+            countdown=settings.BROADCAST_DEFER_SECONDS * uniform(1, 1.5),
+            priority=(self.request.delivery_info or {}).get("priority"),
+        )
+        return {"deferred": True}
+
+    requeued = False
+    try:
+        return _send_chunk(self, data)
+    except Retry:
+        requeued = True
+        raise
+    finally:
+        if tenant:
+            tenant_scheduler.release(tenant, self.request.id, requeued=requeued)
+
+
+def _send_chunk(task, data):
+    try:
+        message_crud = get_message_crud()
+    except RuntimeError as e:
+        task.logger.error("failed_to_initialize_message_crud", error=str(e))
+        raise task.retry(exc=e)
+
+    business_number = data.get("business_number")
+    user_id = data.get("user_id")
+    content = data.get("content")
+    business_token = data.get("business_token")
+    business_number_id = data.get("business_number_id")
+    recipients = data.get("recipients")
+
+    if not all([business_number, user_id, content, business_token, business_number_id, recipients]):
+        task.logger.error("invalid_input_data", data=data)
+        return {"error": "Invalid input"}
+
+    sent: Dict[str, str] = dict(data.get("sent") or {})
+    pending = [phone_to for phone_to in recipients if phone_to not in sent]
+    unsent: List[str] = []
+    rejected = 0
+    send_exc = None
+    for index, phone_to in enumerate(pending):
+        try:
+            response_template = send_template_message(
+                accessToken=business_token,
+                phone_number_id=business_number_id,
+                payload={**content, "to": phone_to}
+            )
+        except HTTPError as e:
+            if _is_rejected_recipient(e):
+                rejected += 1
+                task.logger.error("broadcast_recipient_rejected", to=phone_to, error=str(e))
+                continue
+            send_exc, unsent = e, pending[index:]
+            break
+        except Exception as e:
+            send_exc, unsent = e, pending[index:]
+            break
+
+        messages = response_template.get("messages", [])
+        wa_message_id = messages[0].get("id") if messages else None
+        if not wa_message_id:
+            rejected += 1
+            task.logger.error("no_messages_in_response", to=phone_to, response=response_template)
+            continue
+        sent[phone_to] = wa_message_id
+
+    rows = []
+    if sent:
+        try:
+            rows = _record_sent(business_number, user_id, sent)
+        except OperationalError as db_exc:
+            try:
+                return task.retry_task(exc=db_exc, args=[{**data, "recipients": list(sent) + unsent, "sent": sent}])
+            except OperationalError:
+                # out of retries
+                _log_unrecorded(task, business_number, sent, db_exc)
+                raise
+        except SQLAlchemyError as db_exc:
+            # not transient (missing business profile, constraint violation):
+            # a retry would fail the same way, and the unsent rest with it
+            _log_unrecorded(task, business_number, sent, db_exc)
+            return {"error": "Sent messages could not be recorded", "unrecorded": len(sent),
+                    "unsent": len(unsent), "rejected": rejected}
+
+        phone_by_wa_id = {wa_message_id: phone_to for phone_to, wa_message_id in sent.items()}
+        now = DateTimeHelper.now_utc()
+        for wa_message_id, conversation_id, message_id in rows:
+            try:
+                message_crud.create_deferred(Message(
+                    id=message_id,
+                    message_type="template",
+                    message_status="sent",
+                    conversation_id=conversation_id,
+                    wa_message_id=wa_message_id,
+                    content={**content, "to": phone_by_wa_id[wa_message_id]},
+                    is_from_contact=False,
+                    member_id=user_id,
+                    created_at=now,
+                    updated_at=now
+                ))
+            except Exception as mongo_exc:
+                # the Postgres rows are committed: retrying would send and record again
+                task.logger.error("mongo_insertion_failed", message_id=str(message_id), error=str(mongo_exc))
+
+    if send_exc is not None:
+        return task.retry_task(exc=send_exc, args=[{**data, "recipients": unsent, "sent": {}}])
+
+    return {"sent": len(rows), "rejected": rejected}
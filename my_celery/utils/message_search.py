@@ -0,0 +1,52 @@
+# keep in sync with app/whatsapp/team_inbox/utils/message_search.py
+import unicodedata
+from typing import Any, List, Optional
+
+# content keys that carry human readable text, across inbound webhook payloads,
+# outbound sends (text_body, file_name) and template / interactive bodies
+SEARCHABLE_KEYS = {
+    "text",
+    "text_body",
+    "body",
+    "caption",
+    "filename",
+    "file_name",
+    "title",
+    "description",
+    "name",
+    "address",
+    "header",
+    "footer",
+}
+
+MAX_SEARCH_TEXT_LENGTH = 4096
+MAX_CONTENT_DEPTH = 6
+
+
+def _collect(value: Any, parts: List[str], depth: int) -> None:
+    if depth > MAX_CONTENT_DEPTH:
+        return
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key in SEARCHABLE_KEYS and isinstance(item, str):
+                parts.append(item)
+            elif isinstance(item, (dict, list)):
+                _collect(item, parts, depth + 1)
+    elif isinstance(value, list):
+        for item in value:
+            _collect(item, parts, depth + 1)
+
+
+def normalize_search_text(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text)
+    return " ".join(text.split())
+
+
+def build_search_text(content: Optional[dict]) -> Optional[str]:
+    """Flatten the readable parts of a message's content into one indexable string."""
+    if not content:
+        return None
+    parts: List[str] = []
+    _collect(content, parts, 0)
+    text = normalize_search_text(" ".join(parts))
+    return text[:MAX_SEARCH_TEXT_LENGTH] or None
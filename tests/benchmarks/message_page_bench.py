@@ -0,0 +1,75 @@
+"""
+One 50-message history page through each MongoCRUD read mode, end to end
+(query, wire, decode). Needs a reachable MongoDB; the data goes into a
+throwaway database that is dropped afterwards.
+
+    MONGO_URI=mongodb://localhost:27017 python -m tests.benchmarks.message_page_bench
+"""
+import asyncio
+import os
+import time
+import uuid
+from datetime import timedelta
+
+from app.core.repository.MongoRepository import MongoCRUD
+from app.core.storage.MongoDB import MongoDB
+from app.utils.DateTimeHelper import DateTimeHelper
+from app.whatsapp.team_inbox.models.Message import Message
+from app.whatsapp.team_inbox.models.schema.response.MessageView import MessageView
+
+PAGE_SIZE = 50
+ROUNDS = 500
+BENCH_DB = "bench_message_page"
+
+
+async def seed(crud: MongoCRUD[Message]) -> uuid.UUID:
+    conversation_id = uuid.uuid4()
+    now = DateTimeHelper.now_utc()
+    await crud.bulk_create([
+        {
+            "id": uuid.uuid4(),
+            "message_type": "text",
+            "message_status": "delivered",
+            "conversation_id": conversation_id,
+            "wa_message_id": f"wamid.{uuid.uuid4().hex}",
+            "content": {"body": f"message body number {i} " * 4},
+            "is_from_contact": i % 2 == 0,
+            "member_id": uuid.uuid4(),
+            "created_at": now - timedelta(seconds=i),
+        }
+        for i in range(PAGE_SIZE * 2)
+    ])
+    return conversation_id
+
+
+async def timed(name: str, read, baseline: float = None) -> float:
+    await read()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        await read()
+    per_page = (time.perf_counter() - start) / ROUNDS
+    speedup = f"{baseline / per_page:5.1f}x" if baseline else "  1.0x"
+    print(f"{name:<10} {per_page * 1e3:8.3f} ms/page  {speedup}")
+    return per_page
+
+
+async def main() -> None:
+    mongo = MongoDB(os.getenv("MONGO_URI", "mongodb://localhost:27017"), BENCH_DB)
+    await mongo.init_db([Message])
+    crud = MongoCRUD(Message)
+    try:
+        conversation_id = await seed(crud)
+        page = dict(
+            query={"conversation_id": conversation_id},
+            limit=PAGE_SIZE,
+            sort=[("created_at", -1), ("_id", -1)],
+        )
+        baseline = await timed("document", lambda: crud.find_many(**page))
+        await timed("raw dict", lambda: crud.find_many(**page, raw=True), baseline)
+        await timed("msgspec", lambda: crud.find_many(**page, as_type=MessageView), baseline)
+    finally:
+        await mongo.client.drop_database(BENCH_DB)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,9 +1,22 @@
 import asyncio
 import pytest
 from app.core.storage.postgres import PostgresDatabase
+from app.core.storage.query_stats import query_scope
 from tests.unit.test_settings import test_settings
 
 
+# a test fails when one statement shape runs more often than this
+N_PLUS_ONE_MAX_REPEATS = 10
+
+
+@pytest.fixture(autouse=True)
+def n_plus_one_detector(request):
+    """Count the statements of every test; opt out with @pytest.mark.allow_n_plus_one."""
+    if request.node.get_closest_marker("allow_n_plus_one"):
+        yield None
+        return
+    with query_scope(N_PLUS_ONE_MAX_REPEATS) as queries:
+        yield queries
 
 @pytest.mark.asyncio(scope="module")
 def event_loop():
@@ -0,0 +1,130 @@
+import uuid
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.annotations.models.Attribute import Attribute
+from app.annotations.models.Contact import Contact
+from app.annotations.models.ContactAttributeLink import ContactAttributeLink
+from app.annotations.models.ContactNoteLink import ContactNoteLink
+from app.annotations.models.ContactTagLink import ContactTagLink
+from app.annotations.models.Note import Note
+from app.annotations.models.Tag import Tag
+from app.annotations.repositories.ContactRepository import ContactRepository
+from app.user_management.auth.models.RefreshToken import RefreshToken  # noqa: F401 (mapper registry)
+from app.user_management.auth.models.Role import Role  # noqa: F401
+from app.user_management.auth.models.UserRole import UserRole  # noqa: F401
+from app.user_management.user.models.Client import Client
+from app.user_management.user.models.Team import Team  # noqa: F401
+from app.user_management.user.models.User import User
+from app.user_management.user.models.UserTeam import UserTeam  # noqa: F401
+from app.whatsapp.broadcast.models.BroadCast import BroadCast  # noqa: F401
+from app.whatsapp.business_profile.v1.models.BusinessProfile import BusinessProfile  # noqa: F401
+from app.whatsapp.team_inbox.models.Assignment import Assignment  # noqa: F401
+from app.whatsapp.team_inbox.models.Conversation import Conversation  # noqa: F401
+from app.whatsapp.team_inbox.models.ConversationTeamLink import ConversationTeamLink  # noqa: F401
+from app.whatsapp.team_inbox.models.MessageMeta import MessageMeta  # noqa: F401
+from app.whatsapp.template.models.TemplateMeta import TemplateMeta  # noqa: F401
+from app.chat_bot.models.ChatBotMeta import ChatBotMeta  # noqa: F401
+
+CONTACTS = 4
+LABELS_PER_CONTACT = 3
+
+TABLES = [
+    model.__table__
+    for model in (Client, User, Contact, Tag, Attribute, Note, ContactTagLink, ContactAttributeLink, ContactNoteLink)
+]
+
+
+class StatementLog:
+    """Every SELECT the engine runs, with the number of rows it returned."""
+
+    def __init__(self, engine):
+        self.selects = []
+        event.listen(engine.sync_engine, "after_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.selects.append((statement, parameters))
+
+    def reset(self):
+        self.selects.clear()
+
+
+async def row_counts(engine, selects):
+    async with engine.connect() as conn:
+        counts = []
+        for statement, parameters in list(selects):
+            result = await conn.exec_driver_sql(statement, parameters)
+            counts.append(len(result.fetchall()))
+        return counts
+
+
+@pytest_asyncio.fixture
+async def seeded():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all, tables=TABLES)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        client = Client(client_id=1)
+        session.add(client)
+        await session.flush()
+        for i in range(CONTACTS):
+            contact = Contact(name=f"contact {i}", country_code="+1", phone_number=f"55501{i:02d}", client_id=client.id)
+            session.add(contact)
+            await session.flush()
+            for j in range(LABELS_PER_CONTACT):
+                tag = Tag(name=f"tag {i}-{j}", client_id=client.id)
+                attribute = Attribute(name=f"attribute {i}-{j}", client_id=client.id)
+                note = Note(content=f"note {i}-{j}", user_id=uuid.uuid4())
+                session.add_all([tag, attribute, note])
+                await session.flush()
+                session.add_all([
+                    ContactTagLink(contact_id=contact.id, tag_id=tag.id),
+                    ContactAttributeLink(contact_id=contact.id, attribute_id=attribute.id, value=str(j)),
+                    ContactNoteLink(contact_id=contact.id, note_id=note.id),
+                ])
+        await session.commit()
+        client_id = client.id
+
+    yield engine, client_id
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_contact_list_loads_labels_without_a_cartesian_product(seeded):
+    engine, client_id = seeded
+    log = StatementLog(engine)
+    async with AsyncSession(engine) as session:
+        result = await ContactRepository(session).get_by_client_id(client_id, page=1, limit=10)
+
+        contacts = result["contacts"]
+        assert len(contacts) == CONTACTS
+        assert all(len(contact.tag_links) == LABELS_PER_CONTACT for contact in contacts)
+        assert all(link.attribute.name for contact in contacts for link in contact.attribute_links)
+
+    # count, contacts, tag links, tags, attribute links, attributes: fixed, whatever the page holds
+    assert len(log.selects) == 6
+    # no statement returns more rows than there are links on the page
+    assert max(await row_counts(engine, log.selects)) <= CONTACTS * LABELS_PER_CONTACT
+
+
+@pytest.mark.asyncio
+async def test_phone_lookup_is_one_row_and_refuses_relationship_loads(seeded):
+    engine, client_id = seeded
+    log = StatementLog(engine)
+    async with AsyncSession(engine) as session:
+        contact = await ContactRepository(session).get_by_client_id_phone_number(client_id, "5550102")
+
+        assert contact.name == "contact 2"
+        with pytest.raises(InvalidRequestError):
+            contact.tag_links
+
+    assert len(log.selects) == 1
+    assert await row_counts(engine, log.selects) == [1]
@@ -0,0 +1,131 @@
+import asyncio
+
+import msgspec
+import pytest
+
+from app.core.broker import RabbitMQBroker as broker_module
+from app.core.broker.BasePublisher import BasePublisher
+
+
+class FakeExchange:
+    def __init__(self):
+        self.published = []
+        self.priorities = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def publish(self, message, routing_key):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)  # broker confirm
+        self.in_flight -= 1
+        self.published.append((routing_key, msgspec.msgpack.decode(message.body)))
+        self.priorities.append(message.priority)
+
+
+class FakeQueue:
+    def __init__(self):
+        self.bindings = []
+
+    async def bind(self, exchange, routing_key):
+        self.bindings.append(routing_key)
+
+
+class FakeChannel:
+    def __init__(self):
+        self.is_closed = False
+        self.exchange = FakeExchange()
+        self.queue = FakeQueue()
+        self.declared = 0
+
+    async def declare_exchange(self, name, type_, durable):
+        self.declared += 1
+        return self.exchange
+
+    async def declare_queue(self, name, durable, arguments=None):
+        self.queue.arguments = arguments
+        return self.queue
+
+
+class FakeConnection:
+    is_closed = False
+
+    def __init__(self):
+        self.channels = []
+
+    async def channel(self, publisher_confirms):
+        self.channels.append(FakeChannel())
+        return self.channels[-1]
+
+
+class FakeBroker:
+    def __init__(self):
+        self.connection = FakeConnection()
+
+    async def connect(self):
+        return self.connection
+
+
+class TaskPublisher(BasePublisher):
+    exchange_name = "test_exchange"
+    routing_key = "test_key"
+    queue_name = "test_queue"
+    channel_count = 2
+
+
+def payload(i):
+    return {"id": str(i), "task": "my_celery.tasks.test"}
+
+
+@pytest.mark.asyncio
+async def test_exchange_declared_once_per_channel():
+    broker = FakeBroker()
+    publisher = TaskPublisher(broker)
+    for i in range(10):
+        await publisher.publish(payload(i))
+
+    channels = broker.connection.channels
+    assert len(channels) == 2
+    assert [channel.declared for channel in channels] == [1, 1]
+    assert [channel.queue.bindings for channel in channels] == [["test_key"], ["test_key"]]
+    assert sum(len(channel.exchange.published) for channel in channels) == 10
+
+
+@pytest.mark.asyncio
+async def test_batch_pipelines_publishes_on_one_channel():
+    broker = FakeBroker()
+    publisher = TaskPublisher(broker)
+    assert await publisher.publish_batch(payload(i) for i in range(50)) == 50
+
+    exchange = broker.connection.channels[0].exchange
+    assert [body["id"] for _, body in exchange.published] == [str(i) for i in range(50)]
+    assert exchange.max_in_flight == 50
+
+
+@pytest.mark.asyncio
+async def test_closed_channel_is_replaced():
+    broker = FakeBroker()
+    publisher = TaskPublisher(broker)
+    await publisher.setup()
+    broker.connection.channels[0].is_closed = True
+    await publisher.publish(payload(1))
+
+    assert len(broker.connection.channels) == 3
+    assert broker.connection.channels[2].exchange.published == [("test_key", payload(1))]
+
+
+@pytest.mark.asyncio
+async def test_broker_connects_with_the_configured_timeout(monkeypatch):
+    calls = []
+
+    async def connect_robust(**kwargs):
+        calls.append(kwargs)
+        return FakeConnection()
+
+    monkeypatch.setattr(broker_module.aio_pika, "connect_robust", connect_robust)
+    broker = broker_module.RabbitMQBroker(broker_module.RabbitMQSettings(host="rabbitmq", connect_timeout=1.5))
+
+    connection = await broker.connect()
+
+    assert await broker.connect() is connection
+    assert len(calls) == 1 and calls[0]["timeout"] == 1.5
@@ -0,0 +1,86 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Field, SQLModel
+
+from app.core.repository.BaseRepository import BaseRepository
+from app.utils.DateTimeHelper import DateTimeHelper
+
+
+class BulkRow(SQLModel, table=True):
+    __tablename__ = "test_bulk_rows"
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    name: str = Field(unique=True)
+    value: int = 0
+    updated_at: datetime = Field(default_factory=DateTimeHelper.now_utc)
+
+
+class FakeResult:
+    def __init__(self, rowcount):
+        self.rowcount = rowcount
+
+
+class FakeSession:
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, statement, params=None):
+        self.statements.append((statement, params))
+        params = statement.compile(dialect=postgresql.dialect()).params
+        return FakeResult(len(params) // len(BulkRow.__table__.columns))
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+
+def sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_sends_one_multi_row_insert_per_chunk():
+    session = FakeSession()
+    repo = BaseRepository(BulkRow, session)
+
+    written = await repo.bulk_create([{"name": f"row-{i}"} for i in range(25)], chunk_size=10)
+
+    assert written == 25
+    assert len(session.statements) == 3
+    assert session.commits == 1
+    first = session.statements[0][0].compile(dialect=postgresql.dialect())
+    assert "ON CONFLICT" not in str(first)
+    # default factories run for rows given as plain dicts
+    assert all(first.params[f"id_m{i}"] for i in range(10))
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_dedupes_conflict_keys_and_sets_update_columns():
+    session = FakeSession()
+    repo = BaseRepository(BulkRow, session)
+
+    await repo.bulk_upsert(
+        [{"name": "a", "value": 1}, {"name": "a", "value": 2}, {"name": "b"}],
+        conflict_cols=["name"],
+        update_cols=["value"],
+    )
+
+    statement = sql(session.statements[0][0])
+    assert "ON CONFLICT (name) DO UPDATE SET value = excluded.value, updated_at" in statement
+    assert session.statements[0][0].compile(dialect=postgresql.dialect()).params["value_m0"] == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_without_update_columns_does_nothing_on_conflict():
+    session = FakeSession()
+    repo = BaseRepository(BulkRow, session)
+
+    await repo.bulk_upsert([{"name": "a"}], conflict_cols=["name"], commit=False)
+
+    assert "ON CONFLICT (name) DO NOTHING" in sql(session.statements[0][0])
+    assert session.commits == 0
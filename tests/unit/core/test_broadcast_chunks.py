@@ -0,0 +1,207 @@
+import pytest
+from celery.exceptions import Retry
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from app.core.broker.MessageBroadcastPublisher import MessageBroadcastPublisher, iter_chunks
+from app.whatsapp.broadcast.models.schema.BroadCastTemplate import TemplateObject
+from my_celery.tasks import template_broadcast
+from tests.unit.core.test_base_publisher import FakeBroker
+
+TEMPLATE = TemplateObject(name="promo", language={"code": "en_US"}, components=[])
+
+
+@pytest.mark.asyncio
+async def test_audience_is_published_in_chunks_with_a_shared_template():
+    broker = FakeBroker()
+    publisher = MessageBroadcastPublisher(broker)
+    numbers = [f"+9627900{i:05d}" for i in range(250)]
+
+    chunks = await publisher.publish_chunks(
+        recipients=iter_chunks(numbers, 100),
+        template_body=TEMPLATE,
+        user_id="user",
+        business_number="+15551546858",
+        bussiness_token="token",
+        business_number_id="phone-id",
+        max_in_flight=2,
+    )
+
+    published = [body for channel in broker.connection.channels for _, body in channel.exchange.published]
+    assert chunks == len(published) == 3
+    assert {body["task"] for body in published} == {"my_celery.tasks.template_broadcast_batch"}
+    data = [body["args"][0] for body in published]
+    assert [len(d["recipients"]) for d in data] == [100, 100, 50]
+    assert sum((d["recipients"] for d in data), []) == numbers
+    assert all(d["content"] == {"messaging_product": "whatsapp", "type": "template",
+                                "template": TEMPLATE.model_dump()} for d in data)
+    assert max(channel.exchange.max_in_flight for channel in broker.connection.channels) <= 2
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.events = []
+
+    def __getattr__(self, level):
+        return lambda event, **fields: self.events.append((level, event, fields))
+
+
+class FakeChunkTask:
+    def __init__(self, out_of_retries=False):
+        self.logger = RecordingLogger()
+        self.out_of_retries = out_of_retries
+        self.retried = []
+
+    def retry_task(self, exc=None, args=None):
+        if self.out_of_retries:
+            raise exc
+        self.retried.append(args)
+        return {"retried": True}
+
+
+CHUNK = {
+    "business_number": "+15551546858", "user_id": "user", "business_token": "token",
+    "business_number_id": "phone-id", "content": {"type": "template"},
+    "recipients": ["+962790000001", "+962790000002"],
+}
+
+
+def _sending(monkeypatch, record_error):
+    def record_sent(business_number, user_id, sent):
+        raise record_error
+
+    monkeypatch.setattr(template_broadcast, "get_message_crud", lambda: None)
+    monkeypatch.setattr(template_broadcast, "send_template_message",
+                        lambda accessToken, phone_number_id, payload: {"messages": [{"id": f"wamid.{payload['to']}"}]})
+    monkeypatch.setattr(template_broadcast, "_record_sent", record_sent)
+
+
+def _unrecorded(task):
+    return [fields["sent"] for level, event, fields in task.logger.events
+            if (level, event) == ("critical", "broadcast_sent_unrecorded")]
+
+
+def test_transient_record_failure_retries_with_the_sent_map(monkeypatch):
+    _sending(monkeypatch, OperationalError("CALL", {}, Exception("connection reset")))
+    task = FakeChunkTask()
+
+    assert template_broadcast._send_chunk(task, CHUNK) == {"retried": True}
+
+    (retry_data,), = task.retried
+    assert retry_data["sent"] == {phone: f"wamid.{phone}" for phone in CHUNK["recipients"]}
+    assert _unrecorded(task) == []
+
+
+def test_sent_ids_are_logged_when_recording_runs_out_of_retries(monkeypatch):
+    _sending(monkeypatch, OperationalError("CALL", {}, Exception("connection reset")))
+    task = FakeChunkTask(out_of_retries=True)
+
+    with pytest.raises(OperationalError):
+        template_broadcast._send_chunk(task, CHUNK)
+
+    assert [entry["wa_message_id"] for entry in _unrecorded(task)[0]] == ["wamid.+962790000001", "wamid.+962790000002"]
+
+
+def test_permanent_record_failure_logs_the_sent_ids_without_retrying(monkeypatch):
+    _sending(monkeypatch, IntegrityError("SELECT", {}, Exception("Business profile not found")))
+    task = FakeChunkTask()
+
+    result = template_broadcast._send_chunk(task, CHUNK)
+
+    assert result["unrecorded"] == 2 and task.retried == []
+    assert [entry["to"] for entry in _unrecorded(task)[0]] == CHUNK["recipients"]
+
+
+class FakeTenantScheduler:
+    def __init__(self):
+        self.admits = True
+        self.first = True
+        self.calls = []
+
+    def first_delivery(self, task_id):
+        self.calls.append(("first_delivery", task_id))
+        return self.first
+
+    def discard(self, tenant):
+        self.calls.append(("discard", tenant))
+
+    def admit(self, tenant, task_id):
+        self.calls.append(("admit", tenant, task_id))
+        return self.admits
+
+    def release(self, tenant, task_id, requeued=False):
+        self.calls.append(("release", tenant, task_id, requeued))
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    scheduler = FakeTenantScheduler()
+    monkeypatch.setattr(template_broadcast, "tenant_scheduler", scheduler)
+    return scheduler
+
+
+@pytest.fixture
+def deferred():
+    return []
+
+
+@pytest.fixture
+def batch_task(monkeypatch, scheduler, deferred):
+    task = template_broadcast.template_broadcast_batch
+    monkeypatch.setattr(task, "logger", RecordingLogger(), raising=False)
+    monkeypatch.setattr(task, "apply_async", lambda **kwargs: deferred.append(kwargs), raising=False)
+    task.push_request(id="chunk-1", retries=0, headers={}, delivery_info={"priority": 7})
+    yield task
+    task.pop_request()
+
+
+def test_an_admitted_chunk_is_sent_and_releases_its_slot(batch_task, scheduler, monkeypatch):
+    monkeypatch.setattr(template_broadcast, "_send_chunk", lambda task, data: {"sent": 2})
+
+    assert batch_task.run(CHUNK) == {"sent": 2}
+    assert scheduler.calls == [
+        ("first_delivery", "chunk-1"),
+        ("admit", "phone-id", "chunk-1"),
+        ("release", "phone-id", "chunk-1", False),
+    ]
+
+
+def test_a_chunk_over_its_tenants_share_is_deferred_without_a_retry(batch_task, scheduler, deferred, monkeypatch):
+    monkeypatch.setattr(template_broadcast, "_send_chunk", lambda task, data: pytest.fail("sent while deferred"))
+    scheduler.admits = False
+
+    assert batch_task.run(CHUNK) == {"deferred": True}
+
+    (published_again,) = deferred
+    assert published_again["args"] == [CHUNK] and published_again["priority"] == 7
+    defer_seconds = template_broadcast.settings.BROADCAST_DEFER_SECONDS
+    assert defer_seconds <= published_again["countdown"] <= defer_seconds * 1.5
+    assert "retries" not in published_again and batch_task.request.retries == 0
+    assert [call[0] for call in scheduler.calls] == ["first_delivery", "admit"]
+
+
+def test_a_second_delivery_is_dropped_and_stops_counting_as_pending(batch_task, scheduler, monkeypatch):
+    monkeypatch.setattr(template_broadcast, "_send_chunk", lambda task, data: pytest.fail("sent twice"))
+    scheduler.first = False
+
+    assert batch_task.run(CHUNK) == {"duplicate": True}
+    assert scheduler.calls == [("first_delivery", "chunk-1"), ("discard", "phone-id")]
+
+
+def test_a_retried_chunk_is_pending_again(batch_task, scheduler, monkeypatch):
+    def retry(task, data):
+        raise Retry("database unavailable")
+
+    monkeypatch.setattr(template_broadcast, "_send_chunk", retry)
+
+    with pytest.raises(Retry):
+        batch_task.run(CHUNK)
+    assert scheduler.calls[-1] == ("release", "phone-id", "chunk-1", True)
+
+
+def test_a_retry_reuses_the_task_id_and_is_not_a_duplicate(batch_task, scheduler, monkeypatch):
+    monkeypatch.setattr(template_broadcast, "_send_chunk", lambda task, data: {"sent": 2})
+    scheduler.first = False
+    batch_task.request.retries = 1
+
+    assert batch_task.run(CHUNK) == {"sent": 2}
+    assert [call[0] for call in scheduler.calls] == ["admit", "release"]
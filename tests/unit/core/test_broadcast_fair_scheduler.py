@@ -0,0 +1,62 @@
+import pytest
+
+from app.core.broker.BasePublisher import MAX_PRIORITY
+from app.core.broker.MessageBroadcastPublisher import MessageBroadcastPublisher, iter_chunks
+from app.core.services.BroadcastFairScheduler import chunk_priorities
+from tests.unit.core.test_base_publisher import FakeBroker
+from tests.unit.core.test_broadcast_chunks import TEMPLATE
+
+
+class FakeFairScheduler:
+    def __init__(self):
+        self.pending = {}
+
+    async def reserve(self, tenant, chunks):
+        before = self.pending.get(tenant, 0)
+        self.pending[tenant] = before + chunks
+        return chunk_priorities(before, chunks)
+
+    async def release(self, tenant, chunks):
+        self.pending[tenant] -= chunks
+
+
+def test_priority_falls_as_the_backlog_doubles():
+    assert chunk_priorities(0, 4) == [MAX_PRIORITY, MAX_PRIORITY - 1, MAX_PRIORITY - 1, MAX_PRIORITY - 2]
+    assert chunk_priorities(5000, 1) == [0]
+    # a new tenant's first chunk beats a large tenant's tail
+    assert chunk_priorities(0, 1)[0] > chunk_priorities(50, 1)[0]
+
+
+def test_weight_scales_the_backlog():
+    assert chunk_priorities(6, 1, weight=2.0) == chunk_priorities(3, 1)
+    assert chunk_priorities(6, 1, weight=0) == chunk_priorities(6, 1)
+
+
+@pytest.mark.asyncio
+async def test_chunks_are_counted_per_tenant_and_prioritised():
+    broker = FakeBroker()
+    scheduler = FakeFairScheduler()
+    publisher = MessageBroadcastPublisher(broker, fair_scheduler=scheduler)
+
+    async def publish(tenant, numbers):
+        return await publisher.publish_chunks(
+            recipients=iter_chunks(numbers, 10),
+            template_body=TEMPLATE,
+            user_id="user",
+            business_number="+15551546858",
+            bussiness_token="token",
+            business_number_id=tenant,
+            max_in_flight=4,
+        )
+
+    await publish("large", [f"+96279{i:07d}" for i in range(200)])
+    await publish("small", ["+962790000001"])
+
+    assert scheduler.pending == {"large": 20, "small": 1}
+    priorities = {}
+    for channel in broker.connection.channels:
+        for (_, body), priority in zip(channel.exchange.published, channel.exchange.priorities):
+            priorities.setdefault(body["args"][0]["business_number_id"], []).append(priority)
+    assert priorities["small"] == [MAX_PRIORITY]
+    assert max(priorities["large"]) == MAX_PRIORITY and min(priorities["large"]) < MAX_PRIORITY - 3
+    assert broker.connection.channels[0].queue.arguments == {"x-max-priority": MAX_PRIORITY}
@@ -0,0 +1,138 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from sqlmodel import SQLModel, func, select
+
+from app.annotations.models.Attribute import Attribute  # noqa: F401 (mapper registry)
+from app.annotations.models.Contact import Contact  # noqa: F401
+from app.annotations.models.ContactAttributeLink import ContactAttributeLink  # noqa: F401
+from app.annotations.models.ContactNoteLink import ContactNoteLink  # noqa: F401
+from app.annotations.models.ContactTagLink import ContactTagLink  # noqa: F401
+from app.annotations.models.Note import Note  # noqa: F401
+from app.annotations.models.Tag import Tag  # noqa: F401
+from app.chat_bot.models.ChatBotMeta import ChatBotMeta  # noqa: F401
+from app.core.broker.models.OutboxEvent import OutboxEvent
+from app.core.config.settings import settings
+from app.core.storage.postgres import PostgresDatabase
+from app.user_management.auth.models.RefreshToken import RefreshToken  # noqa: F401
+from app.user_management.auth.models.Role import Role  # noqa: F401
+from app.user_management.auth.models.UserRole import UserRole  # noqa: F401
+from app.user_management.user.models.Client import Client  # noqa: F401
+from app.user_management.user.models.Team import Team  # noqa: F401
+from app.user_management.user.models.User import User  # noqa: F401
+from app.user_management.user.models.UserTeam import UserTeam  # noqa: F401
+from app.whatsapp.broadcast.models.BroadCast import BroadCast, BroadcastStatus
+from app.whatsapp.broadcast.models.schema.BroadCastTemplate import TemplateObject
+from app.whatsapp.broadcast.repositories.BroadCastRepository import BroadcastRepository
+from app.whatsapp.broadcast.services.BroadCastService import BroadcastService
+from app.whatsapp.broadcast.use_case import BroadcastScheduler as scheduler_module
+from app.whatsapp.business_profile.v1.models.BusinessProfile import BusinessProfile  # noqa: F401
+from app.whatsapp.team_inbox.models.Assignment import Assignment  # noqa: F401
+from app.whatsapp.team_inbox.models.Conversation import Conversation  # noqa: F401
+from app.whatsapp.team_inbox.models.ConversationTeamLink import ConversationTeamLink  # noqa: F401
+from app.whatsapp.team_inbox.models.MessageMeta import MessageMeta  # noqa: F401
+from app.whatsapp.template.models.TemplateMeta import TemplateMeta  # noqa: F401
+
+TEMPLATE = TemplateObject(name="promo", language={"code": "en_US"}, components=[])
+AUDIENCE = [f"+9627900{i:05d}" for i in range(10)]
+
+
+class FakeAudience:
+    """The Redis list of numbers; ``during_read`` runs before every LRANGE."""
+
+    def __init__(self, during_read=None):
+        self.during_read = during_read
+        self.reads = 0
+
+    async def lrange(self, key, start, end):
+        self.reads += 1
+        if self.during_read:
+            await self.during_read(self.reads)
+        return AUDIENCE[start:end + 1]
+
+    async def get(self, key):
+        return None
+
+
+class FakeOutboxService:
+    def __init__(self):
+        self.notified = 0
+
+    def notify(self):
+        self.notified += 1
+
+
+class FakeTemplates:
+    async def get_by_id(self, template_id):
+        return SimpleNamespace(model_dump=lambda **kwargs: {"name": "promo"})
+
+
+class FakeBusinessProfiles:
+    async def get(self, business_id):
+        return SimpleNamespace(phone_number="+15551546858", access_token="token", phone_number_id="phone-id")
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "BROADCAST_CHUNK_SIZE", 2)
+    monkeypatch.setattr(settings, "BROADCAST_MAX_IN_FLIGHT", 2)
+    monkeypatch.setattr(scheduler_module.TemplateBuilder, "build_template_object",
+                        staticmethod(lambda body, parameters: TEMPLATE))
+    db = PostgresDatabase(f"sqlite+aiosqlite:///{tmp_path}/broadcast.db", pool_size=2)
+    async with db._engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all, tables=[BroadCast.__table__, OutboxEvent.__table__])
+    yield db
+    await db.dispose()
+
+
+async def _scheduler(db, shared, redis):
+    broadcast_service = BroadcastService(BroadcastRepository(shared))
+    broadcast = await broadcast_service.create(BroadCast(
+        name="promo", template_id=uuid.uuid4(), user_id=uuid.uuid4(), business_id=uuid.uuid4(),
+        total_contacts=len(AUDIENCE), status=BroadcastStatus.PROCESSING,
+    ))
+    scheduler = scheduler_module.BroadcastScheduler(
+        broadcast_service=broadcast_service, user_service=None, contact_service=None,
+        bussiness_service=FakeBusinessProfiles(), redis=redis, mongo_crud_template=FakeTemplates(),
+        outbox_service=FakeOutboxService(), db=db,
+    )
+    return scheduler, broadcast
+
+
+async def _saved(db, broadcast_id):
+    async with db.session() as session:
+        outbox_rows = (await session.exec(select(func.count()).select_from(OutboxEvent))).one()
+        status = (await session.exec(select(BroadCast.status).where(BroadCast.id == broadcast_id))).one()
+    return outbox_rows, status
+
+
+@pytest.mark.asyncio
+async def test_chunks_and_sent_status_commit_together(db):
+    async with db.session() as shared:
+        scheduler, broadcast = await _scheduler(db, shared, FakeAudience())
+
+        await scheduler._execute_broadcast(broadcast)
+
+        assert broadcast.status == BroadcastStatus.SENT
+        assert scheduler.outbox_service.notified == 1
+    assert await _saved(db, broadcast.id) == (5, BroadcastStatus.SENT)
+
+
+@pytest.mark.asyncio
+async def test_a_failure_mid_audience_leaves_no_chunks_even_if_the_shared_session_commits(db):
+    async with db.session() as shared:
+        async def other_request_commits_then_redis_fails(read):
+            # e.g. a webhook status update committing the shared session
+            await shared.commit()
+            if read == 4:
+                raise ConnectionError("redis went away")
+
+        scheduler, broadcast = await _scheduler(db, shared, FakeAudience(other_request_commits_then_redis_fails))
+
+        with pytest.raises(ConnectionError):
+            await scheduler._execute_broadcast(broadcast)
+
+        assert scheduler.outbox_service.notified == 0
+    assert await _saved(db, broadcast.id) == (0, BroadcastStatus.FAILED)
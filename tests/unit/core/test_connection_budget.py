@@ -0,0 +1,16 @@
+from app.core.storage.connection_budget import asyncpg_connect_args, pool_budget
+
+
+def test_pools_fit_the_budget():
+    assert pool_budget(300, 10) == (20, 10)
+    pool_size, max_overflow = pool_budget(100, 12, reserved=10)
+    assert 12 * (pool_size + max_overflow) <= 90
+    assert pool_budget(5, 10) == (1, 0)
+
+
+def test_pgbouncer_statements_are_uniquely_named_and_uncached():
+    assert asyncpg_connect_args() == {}
+    args = asyncpg_connect_args(pgbouncer=True)
+    assert args["prepared_statement_cache_size"] == 0 and args["statement_cache_size"] == 0
+    assert args["prepared_statement_name_func"]() != args["prepared_statement_name_func"]()
+    assert asyncpg_connect_args(pgbouncer=True, statement_cache_size=50)["prepared_statement_cache_size"] == 50
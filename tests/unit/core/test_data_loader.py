@@ -0,0 +1,66 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.core.repository.DataLoader import DataLoader, get_loader, loader_scope
+
+
+class Recorder:
+    def __init__(self):
+        self.batches = []
+
+    async def __call__(self, keys):
+        self.batches.append(list(keys))
+        return {key: f"value-{key}" for key in keys if key != "missing"}
+
+
+@pytest.mark.asyncio
+async def test_loads_in_the_same_tick_share_one_batch():
+    batch_fn = Recorder()
+    loader = DataLoader(batch_fn)
+
+    results = await asyncio.gather(loader.load("a"), loader.load("b"), loader.load("missing"))
+
+    assert results == ["value-a", "value-b", None]
+    assert batch_fn.batches == [["a", "b", "missing"]]
+
+
+@pytest.mark.asyncio
+async def test_results_are_memoized_across_ticks_and_key_types():
+    batch_fn = Recorder()
+    loader = DataLoader(batch_fn)
+    key = uuid.uuid4()
+
+    await loader.load(key)
+    await loader.load(str(key))
+    loader.clear(key)
+    await loader.load(key)
+
+    assert batch_fn.batches == [[key], [key]]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_not_memoized():
+    calls = []
+
+    async def flaky(keys):
+        calls.append(keys)
+        if len(calls) == 1:
+            raise RuntimeError("db down")
+        return {key: key for key in keys}
+
+    loader = DataLoader(flaky)
+    with pytest.raises(RuntimeError):
+        await loader.load("a")
+    assert await loader.load("a") == "a"
+
+
+@pytest.mark.asyncio
+async def test_loaders_exist_only_inside_a_scope():
+    assert get_loader("users", lambda: DataLoader(Recorder())) is None
+    with loader_scope():
+        first = get_loader("users", lambda: DataLoader(Recorder()))
+        assert get_loader("users", lambda: DataLoader(Recorder())) is first
+    with loader_scope():
+        assert get_loader("users", lambda: DataLoader(Recorder())) is not first
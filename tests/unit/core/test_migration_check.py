@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import pytest
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+
+from app.core.broker.models.OutboxEvent import OutboxEvent  # noqa: F401 (registers the table)
+from app.core.storage.postgres import PostgresDatabase
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.chdir(REPO_ROOT)
+    return PostgresDatabase(f"sqlite+aiosqlite:///{tmp_path}/app.db")
+
+
+async def _stamp(db: PostgresDatabase, revision: str) -> None:
+    async with db._engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE IF NOT EXISTS alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        await conn.execute(text("DELETE FROM alembic_version"))
+        await conn.execute(text("INSERT INTO alembic_version VALUES (:revision)"), {"revision": revision})
+
+
+@pytest.mark.asyncio
+async def test_database_at_head_passes(database):
+    head = ScriptDirectory.from_config(Config("alembic.ini")).get_current_head()
+    await _stamp(database, head)
+    assert await database.check_migrations() == head
+    await database.dispose()
+
+
+@pytest.mark.asyncio
+async def test_stale_or_unmigrated_database_is_refused(database):
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        await database.check_migrations()
+    await _stamp(database, "e5a0c7f3b918")
+    with pytest.raises(RuntimeError, match="e5a0c7f3b918"):
+        await database.check_migrations()
+    await database.dispose()
+
+
+@pytest.mark.asyncio
+async def test_schema_is_created_only_on_an_unversioned_database(database, tmp_path):
+    await _stamp(database, "e5a0c7f3b918")
+    assert await database.create_schema_if_unversioned() is False
+    async with database._engine.connect() as conn:
+        assert await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_table_names()) == ["alembic_version"]
+    await database.dispose()
+
+    fresh = PostgresDatabase(f"sqlite+aiosqlite:///{tmp_path}/fresh.db")
+    assert await fresh.create_schema_if_unversioned() is True
+    async with fresh._engine.connect() as conn:
+        assert "outbox_events" in await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_table_names())
+    await fresh.dispose()
@@ -0,0 +1,150 @@
+from typing import Optional
+
+import mongomock
+import pytest
+import pytest_asyncio
+from beanie import Document, init_beanie
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+from odmantic import Model, SyncEngine
+from pymongo import DeleteMany, DeleteOne, InsertOne, UpdateMany, UpdateOne
+
+from app.core.repository.MongoRepository import DeleteOperation, InsertOperation, MongoCRUD, UpdateOperation
+from my_celery.database import MongoCRUD as sync
+
+
+class Note(Document):
+    title: str
+    body: Optional[str] = None
+    status: str = "draft"
+
+    class Settings:
+        name = "notes"
+
+
+class SyncNote(Model):
+    title: str
+    body: Optional[str] = None
+    status: str = "draft"
+
+
+class RecordingCollection:
+    """mongomock's bulk_write does not match the installed pymongo, record the requests instead."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def bulk_write(self, requests, ordered=True):
+        self.calls.append((requests, ordered))
+        return "result"
+
+
+@pytest_asyncio.fixture
+async def notes():
+    await init_beanie(database=AsyncMongoMockClient()["test"], document_models=[Note])
+    return MongoCRUD(Note)
+
+
+@pytest.mark.asyncio
+async def test_partial_update_sets_only_the_given_fields(notes):
+    note = await notes.create(Note(title="draft", body="keep me"))
+
+    updated = await notes.update(note.id, {"title": "final"})
+
+    assert isinstance(updated, Note)
+    assert (updated.title, updated.body, updated.status) == ("final", "keep me", "draft")
+    assert (await notes.get_by_id(note.id)).title == "final"
+
+
+@pytest.mark.asyncio
+async def test_update_with_projection_returns_the_raw_fields(notes):
+    note = await notes.create(Note(title="draft", body="old"))
+
+    updated = await notes.update(str(note.id), {"body": "new"}, projection={"body": 1})
+
+    assert updated == {"_id": note.id, "body": "new"}
+
+
+@pytest.mark.asyncio
+async def test_update_of_a_missing_document_returns_none(notes):
+    assert await notes.update(ObjectId(), {"title": "ghost"}) is None
+    assert await notes.count() == 0
+
+
+@pytest.mark.asyncio
+async def test_bulk_write_sends_mixed_operations_in_one_call(notes, monkeypatch):
+    collection = RecordingCollection()
+    monkeypatch.setattr(Note, "get_motor_collection", classmethod(lambda cls: collection))
+    note_id = ObjectId()
+
+    result = await notes.bulk_write([
+        InsertOperation({"title": "new"}),
+        UpdateOperation({"_id": note_id}, {"$set": {"status": "sent"}}),
+        UpdateOperation({"status": "draft"}, {"$set": {"status": "archived"}}, many=True),
+        DeleteOperation({"title": "old"}),
+    ], ordered=True)
+
+    assert result == "result"
+    (requests, ordered), = collection.calls
+    assert ordered is True
+    assert [type(r) for r in requests] == [InsertOne, UpdateOne, UpdateMany, DeleteOne]
+    assert requests[0]._doc["title"] == "new" and requests[0]._doc["status"] == "draft"
+    assert requests[1]._filter == {"_id": note_id}
+    assert requests[2]._doc == {"$set": {"status": "archived"}}
+    assert requests[3]._filter == {"title": "old"}
+
+
+@pytest.mark.asyncio
+async def test_bulk_write_without_operations_skips_the_round_trip(notes):
+    assert await notes.bulk_write([]) is None
+    with pytest.raises(TypeError):
+        await notes.bulk_write([object()])
+
+
+@pytest.fixture
+def sync_notes():
+    engine = SyncEngine(client=mongomock.MongoClient(), database="test")
+    return sync.MongoCRUD(SyncNote, engine)
+
+
+def _insert(crud, **fields):
+    note = SyncNote(**fields)
+    crud.engine.get_collection(SyncNote).insert_one(note.model_dump_doc())
+    return note
+
+
+def test_sync_partial_update_and_projection(sync_notes):
+    note = _insert(sync_notes, title="draft", body="keep me")
+
+    updated = sync_notes.update(note.id, {"title": "final"})
+    projected = sync_notes.update(note.id, {"status": "sent"}, projection={"status": 1, "_id": 0})
+
+    assert (updated.title, updated.body) == ("final", "keep me")
+    assert projected == {"status": "sent"}
+
+
+def test_sync_update_of_a_missing_document_returns_none(sync_notes):
+    assert sync_notes.update(ObjectId(), {"title": "ghost"}) is None
+    assert sync_notes.count() == 0
+
+
+def test_sync_bulk_write_builds_one_request_list(sync_notes, monkeypatch):
+    calls = []
+
+    class SyncRecordingCollection:
+        def bulk_write(self, requests, ordered=True):
+            calls.append((requests, ordered))
+
+    monkeypatch.setattr(sync_notes.engine, "get_collection", lambda model: SyncRecordingCollection())
+
+    sync_notes.bulk_write([
+        sync.InsertOperation({"title": "new"}),
+        sync.UpdateOperation({"title": "new"}, {"$set": {"status": "sent"}}, upsert=True),
+        sync.DeleteOperation({"status": "draft"}, many=True),
+    ])
+
+    (requests, ordered), = calls
+    assert ordered is False
+    assert [type(r) for r in requests] == [InsertOne, UpdateOne, DeleteMany]
+    assert requests[0]._doc["title"] == "new"
+    assert requests[1]._upsert is True
@@ -0,0 +1,161 @@
+import os
+
+import bson
+import pytest
+from pymongo.errors import AutoReconnect, BulkWriteError, ConnectionFailure, OperationFailure, WriteConcernError
+
+from app.core.repository.MongoWriteBehind import MongoWriteBehind
+
+
+class FakeCollection:
+    def __init__(self, failures=None):
+        self.batches = []
+        self.failures = list(failures or [])
+
+    async def insert_many(self, documents, ordered=True):
+        if self.failures:
+            raise self.failures.pop(0)
+        self.batches.append(list(documents))
+
+
+class FakeModel:
+    collection = None
+
+    @classmethod
+    def get_motor_collection(cls):
+        return cls.collection
+
+    @classmethod
+    def get_collection_name(cls):
+        return "messages"
+
+
+@pytest.fixture
+def collection():
+    FakeModel.collection = FakeCollection()
+    return FakeModel.collection
+
+
+@pytest.mark.asyncio
+async def test_submitted_documents_are_written_in_batches(collection, tmp_path):
+    buffer = MongoWriteBehind(FakeModel, max_batch_size=2, flush_interval=60, spill_dir=str(tmp_path))
+    await buffer.start()
+
+    futures = [await buffer.submit({"_id": i}) for i in range(3)]
+    await buffer.close()
+
+    assert [len(batch) for batch in collection.batches] == [2, 1]
+    assert [f.result() for f in futures] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_only_failed_documents_get_an_exception(collection, tmp_path):
+    collection.failures = [BulkWriteError({"writeErrors": [{"index": 1, "code": 11000, "errmsg": "dup"}]})]
+    buffer = MongoWriteBehind(FakeModel, flush_interval=60, spill_dir=str(tmp_path))
+    await buffer.start()
+
+    ok = await buffer.submit({"_id": 1})
+    duplicate = await buffer.submit({"_id": 2})
+    await buffer.flush()
+
+    assert ok.result() == 1
+    assert duplicate.exception().code == 11000
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_a_rejected_batch_fails_its_futures_and_later_batches_are_written(collection, tmp_path):
+    collection.failures = [OperationFailure("not authorized on messages", 13)]
+    buffer = MongoWriteBehind(FakeModel, max_batch_size=2, flush_interval=60, spill_dir=str(tmp_path))
+    await buffer.start()
+
+    futures = [await buffer.submit({"_id": i}) for i in range(3)]
+    await buffer.flush()
+
+    assert [f.exception().code for f in futures[:2]] == [13, 13]
+    assert futures[2].result() == 2
+    assert collection.batches == [[{"_id": 2}]] and buffer.pending == 0
+    await buffer.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_a_write_concern_error_fails_the_batch(collection, tmp_path):
+    collection.failures = [BulkWriteError({
+        "writeErrors": [{"index": 1, "code": 11000, "errmsg": "dup"}],
+        "writeConcernErrors": [{"code": 64, "errmsg": "waiting for replication timed out"}],
+    })]
+    buffer = MongoWriteBehind(FakeModel, flush_interval=60, spill_dir=str(tmp_path))
+    await buffer.start()
+
+    first = await buffer.submit({"_id": 1})
+    second = await buffer.submit({"_id": 2})
+    await buffer.flush()
+
+    assert isinstance(first.exception(), WriteConcernError) and first.exception().code == 64
+    assert second.exception().code == 11000
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_unwritten_documents_are_spilled_and_replayed(collection, tmp_path):
+    collection.failures = [AutoReconnect("down")] * 2
+    buffer = MongoWriteBehind(FakeModel, flush_interval=60, max_retries=1, spill_dir=str(tmp_path))
+    await buffer.start()
+
+    future = await buffer.submit({"_id": 7, "body": "hello"})
+    await buffer.close()
+
+    assert isinstance(future.exception(), ConnectionFailure)
+    assert collection.batches == []
+    assert [p.name for p in tmp_path.iterdir()] == [f"messages-{os.getpid()}.bson"]
+
+    await buffer.start()
+    assert collection.batches == [[{"_id": 7, "body": "hello"}]]
+    assert list(tmp_path.iterdir()) == []
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_a_batch_stays_queued_while_mongo_is_unreachable(collection, tmp_path):
+    collection.failures = [AutoReconnect("down")] * 2
+    buffer = MongoWriteBehind(FakeModel, flush_interval=60, max_retries=1, spill_dir=str(tmp_path))
+    await buffer.start()
+
+    future = await buffer.submit({"_id": 1})
+    with pytest.raises(ConnectionFailure):
+        await buffer.flush()
+    assert not future.done() and buffer.pending == 1
+
+    # the first attempt wrote it after all: the duplicate is not an error
+    collection.failures = [BulkWriteError({"writeErrors": [{"index": 0, "code": 11000, "errmsg": "dup"}]})]
+    await buffer.flush()
+    assert future.result() == 1
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_spill_files_of_other_processes_are_replayed(collection, tmp_path):
+    (tmp_path / "messages-1.bson").write_bytes(bson.encode({"_id": 1}) + bson.encode({"_id": 2}))
+    (tmp_path / "templates-1.bson").write_bytes(bson.encode({"_id": 3}))
+    buffer = MongoWriteBehind(FakeModel, flush_interval=60, spill_dir=str(tmp_path))
+
+    await buffer.start()
+    await buffer.close()
+
+    assert collection.batches == [[{"_id": 1}, {"_id": 2}]]
+    assert [p.name for p in tmp_path.iterdir()] == ["templates-1.bson"]
+
+
+@pytest.mark.asyncio
+async def test_without_buffering_a_failed_insert_raises(collection):
+    collection.failures = [AutoReconnect("down")]
+    buffer = MongoWriteBehind(FakeModel, enabled=False, max_retries=0)
+
+    with pytest.raises(ConnectionFailure):
+        await buffer.submit({"_id": 1})
+
+
+def test_enabling_requires_a_spill_directory():
+    with pytest.raises(ValueError):
+        MongoWriteBehind(FakeModel)
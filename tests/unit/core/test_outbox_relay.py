@@ -0,0 +1,109 @@
+import pytest
+import pytest_asyncio
+from sqlmodel import SQLModel, select
+
+from app.core.broker import OutboxRelay as relay_module
+from app.core.broker.OutboxRelay import OutboxRelay
+from app.core.broker.models.OutboxEvent import OutboxEvent
+from app.core.repository.OutboxRepository import OutboxRepository
+from app.core.storage.postgres import PostgresDatabase
+from tests.unit.core.test_base_publisher import FakeBroker, TaskPublisher
+
+
+class OtherPublisher(TaskPublisher):
+    exchange_name = "other_exchange"
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path):
+    db = PostgresDatabase(f"sqlite+aiosqlite:///{tmp_path}/outbox.db", pool_size=2)
+    async with db._engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all, tables=[OutboxEvent.__table__])
+    yield db
+    await db.dispose()
+
+
+async def enqueue(db, topic, payloads, tenant=None):
+    async with db.session() as session:
+        await OutboxRepository(session).add_events(topic, payloads, tenant=tenant)
+        await session.commit()
+
+
+async def remaining(db):
+    async with db.session() as session:
+        return (await session.exec(select(OutboxEvent.topic))).all()
+
+
+def payload(i):
+    return {"id": str(i), "task": "my_celery.tasks.test", "args": [{"n": i}]}
+
+
+@pytest.mark.asyncio
+async def test_rows_are_published_in_order_and_deleted(db):
+    broker = FakeBroker()
+    publisher = TaskPublisher(broker)
+    relay = OutboxRelay(db, [publisher], batch_size=3)
+    await enqueue(db, "test_exchange", [payload(i) for i in range(5)])
+    # rows for a topic this relay has no publisher for are left alone
+    await enqueue(db, "unknown_exchange", [payload(99)])
+
+    assert await relay.relay_batch() == 3
+    assert await relay.relay_batch() == 2
+    assert await relay.relay_batch() == 0
+
+    published = [body for channel in broker.connection.channels for _, body in channel.exchange.published]
+    assert sorted(body["id"] for body in published) == [str(i) for i in range(5)]
+    assert await remaining(db) == ["unknown_exchange"]
+
+
+class FailingPublisher(OtherPublisher):
+    async def publish_window(self, payloads, tenant=None):
+        raise ConnectionError("channel closed: PRECONDITION_FAILED")
+
+
+async def failures(db):
+    async with db.session() as session:
+        return (await session.exec(select(OutboxEvent.topic, OutboxEvent.attempts, OutboxEvent.last_error))).all()
+
+
+@pytest.mark.asyncio
+async def test_a_failing_topic_does_not_hold_back_the_others(db):
+    relay = OutboxRelay(db, [TaskPublisher(FakeBroker()), FailingPublisher(FakeBroker())])
+    await enqueue(db, "other_exchange", [payload(1)], tenant="tenant")
+    await enqueue(db, "test_exchange", [payload(2), payload(3)])
+
+    assert await relay.relay_batch() == 2
+
+    assert await failures(db) == [
+        ("other_exchange", 1, "ConnectionError: channel closed: PRECONDITION_FAILED"),
+    ]
+    # backed off: the next batch does not claim it again straight away
+    await enqueue(db, "test_exchange", [payload(4)])
+    assert await relay.relay_batch() == 1
+    assert await remaining(db) == ["other_exchange"]
+
+
+@pytest.mark.asyncio
+async def test_a_row_is_parked_after_max_attempts(db, monkeypatch):
+    monkeypatch.setattr(relay_module, "RETRY_DELAY_SECONDS", 0)
+    relay = OutboxRelay(db, [FailingPublisher(FakeBroker())], max_attempts=2)
+    await enqueue(db, "other_exchange", [payload(1)])
+
+    assert [await relay.relay_batch() for _ in range(3)] == [0, 0, 0]
+
+    assert [(topic, attempts) for topic, attempts, _ in await failures(db)] == [("other_exchange", 2)]
+    async with db.session() as session:
+        backlog = await OutboxRepository(session).backlog(relay.max_attempts)
+    assert [(row["rows"], row["retrying"], row["parked"]) for row in backlog] == [(1, 1, 1)]
+
+
+@pytest.mark.asyncio
+async def test_backlog_counts_rows_per_topic(db):
+    await enqueue(db, "test_exchange", [payload(i) for i in range(3)])
+    await enqueue(db, "other_exchange", [payload(3)], tenant="tenant")
+
+    async with db.session() as session:
+        backlog = await OutboxRepository(session).backlog(max_attempts=10)
+
+    assert [(row["topic"], row["rows"]) for row in backlog] == [("other_exchange", 1), ("test_exchange", 3)]
+    assert all(0 <= row["oldest_age_seconds"] < 60 for row in backlog)
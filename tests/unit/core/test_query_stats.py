@@ -0,0 +1,74 @@
+from typing import Optional
+
+import pytest
+import pytest_asyncio
+from sqlmodel import Field, SQLModel, select
+
+from app.core.storage.postgres import PostgresDatabase
+from app.core.storage.query_stats import NPlusOneQueryError, fingerprint, query_scope
+
+
+class CountedItem(SQLModel, table=True):
+    __tablename__ = "counted_items"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+
+
+@pytest_asyncio.fixture
+async def database(tmp_path):
+    db = PostgresDatabase(f"sqlite+aiosqlite:///{tmp_path}/stats.db", slow_query_ms=0)
+    async with db._engine.begin() as conn:
+        await conn.run_sync(CountedItem.__table__.create)
+    async with db._session_factory() as session:
+        session.add_all([CountedItem(name=f"item{i}") for i in range(5)])
+        await session.commit()
+    yield db
+    await db.dispose()
+
+
+def test_fingerprint_ignores_arguments():
+    assert fingerprint("SELECT * FROM t WHERE a = $1 AND b IN ($2, $3, $4)") == \
+        fingerprint("SELECT  *\nFROM t WHERE a = $1 AND b IN ($2)")
+    assert fingerprint("SELECT * FROM t WHERE name = 'x''y' AND n > 42 LIMIT %(param_1)s") == \
+        "SELECT * FROM t WHERE name = ? AND n > ? LIMIT ?"
+    assert fingerprint("INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)") == "INSERT INTO t (a, b) VALUES (?, ?)"
+    assert fingerprint("SELECT x::text FROM messages_2025_03 WHERE id = :id") == \
+        "SELECT x::text FROM messages_2025_03 WHERE id = ?"
+
+
+@pytest.mark.asyncio
+async def test_scope_counts_statements(database):
+    with query_scope() as queries:
+        async with database._session_factory() as session:
+            await session.exec(select(CountedItem))
+            for item_id in range(1, 4):
+                await session.exec(select(CountedItem).where(CountedItem.id == item_id))
+    summary = queries.summary()
+    assert summary["db_queries"] == 4
+    assert summary["db_distinct_queries"] == 2
+    assert list(summary["db_repeated_queries"].values()) == [3]
+    assert summary["db_slow_queries"]
+
+
+@pytest.mark.asyncio
+async def test_n_plus_one_fails_scope(database):
+    with pytest.raises(NPlusOneQueryError, match="4x"):
+        with query_scope(max_repeats=3):
+            async with database._session_factory() as session:
+                for item_id in range(1, 5):
+                    await session.exec(select(CountedItem).where(CountedItem.id == item_id))
+
+    with query_scope(max_repeats=3):
+        async with database._session_factory() as session:
+            await session.exec(select(CountedItem).where(CountedItem.id.in_([1, 2, 3, 4])))
+
+
+@pytest.mark.asyncio
+async def test_scope_counts_pool_checkouts(database):
+    with query_scope() as queries:
+        async with database._session_factory() as session:
+            await session.exec(select(CountedItem))
+    assert queries.summary()["db_checkouts"] == 1
+    status = database.pool_status()["primary"]
+    assert status["checkouts"] >= 2 and status["checked_out"] == 0
@@ -0,0 +1,92 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config.RateLimitMiddleWare import RedisRateLimitMiddleware
+
+
+class FakeScript:
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    async def __call__(self, keys, args):
+        self.calls.append((keys, args))
+        return self.result
+
+
+class FakeRedis:
+    def __init__(self, script):
+        self.script = script
+
+    def register_script(self, _lua):
+        return self.script
+
+
+class FakeRedisService:
+    def __init__(self, script):
+        self._redis = FakeRedis(script)
+
+    async def get_redis(self):
+        return self._redis
+
+
+def build_client(script: FakeScript) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/v1/message/get_by_conversation")
+    async def messages():
+        return {"ok": True}
+
+    @app.post("/v1/webhook")
+    async def webhook():
+        return {"status": "received"}
+
+    app.add_middleware(
+        RedisRateLimitMiddleware,
+        redis_service=FakeRedisService(script),
+        limit=5,
+        window_size=60,
+    )
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("/v1/message/text", "message"),
+        ("/v1/team_inbox/get_conversations", "team_inbox"),
+        ("/", "root"),
+        ("/download-url", "download-url"),
+    ],
+)
+def test_route_group(path, expected):
+    assert RedisRateLimitMiddleware.route_group(path) == expected
+
+
+def test_allowed_request_sets_headers():
+    script = FakeScript([1, 3, 0])
+    response = build_client(script).get("/v1/message/get_by_conversation")
+
+    assert response.status_code == 200
+    assert response.headers["X-RateLimit-Limit"] == "5"
+    assert response.headers["X-RateLimit-Remaining"] == "3"
+    keys, _ = script.calls[0]
+    assert keys == ["ratelimit:user:{ip:testclient}:message"]
+
+
+def test_rejected_request_returns_retry_after():
+    script = FakeScript([0, 0, 1500])
+    response = build_client(script).get("/v1/message/get_by_conversation")
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
+    assert response.json()["error"]["error_code"] == "TOO_MANY_REQUESTS"
+
+
+def test_webhook_is_exempt():
+    script = FakeScript([0, 0, 1500])
+    response = build_client(script).post("/v1/webhook")
+
+    assert response.status_code == 200
+    assert script.calls == []
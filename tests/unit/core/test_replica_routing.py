@@ -0,0 +1,144 @@
+import asyncio
+import contextvars
+from typing import Optional
+
+import pytest
+import pytest_asyncio
+from sqlmodel import Field, SQLModel, select
+
+from app.core.decorators.read_only_decorator import read_only
+from app.core.storage.postgres import PostgresDatabase, ReplicaRouter
+
+
+class RoutedItem(SQLModel, table=True):
+    __tablename__ = "routed_items"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    source: str
+
+
+class ItemRepository:
+    def __init__(self, session):
+        self.session = session
+
+    async def names(self):
+        return (await self.session.exec(select(RoutedItem.source))).all()
+
+    @read_only
+    async def listing(self):
+        return await self.names()
+
+
+@pytest_asyncio.fixture
+async def database(tmp_path, monkeypatch):
+    lag = {"seconds": 0.0}
+
+    async def fake_lag(engine):
+        return lag["seconds"]
+
+    monkeypatch.setattr(ReplicaRouter, "_lag", staticmethod(fake_lag))
+    db = PostgresDatabase(
+        f"sqlite+aiosqlite:///{tmp_path}/primary.db",
+        replica_urls=f"sqlite+aiosqlite:///{tmp_path}/replica.db",
+        pool_size=2, replica_pool_size=1,
+        max_replica_lag=1.0, replica_lag_check_interval=0,
+    )
+    for engine, source in [(db._engine, "primary"), (db.replica_engines[0], "replica")]:
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all, tables=[RoutedItem.__table__])
+            await conn.execute(RoutedItem.__table__.insert().values(source=source))
+    yield db, lag
+    await db.dispose()
+
+
+@pytest.mark.asyncio
+async def test_read_only_methods_go_to_the_replica_and_others_stay_on_the_primary(database):
+    db, _ = database
+    async with db._session_factory() as session:
+        repository = ItemRepository(session)
+        assert await repository.listing() == ["replica"]
+        assert await repository.names() == ["primary"]
+
+
+@pytest.mark.asyncio
+async def test_reads_after_a_write_stay_on_the_primary(database):
+    db, _ = database
+    async with db._session_factory() as session:
+        session.add(RoutedItem(source="written"))
+        await session.flush()
+        assert await ItemRepository(session).listing() == ["primary", "written"]
+
+
+def in_new_request(coro):
+    """Run like a separate request: a task with a fresh context."""
+    return asyncio.create_task(coro, context=contextvars.Context())
+
+
+@pytest.mark.asyncio
+async def test_a_commit_keeps_the_request_on_the_primary_but_not_later_requests(database):
+    db, _ = database
+    async with db._session_factory() as session:
+        repository = ItemRepository(session)
+        session.add(RoutedItem(source="written"))
+        await session.commit()
+        assert await repository.listing() == ["primary", "written"]
+        assert await in_new_request(repository.listing()) == ["replica"]
+
+
+@pytest.mark.asyncio
+async def test_the_write_flag_is_cleared_on_commit_and_rollback(database):
+    db, _ = database
+    db._replica_router.max_lag = 0
+    async with db._session_factory() as session:
+        repository = ItemRepository(session)
+        session.add(RoutedItem(source="written"))
+        await session.commit()
+        assert await repository.listing() == ["replica"]
+
+        session.add(RoutedItem(source="discarded"))
+        await session.flush()
+        await session.rollback()
+        assert await repository.listing() == ["replica"]
+
+
+@pytest.mark.asyncio
+async def test_read_only_scope_of_one_request_does_not_leak_into_another(database):
+    db, _ = database
+    inside, release = asyncio.Event(), asyncio.Event()
+    async with db._session_factory() as session:
+        repository = ItemRepository(session)
+
+        @read_only
+        async def waiting_listing(self):
+            inside.set()
+            await release.wait()
+            return await self.names()
+
+        slow = in_new_request(waiting_listing(repository))
+        await inside.wait()
+        assert await in_new_request(repository.names()) == ["primary"]
+        release.set()
+        assert await slow == ["replica"]
+
+
+@pytest.mark.asyncio
+async def test_a_lagging_replica_is_taken_out_of_rotation(database):
+    db, lag = database
+    lag["seconds"] = 5.0
+    async with db._session_factory() as session:
+        assert await ItemRepository(session).listing() == ["primary"]
+    lag["seconds"] = 0.0
+    async with db._session_factory() as session:
+        assert await ItemRepository(session).listing() == ["replica"]
+
+
+@pytest.mark.asyncio
+async def test_without_replicas_read_only_methods_use_the_primary(tmp_path):
+    db = PostgresDatabase(f"sqlite+aiosqlite:///{tmp_path}/primary.db", pool_size=1)
+    async with db._engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all, tables=[RoutedItem.__table__])
+        await conn.execute(RoutedItem.__table__.insert().values(source="primary"))
+    async with db._session_factory() as session:
+        assert await ItemRepository(session).listing() == ["primary"]
+    assert db.replica_engines == []
+    await db.dispose()
@@ -0,0 +1,115 @@
+import time
+
+import pytest
+
+from app.core.services.BroadcastFairScheduler import BroadcastFairScheduler, chunk_priorities
+from my_celery.api.tenant_scheduler import TenantScheduler
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")  # fakeredis runs EVAL through lupa
+
+PENDING = "broadcast:{tenants}:pending"
+
+
+class FakeRedisService:
+    def __init__(self, server):
+        self.redis = fakeredis.aioredis.FakeRedis(server=server)
+
+    async def get_redis(self):
+        return self.redis
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def publisher_side(server):
+    return BroadcastFairScheduler(FakeRedisService(server))
+
+
+@pytest.fixture
+def worker_side(server):
+    scheduler = TenantScheduler(client=fakeredis.FakeRedis(server=server))
+    # a tenant may hold 2 of the 4 worker slots while another one waits
+    scheduler.capacity, scheduler.max_share, scheduler.lease_ms = 4, 0.5, 60_000
+    return scheduler
+
+
+def _pending(worker_side):
+    return {tenant.decode(): int(count) for tenant, count in worker_side.client.hgetall(PENDING).items()}
+
+
+@pytest.mark.asyncio
+async def test_reserve_counts_pending_chunks_and_release_never_goes_negative(publisher_side, worker_side):
+    assert await publisher_side.reserve("a", 3) == chunk_priorities(0, 3)
+    assert await publisher_side.reserve("a", 2) == chunk_priorities(3, 2)
+
+    await publisher_side.release("a", 10)
+
+    assert _pending(worker_side) == {"a": 0}
+
+
+@pytest.mark.asyncio
+async def test_a_tenant_at_its_share_waits_while_another_tenant_has_work(publisher_side, worker_side):
+    await publisher_side.reserve("big", 4)
+
+    # nobody else is waiting: big may take every slot
+    assert [worker_side.admit("big", f"big-{i}") for i in range(3)] == [True, True, True]
+
+    await publisher_side.reserve("small", 1)
+    assert worker_side.admit("big", "big-3") is False
+    assert worker_side.admit("small", "small-0") is True
+    assert _pending(worker_side) == {"big": 1, "small": 0}
+    depths = await publisher_side.queue_depths()
+    assert depths["big"] == {"pending": 1, "running": 3, "weight": 1.0}
+
+
+@pytest.mark.asyncio
+async def test_weight_raises_a_tenants_share(publisher_side, worker_side):
+    await publisher_side.set_weight("big", 2)
+    await publisher_side.reserve("big", 5)
+    await publisher_side.reserve("small", 1)
+
+    assert [worker_side.admit("big", f"big-{i}") for i in range(5)] == [True, True, True, True, False]
+
+
+@pytest.mark.asyncio
+async def test_an_admitted_chunk_is_not_turned_away_on_redelivery(publisher_side, worker_side):
+    await publisher_side.reserve("big", 3)
+    await publisher_side.reserve("small", 1)
+    assert [worker_side.admit("big", f"big-{i}") for i in range(2)] == [True, True]
+
+    assert worker_side.admit("big", "big-1") is True
+
+
+@pytest.mark.asyncio
+async def test_expired_leases_free_their_slots(publisher_side, worker_side):
+    worker_side.lease_ms = 1
+    await publisher_side.reserve("big", 3)
+    await publisher_side.reserve("small", 1)
+    assert [worker_side.admit("big", f"big-{i}") for i in range(2)] == [True, True]
+
+    time.sleep(0.01)  # both workers died without releasing
+
+    assert worker_side.admit("big", "big-2") is True
+
+
+@pytest.mark.asyncio
+async def test_release_frees_the_slot_and_a_retry_is_pending_again(publisher_side, worker_side):
+    await publisher_side.reserve("a", 1)
+    assert worker_side.admit("a", "chunk") is True
+
+    worker_side.release("a", "chunk", requeued=True)
+
+    assert worker_side.client.zcard("broadcast:{tenants}:running:a") == 0
+    assert _pending(worker_side) == {"a": 1}
+
+
+def test_only_the_first_delivery_of_a_chunk_counts(worker_side):
+    assert worker_side.first_delivery("chunk") is True
+    assert worker_side.first_delivery("chunk") is False
+
+    worker_side.discard("a")
+    assert _pending(worker_side) == {"a": 0}
@@ -0,0 +1,59 @@
+from sqlalchemy import Column, MetaData, String, Table, select
+from sqlalchemy.dialects import postgresql
+
+from app.core.repository.TrigramSearch import (
+    digits_prefix,
+    escape_like,
+    phone_digits,
+    similarity_rank,
+    text_match,
+)
+
+contacts = Table(
+    "contacts", MetaData(),
+    Column("name", String), Column("country_code", String), Column("phone_number", String),
+)
+
+
+def compiled(statement):
+    result = statement.compile(dialect=postgresql.dialect())
+    return str(result), list(result.params.values())
+
+
+def test_long_terms_are_substring_matches_and_short_terms_are_anchored():
+    sql, params = compiled(select(contacts).where(text_match([contacts.c.name], " ali ")))
+    assert "contacts.name ILIKE" in sql
+    assert params == ["%ali%"]
+    _, params = compiled(select(contacts).where(text_match([contacts.c.name], "al")))
+    assert params == ["al%"]
+
+
+def test_like_wildcards_in_the_term_match_literally():
+    assert escape_like("50%_off\\") == "50\\%\\_off\\\\"
+    sql, params = compiled(select(contacts).where(text_match([contacts.c.name], "50%")))
+    assert "ESCAPE" in sql
+    assert params == ["%50\\%%"]
+
+
+def test_rank_orders_by_best_similarity_across_columns():
+    sql, params = compiled(select(contacts).order_by(similarity_rank([contacts.c.name, contacts.c.phone_number], " ali")))
+    assert "ORDER BY greatest(similarity(contacts.name, " in sql
+    assert "similarity(contacts.phone_number, " in sql
+    assert sql.endswith("DESC NULLS LAST")
+    assert params == ["ali", "ali"]
+
+
+def test_phone_queries_are_reduced_to_digits():
+    assert phone_digits("+1 (555) 010-2") == "15550102"
+    assert phone_digits("555") == "555"
+    assert phone_digits("55") is None
+    assert phone_digits("alice 555") is None
+
+
+def test_digits_prefix_keeps_the_indexed_expression_in_the_sql_text():
+    expressions = [contacts.c.phone_number, contacts.c.country_code + contacts.c.phone_number]
+    sql, params = compiled(select(contacts).where(digits_prefix(expressions, "1555")))
+    # only the prefix is bound, the regexp_replace arguments are literal
+    assert "regexp_replace(contacts.phone_number, '\\D', '', 'g') LIKE " in sql
+    assert "regexp_replace(contacts.country_code || contacts.phone_number, '\\D', '', 'g') LIKE " in sql
+    assert params == ["1555%", "1555%"]
@@ -0,0 +1,135 @@
+import pytest
+from celery.exceptions import Retry
+
+from app.core.exceptions.custom_exceptions.TooManyRequestsException import TooManyRequestsException
+from app.core.services.WhatsAppThroughputGovernor import RESERVE_LUA, WhatsAppThroughputGovernor
+from my_celery.api.throughput_governor import ThroughputExceeded
+from my_celery.tasks.base_task import THROTTLE_MAX_RETRIES
+from my_celery.tasks.template_broadcast import template_broadcast_batch
+
+
+class FakeScript:
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    async def __call__(self, keys, args):
+        self.calls.append((keys, args))
+        return self.result
+
+
+class FakeRedis:
+    def __init__(self, scripts):
+        self.scripts = scripts
+
+    def register_script(self, lua):
+        return self.scripts[lua]
+
+
+class FakeRedisService:
+    def __init__(self, scripts):
+        self._redis = FakeRedis(scripts)
+
+    async def get_redis(self):
+        return self._redis
+
+
+@pytest.mark.asyncio
+async def test_acquire_reserves_a_number_slot_and_checks_the_pair_cooldown():
+    reserve = FakeScript([1, 0])
+    governor = WhatsAppThroughputGovernor(FakeRedisService({RESERVE_LUA: reserve}), headroom=0.5)
+
+    await governor.acquire("123", "+962790000000")
+
+    keys, args = reserve.calls[0]
+    assert keys[0] == "whatsapp:throughput:{123}:tat"
+    assert keys[1] == "whatsapp:throughput:{123}:pair:+962790000000"
+    assert args[0] == pytest.approx(1000 / 40)
+    assert args[2] == 1
+
+
+@pytest.mark.asyncio
+async def test_interactive_sends_skip_the_pair_cooldown():
+    reserve = FakeScript([1, 0])
+    governor = WhatsAppThroughputGovernor(FakeRedisService({RESERVE_LUA: reserve}))
+
+    await governor.acquire("123", "+962790000000", interactive=True)
+
+    assert reserve.calls[0][1][2] == 0
+
+
+def test_max_wait_covers_the_pair_interval():
+    governor = WhatsAppThroughputGovernor(FakeRedisService({}), pair_rate_seconds=6, max_wait_seconds=2)
+
+    assert governor.max_wait_ms == 6000
+
+
+@pytest.mark.asyncio
+async def test_acquire_raises_when_wait_exceeds_max():
+    reserve = FakeScript([0, 7200])
+    governor = WhatsAppThroughputGovernor(FakeRedisService({RESERVE_LUA: reserve}))
+
+    with pytest.raises(TooManyRequestsException) as exc:
+        await governor.acquire("123", "+962790000000")
+    assert exc.value.details["retry_after"] == 8
+
+
+@pytest.mark.parametrize(
+    "body, expected",
+    [
+        ({"error": {"code": 131056, "message": "pair rate limit hit"}}, 131056),
+        ({"error": {"code": "130429"}}, 130429),
+        ({"raw": "gateway timeout"}, None),
+        (None, None),
+    ],
+)
+def test_extract_error_code(body, expected):
+    assert WhatsAppThroughputGovernor.extract_error_code(body) == expected
+
+
+class FakeSignature:
+    def __init__(self, options):
+        self.options = options
+        self.sent = False
+
+    def apply_async(self):
+        self.sent = True
+
+
+def _throttled_task(monkeypatch, throttle_retries):
+    task = template_broadcast_batch._get_current_object()
+    signatures = []
+
+    def signature_from_request(request, args=None, kwargs=None, **options):
+        signatures.append(FakeSignature({"args": args, **options}))
+        return signatures[-1]
+
+    monkeypatch.setattr(task, "signature_from_request", signature_from_request)
+    task.push_request(id="task-1", retries=2, called_directly=False,
+                      headers={"throttle_retries": throttle_retries}, args=[{}], kwargs={})
+    return task, signatures
+
+
+def test_throttling_retries_do_not_use_up_max_retries(monkeypatch):
+    task, signatures = _throttled_task(monkeypatch, throttle_retries=3)
+    try:
+        with pytest.raises(Retry):
+            task.retry_task(exc=ThroughputExceeded("123", 2), args=[{"recipients": ["+962790000000"]}])
+    finally:
+        task.pop_request()
+
+    options = signatures[0].options
+    assert signatures[0].sent
+    assert options["retries"] == 2
+    assert options["headers"]["throttle_retries"] == 4
+    assert options["args"] == [{"recipients": ["+962790000000"]}]
+
+
+def test_throttling_gives_up_after_its_own_budget(monkeypatch):
+    task, signatures = _throttled_task(monkeypatch, throttle_retries=THROTTLE_MAX_RETRIES)
+    try:
+        with pytest.raises(ThroughputExceeded):
+            task.retry_task(exc=ThroughputExceeded("123", 2))
+    finally:
+        task.pop_request()
+    assert signatures == []
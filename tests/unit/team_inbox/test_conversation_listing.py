@@ -0,0 +1,145 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.annotations.models.Attribute import Attribute  # noqa: F401 (mapper registry)
+from app.annotations.models.Contact import Contact  # noqa: F401
+from app.annotations.models.ContactAttributeLink import ContactAttributeLink  # noqa: F401
+from app.annotations.models.ContactNoteLink import ContactNoteLink  # noqa: F401
+from app.annotations.models.ContactTagLink import ContactTagLink  # noqa: F401
+from app.annotations.models.Note import Note  # noqa: F401
+from app.annotations.models.Tag import Tag  # noqa: F401
+from app.user_management.auth.models.RefreshToken import RefreshToken  # noqa: F401
+from app.user_management.auth.models.Role import Role  # noqa: F401
+from app.user_management.auth.models.UserRole import UserRole  # noqa: F401
+from app.user_management.user.models.Client import Client  # noqa: F401
+from app.user_management.user.models.Team import Team  # noqa: F401
+from app.user_management.user.models.User import User  # noqa: F401
+from app.user_management.user.models.UserTeam import UserTeam
+from app.whatsapp.broadcast.models.BroadCast import BroadCast  # noqa: F401
+from app.whatsapp.business_profile.v1.models.BusinessProfile import BusinessProfile  # noqa: F401
+from app.whatsapp.team_inbox.models.Assignment import Assignment
+from app.whatsapp.team_inbox.models.Conversation import Conversation
+from app.whatsapp.team_inbox.models.ConversationTeamLink import ConversationTeamLink
+from app.whatsapp.team_inbox.models.MessageMeta import MessageMeta
+from app.whatsapp.team_inbox.repositories.ConversationRepository import ConversationRepository
+from app.whatsapp.team_inbox.repositories.MessageRepository import MessageRepository
+from app.whatsapp.template.models.TemplateMeta import TemplateMeta  # noqa: F401
+from app.chat_bot.models.ChatBotMeta import ChatBotMeta  # noqa: F401
+
+TABLES = [model.__table__ for model in (Assignment, Conversation, ConversationTeamLink, UserTeam, MessageMeta)]
+NOW = datetime(2025, 3, 1, 12, tzinfo=timezone.utc)
+
+
+def _greatest(*values):
+    # Postgres greatest() ignores NULLs
+    present = [value for value in values if value is not None]
+    return max(present) if present else None
+
+
+@pytest_asyncio.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    event.listen(engine.sync_engine, "connect",
+                 lambda dbapi_connection, _: dbapi_connection.create_function("greatest", -1, _greatest))
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all, tables=TABLES)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+    await engine.dispose()
+
+
+async def _conversation(session, last_message_at, team_id=None, client_id=None):
+    conversation = Conversation(
+        contact_id=uuid.uuid4(), assignment_id=uuid.uuid4(), client_id=client_id or uuid.uuid4(),
+        last_message_at=last_message_at, last_message_preview="hello",
+    )
+    session.add(conversation)
+    if team_id:
+        session.add(ConversationTeamLink(conversation_id=conversation.id, team_id=team_id))
+    await session.commit()
+    return conversation
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_walk_ties_on_last_message_at_without_gaps(session):
+    user_id, team_id = uuid.uuid4(), uuid.uuid4()
+    session.add(UserTeam(user_id=user_id, team_id=team_id))
+    # three conversations share a timestamp, so the page boundary falls inside the tie
+    times = [NOW, NOW, NOW, NOW - timedelta(minutes=1), NOW - timedelta(minutes=2)]
+    conversations = [await _conversation(session, at, team_id) for at in times]
+    await _conversation(session, NOW + timedelta(minutes=1))  # not visible to the user's teams
+    repository = ConversationRepository(session)
+
+    seen, pages, cursor = [], [], {}
+    while True:
+        page = await repository.get_user_conversations(user_id, limit=2, **cursor)
+        pages.append((len(page["data"]), page["has_more"]))
+        seen.extend(page["data"])
+        if not page["has_more"]:
+            break
+        last = page["data"][-1]
+        cursor = {"before_last_message_at": last.last_message_at, "before_id": last.id}
+
+    expected = sorted(conversations, key=lambda c: (c.last_message_at, c.id), reverse=True)
+    assert [c.id for c in seen] == [c.id for c in expected]
+    assert pages == [(2, True), (2, True), (1, False)]
+
+
+@pytest.mark.asyncio
+async def test_has_more_is_false_when_the_page_is_exactly_full(session):
+    user_id, team_id = uuid.uuid4(), uuid.uuid4()
+    session.add(UserTeam(user_id=user_id, team_id=team_id))
+    for minutes in range(2):
+        await _conversation(session, NOW - timedelta(minutes=minutes), team_id)
+
+    page = await ConversationRepository(session).get_user_conversations(user_id, limit=2)
+
+    assert len(page["data"]) == 2 and page["has_more"] is False
+
+
+@pytest.mark.asyncio
+async def test_create_moves_last_message_columns_forward_only(session):
+    conversation = await _conversation(session, NOW)
+    repository = MessageRepository(session)
+
+    await repository.create(
+        MessageMeta(message_type="text", conversation_id=conversation.id, is_from_contact=True,
+                    created_at=NOW + timedelta(minutes=5)),
+        preview="newer",
+    )
+    await session.refresh(conversation)
+    assert conversation.last_message_at.replace(tzinfo=timezone.utc) == NOW + timedelta(minutes=5)
+    assert conversation.last_inbound_at.replace(tzinfo=timezone.utc) == NOW + timedelta(minutes=5)
+    assert conversation.last_message_preview == "newer"
+
+    # a late, out-of-order insert must not rewind anything
+    await repository.create(
+        MessageMeta(message_type="text", conversation_id=conversation.id, is_from_contact=True,
+                    created_at=NOW - timedelta(hours=1)),
+        preview="older",
+    )
+    await session.refresh(conversation)
+    assert conversation.last_message_at.replace(tzinfo=timezone.utc) == NOW + timedelta(minutes=5)
+    assert conversation.last_inbound_at.replace(tzinfo=timezone.utc) == NOW + timedelta(minutes=5)
+    assert conversation.last_message_preview == "newer"
+
+
+@pytest.mark.asyncio
+async def test_outbound_message_without_preview_keeps_the_preview(session):
+    conversation = await _conversation(session, NOW)
+
+    await MessageRepository(session).create(
+        MessageMeta(message_type="template", conversation_id=conversation.id, created_at=NOW + timedelta(minutes=1)),
+    )
+    await session.refresh(conversation)
+
+    assert conversation.last_message_at.replace(tzinfo=timezone.utc) == NOW + timedelta(minutes=1)
+    assert conversation.last_message_preview == "hello"
+    assert conversation.last_inbound_at is None
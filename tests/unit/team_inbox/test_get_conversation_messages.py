@@ -0,0 +1,99 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import mongomock
+import pytest
+import pytest_asyncio
+from beanie import init_beanie
+from beanie.odm.utils.dump import get_dict
+from mongomock_motor import AsyncMongoMockClient
+
+from app.core.repository.MongoRepository import MongoCRUD
+from app.whatsapp.team_inbox.models.Message import Message
+from app.whatsapp.team_inbox.repositories.MessageArchiveRepository import MessageArchiveRepository
+from app.whatsapp.team_inbox.repositories.MessageBucketRepository import MessageBucketRepository
+from app.whatsapp.team_inbox.v1.use_case.GetConversationMessages import GetConversationMessages
+
+NOW = datetime(2025, 3, 1, 12, tzinfo=timezone.utc)
+CLIENT_ID = uuid.uuid4()
+
+
+@pytest.fixture(autouse=True)
+def native_uuids(monkeypatch):
+    # mongomock validates documents with the default (unspecified) UUID
+    # representation, the real clients are configured with "standard"
+    monkeypatch.setattr(mongomock.collection, "BSON", None)
+
+
+@pytest_asyncio.fixture
+async def conversation():
+    await init_beanie(database=AsyncMongoMockClient()["test"], document_models=[Message])
+    return SimpleNamespace(id=uuid.uuid4(), client_id=CLIENT_ID, created_at=NOW - timedelta(days=400))
+
+
+class FakeConversations:
+    def __init__(self, conversation):
+        self.conversation = conversation
+
+    async def get(self, conversation_id):
+        return self.conversation
+
+
+class FakeUsers:
+    async def get(self, user_id):
+        return SimpleNamespace(id=user_id, client_id=CLIENT_ID)
+
+
+def _message(conversation, minutes, index):
+    return Message(id=uuid.uuid4(), message_type="text", conversation_id=conversation.id,
+                   wa_message_id=f"wamid.{index}", content={"text": f"message {index}"},
+                   created_at=NOW - timedelta(minutes=minutes))
+
+
+async def _archive(conversation, minutes, index):
+    # as archive_messages copies it: UUIDs stored as binary subtype 4
+    doc = get_dict(_message(conversation, minutes, index), to_db=True)
+    await Message.get_motor_collection().database["messages_archive_2025_02"].insert_one(doc)
+
+
+def _use_case(conversation, mongo_crud):
+    return GetConversationMessages(
+        conversation_service=FakeConversations(conversation),
+        user_service=FakeUsers(),
+        mongo_crud=mongo_crud,
+        message_archive=MessageArchiveRepository(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_pages_leave_out_search_text(conversation):
+    await Message.insert_many([_message(conversation, minutes, minutes) for minutes in range(2)])
+
+    page = await _use_case(conversation, MongoCRUD(Message)).execute(str(uuid.uuid4()), str(conversation.id), limit=2)
+
+    assert [m["content"]["text"] for m in page["data"]] == ["message 0", "message 1"]
+    assert all("search_text" not in m for m in page["data"])
+
+
+@pytest.mark.asyncio
+async def test_archive_read_through_leaves_out_search_text(conversation):
+    for index in range(2):
+        await _archive(conversation, 60 * 24 * 20 + index, index)
+
+    page = await _use_case(conversation, MongoCRUD(Message)).execute(str(uuid.uuid4()), str(conversation.id), limit=5)
+
+    assert [m["content"]["text"] for m in page["data"]] == ["message 0", "message 1"]
+    assert all("search_text" not in m for m in page["data"])
+
+
+@pytest.mark.asyncio
+async def test_bucket_pages_leave_out_search_text(conversation):
+    repository = MessageBucketRepository(bucket_size=2)
+    for minutes in range(3):
+        await repository.create(_message(conversation, minutes, minutes))
+
+    page = await _use_case(conversation, repository).execute(str(uuid.uuid4()), str(conversation.id), limit=3)
+
+    assert [m["content"]["text"] for m in page["data"]] == ["message 0", "message 1", "message 2"]
+    assert all("search_text" not in m for m in page["data"])
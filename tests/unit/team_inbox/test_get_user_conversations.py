@@ -0,0 +1,104 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.whatsapp.team_inbox.v1.use_case.GetUserConversations import GetUserConversations
+
+NOW = datetime(2025, 3, 1, 12, tzinfo=timezone.utc)
+
+
+class Wire:
+    """Counts calls that would leave the process (Postgres queries, Redis round trips)."""
+
+    def __init__(self):
+        self.calls = []
+
+    def trip(self, name):
+        self.calls.append(name)
+
+
+class FakeUsers:
+    def __init__(self, wire):
+        self.wire = wire
+
+    async def get(self, user_id):
+        self.wire.trip("user")
+        return SimpleNamespace(id=user_id, client_id=uuid.uuid4())
+
+
+class FakeConversations:
+    def __init__(self, wire, page, has_more):
+        self.wire, self.page, self.has_more = wire, page, has_more
+
+    async def get_user_conversations(self, *args, **kwargs):
+        self.wire.trip("conversations")
+        return {"data": self.page, "has_more": self.has_more}
+
+
+class FakeContacts:
+    def __init__(self, wire, missing=()):
+        self.wire, self.missing = wire, set(missing)
+
+    async def get_summaries_by_ids(self, ids):
+        self.wire.trip("contacts")
+        return {
+            contact_id: SimpleNamespace(id=contact_id, name="Contact", phone_number="5550100", country_code="+1")
+            for contact_id in ids if contact_id not in self.missing
+        }
+
+
+class FakeRedis:
+    def __init__(self, wire):
+        self.wire = wire
+
+    async def get_many_with_hashes(self, keys, hash_keys):
+        self.wire.trip("redis")
+        return [None] * len(keys), [{"unread_count": 2}] * len(hash_keys)
+
+
+def _page(size):
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(), contact_id=uuid.uuid4(), client_id=uuid.uuid4(), status="open",
+            assignment=SimpleNamespace(user_id=uuid.uuid4()),
+            last_message_at=NOW - timedelta(minutes=i), last_message_preview=f"message {i}",
+        )
+        for i in range(size)
+    ]
+
+
+def _use_case(wire, page, has_more=False, missing=()):
+    return GetUserConversations(
+        conversation_service=FakeConversations(wire, page, has_more),
+        user_service=FakeUsers(wire),
+        contact_service=FakeContacts(wire, missing),
+        message_service=None,
+        redis=FakeRedis(wire),
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [1, 25, 100])
+async def test_round_trips_do_not_grow_with_page_size(size):
+    wire = Wire()
+
+    result = await _use_case(wire, _page(size)).excute(str(uuid.uuid4()), limit=size)
+
+    assert wire.calls == ["user", "conversations", "contacts", "redis"]
+    assert len(result["data"]) == size
+    assert all(row.unread_count == 2 for row in result["data"])
+
+
+@pytest.mark.asyncio
+async def test_missing_contact_is_skipped_and_cursor_points_at_the_last_row():
+    wire, page = Wire(), _page(3)
+
+    result = await _use_case(wire, page, has_more=True, missing={page[1].contact_id}).excute(str(uuid.uuid4()), limit=3)
+
+    assert [row.id for row in result["data"]] == [page[0].id, page[2].id]
+    assert result["cursor"] == {
+        "before_last_message_at": page[-1].last_message_at.isoformat(),
+        "before_id": str(page[-1].id),
+    }
@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from app.whatsapp.team_inbox.utils.message_archive import archive_collection_name, archive_month
+
+
+def test_archive_collections_are_monthly_and_sortable():
+    name = archive_collection_name(datetime(2025, 3, 31, 23, 59))
+    assert name == "messages_archive_2025_03"
+    assert archive_month(name) == 202503
+    assert archive_month("messages_archive_2024_12") < archive_month(name)
+
+
+def test_other_collections_are_not_archives():
+    assert archive_month("messages") is None
+    assert archive_month("messages_archive_latest") is None
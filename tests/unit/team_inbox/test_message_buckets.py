@@ -0,0 +1,181 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import mongomock
+import pytest
+import pytest_asyncio
+from beanie import init_beanie
+from bson import Binary
+from mongomock_motor import AsyncMongoMockClient
+from odmantic import SyncEngine
+
+from app.whatsapp.team_inbox.models.Message import Message
+from app.whatsapp.team_inbox.operations.MigrateMessagesToBuckets import MigrateMessagesToBuckets
+from app.whatsapp.team_inbox.repositories.MessageBucketRepository import MessageBucketRepository
+from my_celery.database.MessageBucketCRUD import MessageBucketCRUD
+from my_celery.models.Message import Message as SyncMessage
+from my_celery.tasks.archive_messages import _archive_buckets
+
+DAY = datetime(2025, 3, 1, 8, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def native_uuids(monkeypatch):
+    # mongomock validates documents with the default (unspecified) UUID
+    # representation, the real clients are configured with "standard"
+    monkeypatch.setattr(mongomock.collection, "BSON", None)
+
+
+def _sync_message(conversation_id, minutes=0, **fields):
+    created_at = DAY + timedelta(minutes=minutes)
+    return SyncMessage(id=uuid4(), message_type="text", message_status="sent", conversation_id=conversation_id,
+                       content={"text": "hi"}, created_at=created_at, updated_at=created_at, **fields)
+
+
+@pytest.fixture
+def bucket_crud():
+    engine = SyncEngine(client=mongomock.MongoClient(), database="test")
+    return MessageBucketCRUD(engine, bucket_size=2)
+
+
+def test_create_appends_to_the_open_bucket_of_the_day(bucket_crud):
+    conversation_id = uuid4()
+    for minutes in range(3):
+        bucket_crud.create(_sync_message(conversation_id, minutes))
+
+    buckets = list(bucket_crud.buckets.find({}, sort=[("start_at", 1)]))
+    assert [bucket["count"] for bucket in buckets] == [2, 1]
+    assert {bucket["day"] for bucket in buckets} == {"2025-03-01"}
+    assert bucket_crud.lookup.count_documents({}) == 3
+
+
+def test_get_by_id_reads_the_message_out_of_its_bucket(bucket_crud):
+    message = _sync_message(uuid4(), wa_message_id="wamid.1")
+    bucket_crud.create(message)
+
+    found = bucket_crud.get_by_id(message.id)
+
+    assert found.id == message.id and found.wa_message_id == "wamid.1"
+    assert bucket_crud.get_by_id(uuid4()) is None
+
+
+def test_update_sets_fields_inside_the_bucket(bucket_crud):
+    message = _sync_message(uuid4())
+    bucket_crud.create(message)
+
+    projected = bucket_crud.update(message.id, {"message_status": "read", "wa_message_id": "wamid.2"},
+                                   projection={"_id": 1})
+
+    assert projected == {"_id": message.id}
+    updated = bucket_crud.get_by_id(message.id)
+    assert (updated.message_status, updated.wa_message_id) == ("read", "wamid.2")
+    assert bucket_crud.lookup.find_one({"_id": message.id})["wa_message_id"] == "wamid.2"
+    assert bucket_crud.update(uuid4(), {"message_status": "read"}) is None
+
+
+@pytest_asyncio.fixture
+async def source():
+    await init_beanie(database=AsyncMongoMockClient()["test"], document_models=[Message])
+    conversations = sorted([uuid4(), uuid4()])
+    messages = [
+        Message(id=uuid4(), message_type="text", conversation_id=conversation_id, wa_message_id=f"wamid.{uuid4()}",
+                content={"text": f"{index}"}, created_at=DAY + timedelta(minutes=index))
+        for conversation_id in conversations
+        for index in range(5)
+    ]
+    await Message.insert_many(messages)
+    return messages
+
+
+async def _bucketed_ids(repository):
+    ids = []
+    async for bucket in repository.buckets.find({}):
+        ids.extend(message["_id"] for message in bucket["messages"])
+    return ids
+
+
+@pytest.mark.asyncio
+async def test_migration_puts_every_message_in_one_bucket(source):
+    repository = MessageBucketRepository(bucket_size=2)
+
+    migrated = await MigrateMessagesToBuckets(repository, batch_size=3).run()
+
+    ids = await _bucketed_ids(repository)
+    assert migrated == len(source)
+    assert sorted(ids) == sorted(Binary.from_uuid(message.id) for message in source)
+    # 5 messages of one day per conversation: buckets of 2, 2 and 1
+    assert await repository.buckets.count_documents({}) == 6
+
+
+@pytest.mark.asyncio
+async def test_rerun_after_a_partial_run_does_not_duplicate_messages(source):
+    repository = MessageBucketRepository(bucket_size=2)
+    await MigrateMessagesToBuckets(repository, batch_size=3).run()
+    buckets_before = sorted([bucket["_id"] async for bucket in repository.buckets.find({})])
+    # interrupted between the bucket and lookup inserts
+    await repository.lookup.delete_many({"_id": {"$in": [Binary.from_uuid(source[1].id), Binary.from_uuid(source[6].id)]}})
+
+    migrated = await MigrateMessagesToBuckets(repository, batch_size=4).run()
+
+    ids = await _bucketed_ids(repository)
+    assert migrated == 2
+    assert len(ids) == len(set(ids)) == len(source)
+    assert sorted([bucket["_id"] async for bucket in repository.buckets.find({})]) == buckets_before
+    assert await repository.lookup.count_documents({}) == len(source)
+
+
+def test_archiving_moves_old_buckets_out_one_message_per_document(bucket_crud):
+    old, recent = uuid4(), uuid4()
+    for minutes in range(3):
+        bucket_crud.create(_sync_message(old, minutes))
+    bucket_crud.create(_sync_message(recent, minutes=60 * 24 * 40))
+
+    moved = _archive_buckets(bucket_crud, cutoff=DAY + timedelta(days=1), max_batches=10)
+
+    archive = bucket_crud.buckets.database["messages_archive_2025_03"]
+    assert moved == 3
+    assert archive.count_documents({"conversation_id": old}) == 3
+    assert [bucket["conversation_id"] for bucket in bucket_crud.buckets.find({})] == [recent]
+    assert bucket_crud.lookup.count_documents({}) == 1
+
+
+class TextlessBuckets:
+    """mongomock has no $text: drop it from the first stage, the words are re-checked per message anyway."""
+
+    def __init__(self, buckets):
+        self._buckets = buckets
+
+    def __getattr__(self, name):
+        return getattr(self._buckets, name)
+
+    def aggregate(self, pipeline):
+        pipeline[0]["$match"].pop("$text")
+        return self._buckets.aggregate(pipeline)
+
+
+@pytest.mark.asyncio
+async def test_search_returns_the_matching_messages_out_of_the_buckets(monkeypatch):
+    await init_beanie(database=AsyncMongoMockClient()["test"], document_models=[Message])
+    repository = MessageBucketRepository(bucket_size=2)
+    monkeypatch.setattr(MessageBucketRepository, "buckets",
+                        property(lambda self: TextlessBuckets(self.database["message_buckets"])))
+    conversation_id = uuid4()
+    texts = ["Invoice sent", "thanks", "where is my invoice?", "INVOICE 42", "bye"]
+    messages = [
+        Message(id=uuid4(), message_type="text", conversation_id=conversation_id, wa_message_id=f"wamid.{index}",
+                is_from_contact=index % 2 == 0, content={"text": text}, created_at=DAY + timedelta(minutes=index))
+        for index, text in enumerate(texts)
+    ]
+    for message in messages:
+        await repository.create(message)
+    await repository.create(Message(id=uuid4(), message_type="text", conversation_id=uuid4(),
+                                    wa_message_id="wamid.other", content={"text": "invoice"}, created_at=DAY))
+
+    found = await repository.search_conversation(conversation_id, "invoice", limit=10,
+                                                 projection={"search_text": 0})
+    inbound = await repository.search_conversation(conversation_id, "invoice", limit=10,
+                                                   query={"is_from_contact": True})
+
+    assert [doc["content"]["text"] for doc in found] == ["INVOICE 42", "where is my invoice?", "Invoice sent"]
+    assert all("search_text" not in doc for doc in found)
+    assert [doc["content"]["text"] for doc in inbound] == ["where is my invoice?", "Invoice sent"]
@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+
+from app.whatsapp.team_inbox.utils.message_partitions import (
+    add_months,
+    create_partition_sql,
+    expired_partitions,
+    partition_month,
+    partition_name,
+    range_upper_bound,
+    upcoming_months,
+)
+
+
+def test_partitions_are_monthly_and_sortable():
+    name = partition_name(datetime(2025, 3, 31, 23, 59))
+    assert name == "messages_2025_03"
+    assert partition_month(name) == 202503
+    assert partition_month("messages_legacy") is None
+    assert partition_month("messages_archive_2025_03") is None
+
+
+def test_partition_bounds_cross_year_boundary():
+    assert add_months(datetime(2025, 11, 1), 2) == datetime(2026, 1, 1)
+    statement = create_partition_sql(datetime(2025, 12, 15, 8, tzinfo=timezone.utc))
+    assert "messages_2025_12 PARTITION OF messages" in statement
+    assert "FROM ('2025-12-01T00:00:00+00:00') TO ('2026-01-01T00:00:00+00:00')" in statement
+
+
+def test_upcoming_months_include_current():
+    months = upcoming_months(datetime(2025, 12, 15, tzinfo=timezone.utc), 2)
+    assert [partition_name(month) for month in months] == ["messages_2025_12", "messages_2026_01", "messages_2026_02"]
+
+
+def test_upcoming_months_skip_the_range_of_the_legacy_partition():
+    # the migration month is covered by messages_legacy up to the start of the next one
+    covered_until = range_upper_bound("FOR VALUES FROM (MINVALUE) TO ('2025-12-31 19:00:00-05')")
+    assert covered_until == datetime(2026, 1, 1, tzinfo=timezone.utc)
+    months = upcoming_months(datetime(2025, 12, 15, tzinfo=timezone.utc), 2, covered_until)
+    assert [partition_name(month) for month in months] == ["messages_2026_01", "messages_2026_02"]
+    months = upcoming_months(datetime(2026, 1, 2, tzinfo=timezone.utc), 1, covered_until)
+    assert [partition_name(month) for month in months] == ["messages_2026_01", "messages_2026_02"]
+    assert range_upper_bound(None) is None
+
+
+def test_expired_partitions_keep_retention_and_legacy():
+    names = ["messages_legacy", "messages_2025_01", "messages_2024_12", "messages_2025_02", "messages_2025_03"]
+    now = datetime(2025, 4, 10, tzinfo=timezone.utc)
+    assert expired_partitions(names, now, 2) == ["messages_2024_12", "messages_2025_01"]
+    assert expired_partitions(names, now, 0) == []
@@ -0,0 +1,24 @@
+from app.whatsapp.team_inbox.utils.message_search import build_search_text
+
+
+def test_collects_text_from_every_content_shape():
+    assert build_search_text({"text": "Hello  there"}) == "Hello there"
+    assert build_search_text({"text_body": "outbound"}) == "outbound"
+    assert build_search_text({"caption": "Invoice", "filename": "inv-42.pdf", "cdn_url": "https://x"}) == "Invoice inv-42.pdf"
+    assert build_search_text({
+        "interactive_type": "button_reply",
+        "interactive": {"type": "button_reply", "button_reply": {"id": "b1", "title": "Yes please"}},
+    }) == "Yes please"
+
+
+def test_template_parameters_are_searchable():
+    content = {
+        "name": "order_update",
+        "components": [{"type": "body", "parameters": [{"type": "text", "text": "ORD-1001"}]}],
+    }
+    assert build_search_text(content) == "order_update ORD-1001"
+
+
+def test_empty_content_has_no_search_text():
+    assert build_search_text(None) is None
+    assert build_search_text({"latitude": 1.0, "longitude": 2.0}) is None